@@ -0,0 +1,170 @@
+"""
+Reglas de selección de candidatos a artículo en las portadas
+Las comparten el backend de BeautifulSoup (NewsSourcesScraper.extract_articles_generic)
+y el de lxml puro (lxml_extractor) para clasificar cada elemento en un único recorrido
+del documento, en lugar de lanzar un soup.select por selector
+
+Candidatos y artículos son NamedTuple: no guardan referencias al árbol del que
+salen (que se puede liberar en cuanto termina la extracción) y ocupan bastante
+menos que un dict, lo que cuenta en el cache de candidatos de las portadas
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+# Selectores históricos, en orden de prioridad:
+#   'article', '.article', '.post', '.entry', '.news-item', '.story', '.card', '.item',
+#   '[class*="article"]', '[class*="post"]', '[class*="card"]', '[class*="item"]',
+#   '[class*="news"]', '[class*="story"]', '[class*="entry"]',
+#   'li[class*="article"]', 'li[class*="post"]', 'div[class*="article"]', 'div[class*="post"]',
+#   'section article', 'main article', '.content article', '.main article'
+# Los cuatro últimos y los li/div[class*=...] solo seleccionan elementos que ya cubre
+# una regla anterior, así que no cambian ni el conjunto ni el orden de los candidatos.
+CLASS_TOKEN_RULES = ['article', 'post', 'entry', 'news-item', 'story', 'card', 'item']
+CLASS_SUBSTRING_RULES = ['article', 'post', 'card', 'item', 'news', 'story', 'entry']
+
+# Palabras de clase para la búsqueda de respaldo (sin distinguir mayúsculas)
+FALLBACK_CLASS_KEYWORDS = ['article', 'post', 'card', 'item', 'news', 'story']
+
+# Enlaces que nunca son artículos
+LINK_SKIP = ['#', 'javascript:', 'mailto:', 'tel:', '/tag/', '/category/', '/author/']
+
+
+class ArticleRecord(NamedTuple):
+    """Artículo extraído de una portada"""
+    titulo: str
+    url: str
+    descripcion: str
+    imagen: str
+    fecha: str
+
+
+class Candidate(NamedTuple):
+    """
+    Candidato sin filtrar de extract_candidates: tipo 'articulo' o 'enlace'
+    Se marca como válido cuando el resto de sus campos se han extraído sin errores
+    """
+    tipo: str
+    titulo: str
+    url: str
+    descripcion: str = ''
+    imagen: str = ''
+    fecha: str = ''
+    valido: bool = False
+    
+    def article(self) -> ArticleRecord:
+        return ArticleRecord(self.titulo, self.url, self.descripcion, self.imagen, self.fecha)
+
+
+# Campos de cada artículo extraído de una portada
+ARTICLE_FIELDS = ArticleRecord._fields
+
+
+def selector_rank(tag_name: str, class_tokens: List[str], class_string: str) -> Optional[int]:
+    """
+    Prioridad del primer selector histórico que selecciona al elemento,
+    o None si ninguno lo selecciona (menor = antes en la lista de candidatos)
+    """
+    if tag_name == 'article':
+        return 0
+    if not class_string:
+        return None
+    for i, token in enumerate(CLASS_TOKEN_RULES):
+        if token in class_tokens:
+            return 1 + i
+    for i, value in enumerate(CLASS_SUBSTRING_RULES):
+        if value in class_string:
+            return 1 + len(CLASS_TOKEN_RULES) + i
+    return None
+
+
+def is_fallback_div(class_string: str) -> bool:
+    """True si un div tiene una clase que sugiere estructura de artículo"""
+    class_lower = class_string.lower()
+    return any(keyword in class_lower for keyword in FALLBACK_CLASS_KEYWORDS)
+
+
+def is_article_link(href: str, text: str) -> bool:
+    """Filtra enlaces que parezcan artículos (texto significativo y URL válida)"""
+    return (len(text) > 15 and
+            bool(href) and
+            not any(skip in href.lower() for skip in LINK_SKIP) and
+            (href.startswith('http') or href.startswith('/')))
+
+
+class CandidateCollector:
+    """
+    Acumula, durante el recorrido del documento, los candidatos a artículo
+    (sin duplicados) y los enlaces que parecen artículos
+    """
+    
+    def __init__(self):
+        self.ranked = []  # (prioridad, elemento) en orden de documento
+        self.fallback_items = []  # article/li, por si no hay candidatos
+        self.fallback_divs = []  # divs con clases de artículo, último recurso
+        self.article_links = []
+    
+    def add(self, element, tag_name: str, class_tokens: List[str], class_string: str):
+        rank = selector_rank(tag_name, class_tokens, class_string)
+        if rank is not None:
+            self.ranked.append((rank, element))
+        if tag_name in ('article', 'li') and len(self.fallback_items) < 30:
+            self.fallback_items.append(element)
+        elif tag_name == 'div' and class_string and len(self.fallback_divs) < 30 and is_fallback_div(class_string):
+            self.fallback_divs.append(element)
+    
+    def add_link(self, element, href: str, text: str):
+        if is_article_link(href, text):
+            self.article_links.append(element)
+    
+    def candidates(self) -> List:
+        """Candidatos ordenados por prioridad de selector y, dentro de cada una, por documento"""
+        if self.ranked:
+            return [element for _, element in sorted(self.ranked, key=lambda item: item[0])]
+        # Si no encuentra con selectores, busca por tags semánticos y estructura
+        if len(self.fallback_items) < 5:
+            return self.fallback_divs
+        return self.fallback_items
+
+
+def new_candidate(tipo: str, title: str, url: str) -> Candidate:
+    """Candidato todavía no válido (se completa con _replace al extraer el resto de campos)"""
+    return Candidate(tipo, title, url)
+
+
+def iter_articles(candidates: Iterable[Candidate],
+                  title_check: Optional[Callable[[str], bool]] = None) -> Iterator[ArticleRecord]:
+    """
+    Segunda fase de extract_articles_generic: aplica el filtro temprano por título y
+    quita las URLs repetidas sobre los candidatos sin filtrar de extract_candidates
+    
+    Sigue el mismo orden que la extracción en una fase: en los candidatos 'articulo'
+    el título se comprueba antes de marcar la URL como vista y en los 'enlace', después.
+    """
+    seen_urls = set()
+    
+    for candidate in candidates:
+        if candidate.tipo == 'articulo':
+            if title_check and not title_check(candidate.titulo):
+                continue
+            if candidate.url in seen_urls:
+                continue
+            seen_urls.add(candidate.url)
+        else:
+            if candidate.url in seen_urls:
+                continue
+            seen_urls.add(candidate.url)
+            if len(candidate.titulo) < 10 or (title_check and not title_check(candidate.titulo)):
+                continue
+        
+        # Candidatos cuya extracción falló después de tener URL: solo cuentan como vistos
+        if candidate.valido:
+            yield candidate.article()
+
+
+def select_articles(candidates: Iterable[Candidate], title_check: Optional[Callable[[str], bool]] = None) -> List[Dict]:
+    """
+    iter_articles como lista de dicts (los artículos que reciben las fuentes y los hallazgos)
+    Cada llamada retorna dicts nuevos: se pueden modificar sin tocar los candidatos
+    """
+    return [article._asdict() for article in iter_articles(candidates, title_check)]
@@ -0,0 +1,166 @@
+"""
+Almacén del contenido ya extraído de los artículos
+Evita volver a parsear un artículo conocido: el texto extraído se guarda por URL
+(y por hash del HTML descargado) junto con sus metadatos
+
+- En memoria por defecto, o en SQLite si se indica una ruta (procesos de larga duración)
+- Las entradas caducan pasado el TTL y se expulsan por LRU al superar max_entries
+- En SQLite, los accesos de get se anotan en memoria y se guardan por lotes (como
+  en http_cache): leer no escribe en la base de datos en cada llamada
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from http_cache import TOUCH_BATCH, TOUCH_INTERVAL
+
+
+def content_hash(content: bytes) -> str:
+    """Hash del HTML crudo de una página"""
+    return hashlib.sha1(content).hexdigest()
+
+
+class ArticleContentStore:
+    """Cache LRU del texto extraído de artículos, en memoria o en disco"""
+    
+    def __init__(self, max_entries: int = 1000, ttl: float = 6 * 3600, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Número máximo de artículos guardados
+            ttl: Segundos durante los que el contenido de una URL se considera vigente
+            path: Ruta de la base de datos SQLite; si es None se guarda solo en memoria
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # url -> entrada (orden = uso, el más reciente al final)
+        self._hashes = {}  # hash del HTML -> url (índice del modo en memoria)
+        self._conn = None
+        self._touched = {}  # URL -> último acceso todavía sin guardar (modo SQLite)
+        self._touched_since = 0.0  # Momento del acceso pendiente más antiguo
+        
+        if path:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articulos (
+                    url TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    contenido TEXT NOT NULL,
+                    extraido REAL NOT NULL,
+                    ultimo_acceso REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articulos_hash ON articulos (hash)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articulos_acceso ON articulos (ultimo_acceso)")
+            self._conn.commit()
+    
+    def _entry(self, row) -> Dict:
+        return {
+            'url': row[0],
+            'hash': row[1],
+            'contenido': row[2],
+            'extraido': row[3],
+            'longitud': len(row[2])
+        }
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Retorna la entrada de la URL si sigue vigente (dentro del TTL), o None
+        La entrada tiene las claves: url, hash, contenido, extraido, longitud
+        """
+        with self._lock:
+            if self._conn is None:
+                entry = self._memory.get(url)
+                if entry is None:
+                    return None
+                self._memory.move_to_end(url)
+            else:
+                row = self._conn.execute(
+                    "SELECT url, hash, contenido, extraido FROM articulos WHERE url = ?", (url,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._touch(url)
+                entry = self._entry(row)
+        
+        if time.time() - entry['extraido'] >= self.ttl:
+            return None
+        return entry
+    
+    def get_by_hash(self, html_hash: str) -> Optional[Dict]:
+        """Retorna una entrada extraída de un HTML idéntico (mismo hash), vigente o no"""
+        with self._lock:
+            if self._conn is None:
+                entry = self._memory.get(self._hashes.get(html_hash))
+                return entry if entry and entry['hash'] == html_hash else None
+            row = self._conn.execute(
+                "SELECT url, hash, contenido, extraido FROM articulos WHERE hash = ? LIMIT 1", (html_hash,)
+            ).fetchone()
+        return self._entry(row) if row else None
+    
+    def put(self, url: str, html_hash: str, contenido: str):
+        """Guarda el texto extraído de una URL y expulsa las entradas menos usadas"""
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                self._memory[url] = self._entry((url, html_hash, contenido, now))
+                self._memory.move_to_end(url)
+                self._hashes[html_hash] = url
+                while len(self._memory) > self.max_entries:
+                    _, evicted = self._memory.popitem(last=False)
+                    if self._hashes.get(evicted['hash']) == evicted['url']:
+                        del self._hashes[evicted['hash']]
+                return
+            
+            self._touched.pop(url, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articulos (url, hash, contenido, extraido, ultimo_acceso) VALUES (?, ?, ?, ?, ?)",
+                (url, html_hash, contenido, now, now)
+            )
+            sobrantes = self._conn.execute("SELECT COUNT(*) FROM articulos").fetchone()[0] - self.max_entries
+            if sobrantes > 0:
+                self._write_touched()  # El orden LRU tiene en cuenta los accesos todavía sin guardar
+                self._conn.execute(
+                    "DELETE FROM articulos WHERE url IN (SELECT url FROM articulos ORDER BY ultimo_acceso ASC LIMIT ?)",
+                    (sobrantes,)
+                )
+            self._conn.commit()
+    
+    def flush(self):
+        """Guarda los accesos anotados en memoria (el orden LRU en disco queda al día)"""
+        with self._lock:
+            if self._touched:
+                self._write_touched()
+                self._conn.commit()
+    
+    def _touch(self, url: str):
+        """Anota el acceso a una URL y guarda el lote si toca (requiere el lock)"""
+        now = time.time()
+        if not self._touched:
+            self._touched_since = now
+        self._touched[url] = now
+        if len(self._touched) >= TOUCH_BATCH or now - self._touched_since >= TOUCH_INTERVAL:
+            self._write_touched()
+            self._conn.commit()
+    
+    def _write_touched(self):
+        """Escribe los accesos anotados en la transacción en curso (requiere el lock)"""
+        if self._touched:
+            self._conn.executemany("UPDATE articulos SET ultimo_acceso = ? WHERE url = ?",
+                                   [(instante, url) for url, instante in self._touched.items()])
+            self._touched.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return len(self._memory)
+            return self._conn.execute("SELECT COUNT(*) FROM articulos").fetchone()[0]
@@ -0,0 +1,481 @@
+"""
+Motor asíncrono del scraper de noticias
+Versión asyncio de NewsSourcesScraper basada en aiohttp, pensada para servicios
+que necesitan cientos de peticiones concurrentes en un único event loop
+
+Reutiliza la extracción, el filtrado y el formato JSON de NewsSourcesScraper;
+solo cambia la capa de red (robots.txt, cookies por dominio y pausas de cortesía
+se comportan igual que en la versión basada en requests).
+
+Las corrutinas llevan el sufijo _async (generate_search_result_async,
+fetch_content_async...): los métodos heredados conservan su versión síncrona,
+así que la API síncrona (iter_search_results, top_n/top_k...) sigue funcionando
+sobre la sesión de requests del mismo scraper. Los candidatos y la re-puntuación
+de los hallazgos son las mismas etapas que usa el pipeline síncrono, y el HTML se
+parsea fuera del event loop con parse_candidates/parse_content (en el pool de
+procesos si se creó con parse_processes). close_async() libera lo mismo que close().
+El scraper puede usarse desde varios event loops: cada uno tiene su propia sesión
+de aiohttp y sus locks (ver LoopResources), y las consultas a los caches en SQLite
+se hacen en un hilo para no bloquear el loop.
+
+Uso:
+    async with AsyncNewsSourcesScraper() as scraper:
+        resultado = await scraper.generate_search_result_async("Inteligencia Artificial", ["IA"])
+        scraper.save_results(resultado, "busqueda.json")
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, List, Dict, Optional, Union
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+from bs4 import BeautifulSoup
+
+from article_selectors import Candidate, select_articles
+from http_cache import HTTPResponseCache
+from news_sources_scraper import NOT_MODIFIED, STREAM_CHUNK_SIZE, IncrementalPage, NewsSourcesScraper
+from result_store import SearchResult
+
+try:
+    import aiohttp
+except ImportError:  # Dependencia opcional: solo necesaria para el motor asíncrono
+    aiohttp = None
+
+
+def per_loop(by_loop: Dict, factory: Callable):
+    """
+    Valor de by_loop (event loop -> valor) para el loop actual, creado con factory
+    la primera vez; descarta los de loops ya cerrados, que no vuelven a usarse
+    """
+    for loop in [loop for loop in by_loop if loop.is_closed()]:
+        del by_loop[loop]
+    loop = asyncio.get_running_loop()
+    if loop not in by_loop:
+        by_loop[loop] = factory()
+    return by_loop[loop]
+
+
+class AsyncDomainThrottle:
+    """
+    Versión asyncio de DomainThrottle: pausa de cortesía entre peticiones a un mismo dominio
+    """
+    
+    def __init__(self, min_delay: float = 1.0, max_delay: float = 2.0):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._locks = {}  # event loop -> un asyncio.Lock por dominio
+        self._locks_guard = threading.Lock()
+        self._next_allowed = {}
+    
+    async def wait(self, url: str):
+        """Espera (sin bloquear el event loop) hasta que sea el turno del dominio"""
+        domain = urlparse(url).netloc
+        with self._locks_guard:
+            locks = per_loop(self._locks, dict)
+        lock = locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            pending = self._next_allowed.get(domain, 0.0) - time.monotonic()
+            if pending > 0:
+                await asyncio.sleep(pending)
+            self._next_allowed[domain] = time.monotonic() + random.uniform(self.min_delay, self.max_delay)
+
+
+class LoopResources:
+    """
+    Sesión HTTP y primitivas de asyncio de un event loop: están ligadas al loop en
+    el que se crean, así que cada loop que use el scraper tiene las suyas
+    """
+    
+    def __init__(self):
+        self.http = None  # aiohttp.ClientSession, se crea al hacer la primera petición
+        self.robots_locks = {}  # Evita descargar el mismo robots.txt varias veces a la vez
+        self.candidate_locks = {}  # Una sola descarga simultánea por página de candidatos
+        self.host_semaphores = {}  # Límite de extracciones simultáneas por host
+
+
+class AsyncNewsSourcesScraper(NewsSourcesScraper):
+    """
+    Scraper de múltiples fuentes sobre asyncio + aiohttp
+    Añade las corrutinas *_async a NewsSourcesScraper sin redefinir sus métodos síncronos
+    """
+    
+    def __init__(self, max_concurrency: int = 200, **kwargs):
+        if aiohttp is None:
+            raise ImportError("AsyncNewsSourcesScraper requiere aiohttp (pip install aiohttp)")
+        super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency  # Conexiones simultáneas en total
+        self.async_throttle = AsyncDomainThrottle(1.0, 2.0)
+        self._loops = {}  # event loop -> LoopResources
+        self._loops_lock = threading.Lock()
+    
+    async def __aenter__(self):
+        self._resources()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_async()
+    
+    async def close_async(self):
+        """Cierra la sesión HTTP asíncrona del event loop actual y libera lo mismo que close()"""
+        with self._loops_lock:
+            resources = self._loops.pop(asyncio.get_running_loop(), None)
+        if resources is not None and resources.http is not None:
+            await resources.http.close()
+        # Detener el pool de parseo espera a los parseos en curso: fuera del event loop
+        await asyncio.to_thread(self.close)
+    
+    def _resources(self) -> LoopResources:
+        """Sesión y primitivas del event loop actual (se crean la primera vez que se usa)"""
+        with self._loops_lock:
+            return per_loop(self._loops, LoopResources)
+    
+    def _get_http(self) -> 'aiohttp.ClientSession':
+        resources = self._resources()
+        if resources.http is None or resources.http.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_per_host * 2)
+            # Mismos headers que la sesión de requests
+            resources.http = aiohttp.ClientSession(connector=connector, headers=dict(self.session.headers))
+        return resources.http
+    
+    async def _robots_for_async(self, base_url: str) -> RobotFileParser:
+        """Versión asíncrona de _robots_for (mismo cache compartido de robots.txt)"""
+        rp = self.robots_cache.get(base_url)
+        if rp is not None:
+            return rp
+        
+        lock = self._resources().robots_locks.setdefault(base_url, asyncio.Lock())
+        async with lock:
+            rp = self.robots_cache.get(base_url)
+            if rp is None:
+                async with self._get_http().get(urljoin(base_url, '/robots.txt'),
+                                                timeout=aiohttp.ClientTimeout(total=20)) as response:
+                    texto = (await response.read()).decode('utf-8') if response.status < 400 else ''
+                    rp = self.robots_cache.store(base_url, response.status, texto)
+            return rp
+    
+    async def prefetch_robots_async(self, urls: List[str]):
+        """Versión asíncrona de prefetch_robots: descarga los robots.txt que falten a la vez"""
+        async def download(base_url: str):
+            try:
+                await self._robots_for_async(base_url)
+            except Exception:
+                pass  # check_robots_txt_async lo reintentará e informará del error
+        
+        missing = self.robots_cache.missing([self._robots_base(url) for url in urls])
+        await asyncio.gather(*(download(base_url) for base_url in missing))
+    
+    async def check_robots_txt_async(self, url: str) -> bool:
+        """
+        Versión asíncrona de check_robots_txt (comparte el mismo cache de robots.txt)
+        Retorna True si está permitido, False si está bloqueado
+        """
+        try:
+            rp = await self._robots_for_async(self._robots_base(url))
+            
+            can_fetch = rp.can_fetch(self.user_agent, url)
+            
+            if not can_fetch:
+                print("  🚫 robots.txt bloquea el acceso a esta URL")
+            
+            return can_fetch
+        
+        except Exception as e:
+            # Si hay error al leer robots.txt, asumir que está permitido
+            print(f"  ℹ️  No se pudo verificar robots.txt: {str(e)[:50]}")
+            return True
+    
+    async def fetch_page_async(self, url: str, timeout: int = 20, check_robots: bool = True) -> Optional[BeautifulSoup]:
+        """Versión asíncrona de fetch_page: obtiene y parsea una página"""
+        content = await self.fetch_content_async(url, timeout=timeout, check_robots=check_robots)
+        if content is None:
+            return None
+        # Parsear fuera del event loop para no frenar las demás descargas
+        return await asyncio.to_thread(BeautifulSoup, content, self.soup_parser())
+    
+    async def fetch_document_async(self, url: str, timeout: int = 20, check_robots: bool = True):
+        """Versión asíncrona de fetch_document: página parseada con el backend configurado"""
+        content = await self.fetch_content_async(url, timeout=timeout, check_robots=check_robots)
+        if content is None:
+            return None
+        return await asyncio.to_thread(self.parse_document, content)
+    
+    async def fetch_content_async(self, url: str, timeout: int = 20, check_robots: bool = True,
+                                  validators: Optional[Dict] = None, cached: Optional[Dict] = None) -> Optional[bytes]:
+        """
+        Versión asíncrona de fetch_content: HTML crudo de una página (con cache HTTP si está activo)
+        validators, cached: como en fetch_content (NOT_MODIFIED si la petición condicional responde 304)
+        """
+        try:
+            if check_robots:
+                if not await self.check_robots_txt_async(url):
+                    return None
+            
+            # Las lecturas y escrituras de los caches en SQLite van a un hilo
+            if cached is None and self.http_cache:
+                cached = await asyncio.to_thread(self.http_cache.get, url)
+            if cached and self.http_cache.is_fresh(cached):
+                print(f"  💾 Desde cache: {urlparse(url).netloc}")
+                return cached['contenido']
+            
+            print(f"  📄 Accediendo a {urlparse(url).netloc}...")
+            await self.async_throttle.wait(url)
+            
+            parsed = urlparse(url)
+            headers = {'Referer': parsed.scheme + '://' + parsed.netloc}
+            if cached:
+                headers.update(self.http_cache.conditional_headers(cached))
+            elif validators:
+                headers.update(HTTPResponseCache.conditional_headers(validators))
+            cookies = self.domain_cookies(parsed.netloc)
+            
+            async with self._get_http().get(url, headers=headers, cookies=cookies,
+                                            timeout=aiohttp.ClientTimeout(total=timeout),
+                                            allow_redirects=True) as response:
+                if cached and response.status == 304:
+                    print(f"  💾 Sin cambios (304): {parsed.netloc}")
+                    await asyncio.to_thread(self.http_cache.refresh, url)
+                    return cached['contenido']
+                if validators and response.status == 304:
+                    print(f"  💾 Sin cambios (304): {parsed.netloc}")
+                    return NOT_MODIFIED
+                response.raise_for_status()
+                content = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+            
+            # Verificar que realmente recibimos contenido HTML
+            if not content or len(content) < 100:
+                print("  ⚠️  Respuesta vacía o muy corta")
+                return None
+            
+            if self.http_cache:
+                await asyncio.to_thread(self.http_cache.store, url, content, etag=etag, last_modified=last_modified)
+            if validators is not None:
+                validators['etag'] = etag
+                validators['last_modified'] = last_modified
+            
+            return content
+        except Exception as e:
+            self._report_fetch_error(e)
+            return None
+    
+    def _report_fetch_error(self, e: Exception):
+        """Como _report_fetch_error de NewsSourcesScraper, también para los errores de aiohttp"""
+        if isinstance(e, aiohttp.ClientResponseError):
+            print(f"  ⚠️  Error HTTP {e.status}")
+        elif isinstance(e, aiohttp.ClientConnectionError):
+            print(f"  ⚠️  Error de conexión (posible bloqueo): {str(e)[:100]}")
+        elif isinstance(e, asyncio.TimeoutError):
+            print("  ⚠️  Timeout esperando respuesta")
+        else:
+            super()._report_fetch_error(e)
+    
+    async def extract_article_content_async(self, url: str) -> str:
+        """
+        Versión asíncrona de extract_article_content (usa el mismo almacén de contenido)
+        Con incremental_parse, la misma lectura incremental que la versión síncrona
+        """
+        try:
+            cached = await asyncio.to_thread(self.content_store.get, url)
+            if cached is not None:
+                return cached['contenido']
+            
+            entry = None
+            if self.incremental_parse:
+                entry = await asyncio.to_thread(self.http_cache.get, url) if self.http_cache else None
+                if entry is None:
+                    return await self._stream_article_content_async(url)
+            
+            content = await self.fetch_content_async(url, cached=entry)
+            if content is None:
+                return ""
+            
+            return await asyncio.to_thread(self._content_from_html, url, content)
+        
+        except Exception as e:
+            print(f"  ⚠️  Error extrayendo contenido de {url}: {str(e)[:100]}")
+            return ""
+    
+    async def _stream_article_content_async(self, url: str, timeout: int = 20) -> str:
+        """Descarga y parseo incremental de extract_article_content_async"""
+        page = IncrementalPage(self.max_page_bytes)
+        completa = True
+        try:
+            if not await self.check_robots_txt_async(url):
+                return ""
+            
+            print(f"  📄 Accediendo a {urlparse(url).netloc}...")
+            await self.async_throttle.wait(url)
+            
+            parsed = urlparse(url)
+            headers = {'Referer': parsed.scheme + '://' + parsed.netloc}
+            async with self._get_http().get(url, headers=headers, cookies=self.domain_cookies(parsed.netloc),
+                                            timeout=aiohttp.ClientTimeout(total=timeout),
+                                            allow_redirects=True) as response:
+                response.raise_for_status()
+                # Al salir sin leer el resto, aiohttp descarta la conexión
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    # Parsear fuera del event loop, como el resto del HTML
+                    if await asyncio.to_thread(page.add, chunk):
+                        completa = False
+                        self._print_cut(url, page)
+                        break
+                response_headers = response.headers
+        except Exception as e:
+            self._report_fetch_error(e)
+            return ""
+        
+        return await asyncio.to_thread(self._incremental_content, url, page, completa, response_headers)
+    
+    async def extract_contents_async(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Extrae el contenido de todas las URLs de forma concurrente,
+        con como mucho max_per_host extracciones simultáneas por host
+        """
+        async def extract(url: str):
+            host = urlparse(url).netloc
+            semaphore = self._resources().host_semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+            async with semaphore:
+                return url, await self.extract_article_content_async(url)
+        
+        unique_urls = list(dict.fromkeys(u for u in urls if u))
+        return dict(await asyncio.gather(*(extract(url) for url in unique_urls)))
+    
+    async def fetch_candidates_async(self, url: str) -> Optional[List[Candidate]]:
+        """
+        Versión asíncrona de fetch_candidates (mismo candidate_cache): dentro del TTL
+        sin tocar la red, si no con una petición condicional; el parseo va a un hilo
+        (o al pool de procesos, ver parse_candidates)
+        """
+        lock = self._resources().candidate_locks.setdefault((self.parser, url), asyncio.Lock())
+        async with lock:
+            entry = self.candidate_cache.get(self.parser, url)
+            if entry is not None and self.candidate_cache.is_fresh(entry):
+                print(f"  ♻️  Candidatos en cache: {urlparse(url).netloc}")
+                return entry['candidatos']
+            
+            validators = {'etag': entry['etag'], 'last_modified': entry['last_modified']} if entry else {}
+            content = await self.fetch_content_async(url, validators=validators)
+            return await asyncio.to_thread(self._candidates_from_content, url, entry, content, validators)
+    
+    async def scrape_source_async(self, url: str, keywords: Optional[List[str]] = None, tema: str = "") -> Dict:
+        """Versión asíncrona de scrape_source"""
+        all_articles = []
+        
+        title_check = self._title_check(keywords, tema)
+        
+        # Estrategia 1: Scrapear la página principal (candidatos reutilizados si no ha cambiado)
+        candidatos = await self.fetch_candidates_async(url)
+        
+        if candidatos is not None:
+            articles = select_articles(candidatos, title_check)
+            all_articles.extend(articles)
+        
+        # Estrategia 2: Si hay tema/keywords, intentar buscar en URL de búsqueda
+        if (keywords or tema) and len(all_articles) < 10:
+            search_query = tema if tema else ' '.join(keywords[:2]) if keywords else ''
+            if search_query:
+                search_url = self.get_search_url(url, search_query)
+                if search_url and search_url != url:
+                    print(f"  🔍 Intentando búsqueda en: {urlparse(search_url).netloc}...")
+                    search_candidatos = await self.fetch_candidates_async(search_url)
+                    if search_candidatos is not None:
+                        search_articles = select_articles(search_candidatos, title_check)
+                        # Evitar duplicados
+                        existing_urls = {a['url'] for a in all_articles}
+                        for article in search_articles:
+                            if article['url'] not in existing_urls:
+                                all_articles.append(article)
+                                existing_urls.add(article['url'])
+        
+        return self._source_result(url, all_articles, keywords, tema)
+    
+    async def scrape_all_sources_async(self, keywords: Optional[List[str]] = None, tema: str = "",
+                                 progress: Optional[Callable[[str, Dict], None]] = None) -> List[Dict]:
+        """
+        Scrapea todas las fuentes de forma concurrente en el event loop
+        
+        Returns:
+            Lista de resultados por fuente (en el mismo orden que SOURCES)
+        """
+        sources = list(self.SOURCES)
+        print(f"🕷️  Iniciando scraping asíncrono de {len(sources)} fuentes...")
+        print(f"🤖 User-Agent: {self.user_agent}")
+        print("📋 Verificando robots.txt antes de cada acceso...")
+        if keywords:
+            print(f"🔍 Filtrando por: {', '.join(keywords)}")
+        if tema:
+            print(f"📌 Tema: {tema}")
+        print()
+        
+        # robots.txt de todas las fuentes a la vez antes de empezar
+        await self.prefetch_robots_async(sources)
+        
+        async def scrape(i: int, source_url: str):
+            try:
+                result = await self.scrape_source_async(source_url, keywords, tema)
+            except Exception as e:
+                print(f"  ⚠️  Error scrapeando {source_url}: {str(e)[:100]}")
+                result = {
+                    'fuente': source_url,
+                    'nombre_fuente': urlparse(source_url).netloc,
+                    'estado': 'error',
+                    'articulos_encontrados': 0,
+                    'articulos': []
+                }
+            print(f"[{i}/{len(sources)}] {source_url}")
+            print(f"  ✓ {result['articulos_encontrados']} artículos encontrados\n")
+            completed.append(source_url)
+            if progress:
+                progress('fuente', self._source_progress(result, len(completed), len(sources)))
+            return result
+        
+        completed = []
+        return list(await asyncio.gather(*(scrape(i, url) for i, url in enumerate(sources, 1))))
+    
+    async def generate_search_result_async(self, search_query: str, keywords: Optional[List[str]] = None,
+                                     progress: Optional[Callable[[str, Dict], None]] = None,
+                                     incremental: bool = False,
+                                     compact: bool = False) -> Union[Dict, SearchResult]:
+        """
+        Versión asíncrona de generate_search_result (mismo formato de resultado)
+        Sin top_n ni top_k: para ellos, generate_search_result
+        """
+        scope = self._seen_scope(search_query, keywords, incremental)
+        self._print_legal_warning()
+        
+        sources_results = await self.scrape_all_sources_async(keywords, tema=search_query, progress=progress)
+        
+        # Mismas etapas que _search_pipeline, con la extracción de contenido concurrente en el
+        # event loop; las que consultan seen_index (SQLite) y la re-puntuación van a un hilo
+        def list_candidates() -> List:
+            fuentes = enumerate(sources_results)
+            if scope is not None:
+                fuentes = self._skip_seen(fuentes, scope, incremental)
+            return [(url, item) for url, item in self.iter_candidates(fuentes, progress) if item[2] is not None]
+        
+        def build_findings(contents: Dict[str, str]) -> List[Dict]:
+            # Con todos los contenidos ya extraídos, la re-puntuación se hace por lotes
+            pending = [(article, contents.get(url, "")) for url, (_, _, article) in candidatos]
+            relevancias = self._content_scores(pending, search_query, keywords)
+            
+            findings = []
+            tipos = {}
+            for (url, (_, source, article)), relevancia_completa in zip(candidatos, relevancias):
+                tipo_match = article.get('tipo_match', 'exacto')
+                tipos[tipo_match] = tipos.get(tipo_match, 0) + 1
+                finding = self._finding_for(scope, incremental, source, article, contents.get(url, ""),
+                                            search_query, keywords, relevancia_completa)
+                if finding is not None:
+                    findings.append(finding)
+            self._print_match_summary(tipos)
+            return findings
+        
+        candidatos = await asyncio.to_thread(list_candidates)
+        contents = await self.extract_contents_async([url for url, _ in candidatos]) if candidatos else {}
+        all_findings = await asyncio.to_thread(build_findings, contents)
+        
+        return self._compile_search_result(search_query, sources_results, all_findings, compact)
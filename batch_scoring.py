@@ -0,0 +1,143 @@
+"""
+Scoring de relevancia por lotes
+Puntúa todos los artículos candidatos de una vez en lugar de artículo por artículo:
+cada texto se recorre una sola vez para construir una matriz de presencia
+(artículos x términos de la consulta) y los scores de calculate_similarity y
+filter_by_keywords se calculan con operaciones de NumPy sobre columnas
+
+- Los resultados ('relevancia' y 'tipo_match') son los mismos que los del scorer
+  por artículo de keyword_matcher.CompiledQuery (ver benchmark_scoring.py)
+- NumPy es opcional: sin él se puntúa artículo por artículo con CompiledQuery
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from keyword_matcher import CompiledQuery, TermMatcher, compile_query, normalize
+
+try:
+    import numpy as np
+except ImportError:  # Opcional: sin NumPy se usa el scorer por artículo
+    np = None
+
+
+# Umbrales de relevancia de filter_by_keywords (más estrictos)
+UMBRAL_MINIMO_SIMILAR = 25   # Similitud alta
+UMBRAL_MINIMO_FLEXIBLE = 15  # Similitud media
+
+
+def _presence_matrix(matcher: TermMatcher, texts: List[str]) -> Tuple:
+    """
+    Matriz booleana (textos x términos) con los términos presentes en cada texto
+    y el índice de columna de cada término
+    """
+    column = {term: i for i, term in enumerate(sorted(matcher.terms))}
+    rows, columns = [], []
+    for row, text in enumerate(texts):
+        for term in matcher.present(text):
+            rows.append(row)
+            columns.append(column[term])
+    
+    matrix = np.zeros((len(texts), len(column)), dtype=bool)
+    matrix[rows, columns] = True
+    return matrix, column
+
+
+def _count(matrix, column: Dict[str, int], terms: List[str]):
+    """Por fila, cuántos de los términos (con repeticiones) están presentes"""
+    return matrix[:, [column[term] for term in terms]].sum(axis=1)
+
+
+def similarity_scores(query: CompiledQuery, texts: List[str]) -> List[float]:
+    """Versión por lotes de calculate_similarity: un score de 0 a 200 por texto"""
+    if np is None or not texts:
+        return [query.similarity(text) for text in texts]
+    
+    present, column = _presence_matrix(query.normalized_matcher, [normalize(text) for text in texts])
+    
+    score = np.zeros(len(texts))
+    keywords_found = np.zeros(len(texts), dtype=int)
+    
+    # 1. Coincidencia exacta de keywords completas y de todas sus palabras
+    for kw_normalized, kw_words in zip(query.keywords_normalized, query.keyword_words):
+        completa = present[:, column[kw_normalized]]
+        keywords_found += completa
+        score += np.where(completa, 20 + len(kw_normalized) * 4, 0)
+        
+        if len(kw_words) > 1:
+            matches = _count(present, column, kw_words)
+            todas = matches == len(kw_words)
+            keywords_found += todas
+            score += np.where(todas, 15, np.where(matches >= len(kw_words) * 0.8, 10, 0))
+    
+    # 2. Coincidencia de palabras del tema
+    tema_words_found = _count(present, column, query.tema_words)
+    score += 8 * tema_words_found
+    
+    # 3. Verificación de correlación temática (keywords principales)
+    if query.keywords_principales:
+        porcentaje = _count(present, column, query.keywords_principales) / len(query.keywords_principales)
+        score = np.where(porcentaje < 0.3, score * 0.3, np.where(porcentaje >= 0.7, score + 25, score))
+    
+    # 4. Palabras sueltas de refuerzo, solo si hay alguna coincidencia previa
+    # (se suman una a una, en el mismo orden que el scorer por artículo)
+    contexto = (keywords_found > 0) | (tema_words_found > 0)
+    for kw_word in query.all_keywords_words:
+        score += np.where(contexto & present[:, column[kw_word]], 2, 0)
+    
+    # 5. Bonus por keyword en textos cortos (probablemente títulos)
+    cortos = [i for i, text in enumerate(texts) if len(text) < 200]
+    if cortos and query.keywords_lower:
+        lower, lower_column = _presence_matrix(query.lower_matcher, [texts[i].lower() for i in cortos])
+        for kw in query.keywords_lower:
+            bonus = np.zeros(len(texts))
+            bonus[cortos] = np.where(lower[:, lower_column[kw]], 8, 0)
+            score += bonus
+    
+    # 6. Penalización si no hay suficiente correlación
+    score = np.where((keywords_found == 0) & (tema_words_found < 2), score * 0.2, score)
+    
+    # min(score, 200) como el scorer por artículo
+    return [value if value <= 200 else 200 for value in score.tolist()]
+
+
+def keyword_counts(query: CompiledQuery, texts_lower: List[str]) -> List[int]:
+    """Por texto (ya en minúsculas), cuántas keywords aparecen literalmente"""
+    if np is None or not texts_lower or not query.keywords_lower:
+        return [len(query.keywords_in(text)) for text in texts_lower]
+    
+    present, column = _presence_matrix(query.lower_matcher, texts_lower)
+    return _count(present, column, query.keywords_lower).tolist()
+
+
+def score_articles(articles: List[Dict], keywords: List[str], tema: str = "") -> List[Optional[Tuple]]:
+    """
+    Clasifica todos los artículos de una vez con los criterios de filter_by_keywords
+    
+    Returns:
+        Por artículo, (relevancia, tipo_match) con tipo_match 'exacto', 'similar'
+        o 'flexible', o None si no alcanza el umbral mínimo
+    """
+    query = compile_query(keywords, tema)
+    textos = [f"{article['titulo']} {article['descripcion']}" for article in articles]
+    encontradas = keyword_counts(query, [texto.lower() for texto in textos])
+    
+    # La similitud solo se calcula para los artículos sin coincidencia exacta (y si hay tema)
+    sin_exacta = [i for i, n in enumerate(encontradas) if n == 0] if tema else []
+    similitudes = dict(zip(sin_exacta, similarity_scores(query, [textos[i] for i in sin_exacta])))
+    
+    puntuaciones = []
+    for i, n in enumerate(encontradas):
+        if n > 0:
+            # Relevancia por número de keywords, con bonus si están al menos el 50%
+            relevance = n * 30 + 100
+            if n >= len(query.keywords) * 0.5:
+                relevance += 50
+            puntuaciones.append((relevance, 'exacto'))
+        elif i in similitudes and similitudes[i] >= UMBRAL_MINIMO_SIMILAR:
+            puntuaciones.append((similitudes[i], 'similar'))
+        elif i in similitudes and similitudes[i] >= UMBRAL_MINIMO_FLEXIBLE:
+            puntuaciones.append((similitudes[i], 'flexible'))
+        else:
+            puntuaciones.append(None)
+    
+    return puntuaciones
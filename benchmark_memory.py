@@ -0,0 +1,106 @@
+"""
+Benchmark de memoria de la extracción de artículos de las portadas
+Mide, por página, el RSS pico por descarga simultánea con las dos formas de
+extraer artículos:
+
+- arbol: fetch_document + extract_articles_generic; cada descarga en curso conserva
+  el árbol completo de su página mientras tiene los artículos
+- registros: parse_candidates + iter_articles (lo que hace iter_page_articles);
+  el árbol se libera nada más extraer y solo quedan ArticleRecord
+
+Las respuestas llegan escalonadas, como las de descargas reales en curso a la vez:
+cada una se parsea cuando la anterior ha terminado de extraer, y todas esperan al
+final con su resultado en la mano
+
+Con 'lxml-fast' el árbol lo reserva libxml2 con malloc, y glibc devuelve lo liberado
+al arena del hilo que lo parseó: con un hilo por descarga la diferencia solo se ve
+limitando los arenas (MALLOC_ARENA_MAX=2 python benchmark_memory.py --parser lxml-fast)
+
+Usa las páginas guardadas por benchmark_parsers.py (--descargar)
+
+Uso:
+    python benchmark_memory.py
+    python benchmark_memory.py --parser html.parser --concurrencia 1 4 16 32
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from article_selectors import iter_articles
+from benchmark_parsers import CARPETA_PAGINAS
+from news_sources_scraper import NewsSourcesScraper
+
+
+MODOS = ('arbol', 'registros')
+
+
+def medir(modo: str, parser: str, ruta: str, concurrencia: int) -> dict:
+    """RSS pico de `concurrencia` descargas en curso de una página (se ejecuta en un proceso nuevo)"""
+    with open(ruta, 'rb') as f:
+        content = f.read()
+    scraper = NewsSourcesScraper(parser=parser)
+    llegadas = [threading.Event() for _ in range(concurrencia)]
+    llegadas[0].set()
+    barrera = threading.Barrier(concurrencia)
+    
+    def extraer(indice: int) -> int:
+        llegadas[indice].wait()
+        if modo == 'arbol':
+            document = scraper.parse_document(content)
+            articulos = scraper.extract_articles_generic(document, 'https://example.com/')
+        else:
+            articulos = list(iter_articles(scraper.parse_candidates(content, 'https://example.com/')))
+        if indice + 1 < concurrencia:
+            llegadas[indice + 1].set()
+        barrera.wait()
+        return len(articulos)
+    
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+        articulos = sum(executor.map(extraer, range(concurrencia)))
+    rss_final = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    return {'rss_kb': rss_final - rss_inicial, 'articulos': articulos // concurrencia}
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Benchmark de memoria pico por descarga simultánea")
+    argumentos.add_argument('--carpeta', default=CARPETA_PAGINAS, help="Carpeta con las páginas guardadas (.html)")
+    argumentos.add_argument('--parser', default='lxml', choices=NewsSourcesScraper.PARSERS, help="Backend de parseo")
+    argumentos.add_argument('--concurrencia', type=int, nargs='+', default=[1, 4, 16], help="Descargas simultáneas")
+    args = argumentos.parse_args()
+    
+    rutas = sorted(glob.glob(os.path.join(args.carpeta, '*.html')))
+    if not rutas:
+        print(f"❌ No hay páginas en {args.carpeta}. Usa benchmark_parsers.py --descargar para guardarlas.")
+        sys.exit(1)
+    
+    print("=" * 70)
+    print("   🧠 BENCHMARK DE MEMORIA (RSS pico por descarga simultánea)")
+    print("=" * 70)
+    print(f"   parser {args.parser}")
+    
+    # Cada medición en un proceso limpio: ru_maxrss es el pico de toda la vida del proceso
+    contexto = multiprocessing.get_context('spawn')
+    for ruta in rutas:
+        print(f"\n📄 {os.path.basename(ruta)} ({os.path.getsize(ruta) // 1024} KB)")
+        for concurrencia in args.concurrencia:
+            for modo in MODOS:
+                with contexto.Pool(1) as pool:
+                    memoria = pool.apply(medir, (modo, args.parser, ruta, concurrencia))
+                print(f"   {concurrencia:>3} simultáneas | {modo:<9} | "
+                      f"pico RSS {memoria['rss_kb'] / 1024:7.1f} MB | "
+                      f"por descarga {memoria['rss_kb'] / 1024 / concurrencia:6.2f} MB | "
+                      f"{memoria['articulos']} artículos")
+    
+    print(f"\n{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
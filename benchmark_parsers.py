@@ -0,0 +1,137 @@
+"""
+Benchmark de los backends de parseo HTML del scraper
+Compara tiempo de parseo y memoria pico de 'html.parser', 'lxml' y 'lxml-fast'
+sobre copias guardadas de las portadas reales de las fuentes
+
+Uso:
+    python benchmark_parsers.py --descargar        # guarda las portadas de SOURCES y mide
+    python benchmark_parsers.py                    # mide con las páginas ya guardadas
+    python benchmark_parsers.py --carpeta otra/ --repeticiones 10
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+from news_sources_scraper import NewsSourcesScraper
+
+
+CARPETA_PAGINAS = os.path.join('benchmarks', 'paginas')
+
+
+def descargar_portadas(carpeta: str):
+    """Guarda el HTML crudo de la portada de cada fuente configurada"""
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    
+    scraper = NewsSourcesScraper()
+    for url in scraper.SOURCES:
+        content = scraper.fetch_content(url)
+        if content is None:
+            print(f"  ❌ No se pudo descargar {url}")
+            continue
+        nombre = (urlparse(url).netloc + urlparse(url).path).strip('/').replace('/', '_') + '.html'
+        with open(os.path.join(carpeta, nombre), 'wb') as f:
+            f.write(content)
+        print(f"  💾 {nombre} ({len(content) // 1024} KB)")
+
+
+def parsear_y_extraer(scraper: NewsSourcesScraper, content: bytes):
+    """Parseo + extracción de candidatos, lo que hace scrape_source con cada portada"""
+    document = scraper.parse_document(content)
+    return scraper.extract_articles_generic(document, 'https://example.com/')
+
+
+def medir_tiempos(parser: str, content: bytes, repeticiones: int) -> dict:
+    """Tiempo medio (ms) de solo parseo y de parseo + extracción"""
+    scraper = NewsSourcesScraper(parser=parser)
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        scraper.parse_document(content)
+    parseo = (time.perf_counter() - inicio) / repeticiones
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        articulos = parsear_y_extraer(scraper, content)
+    total = (time.perf_counter() - inicio) / repeticiones
+    
+    return {'parseo_ms': parseo * 1000, 'total_ms': total * 1000, 'articulos': len(articulos)}
+
+
+def medir_memoria(parser: str, ruta: str) -> dict:
+    """
+    Memoria pico de parseo + extracción (se ejecuta en un proceso nuevo)
+    - rss_kb: crecimiento del RSS máximo del proceso (incluye la memoria de libxml2)
+    - python_kb: pico de memoria reservada por Python (tracemalloc)
+    """
+    with open(ruta, 'rb') as f:
+        content = f.read()
+    scraper = NewsSourcesScraper(parser=parser)
+    
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    parsear_y_extraer(scraper, content)
+    _, pico_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_final = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    return {'rss_kb': rss_final - rss_inicial, 'python_kb': pico_python // 1024}
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Benchmark de backends de parseo HTML")
+    argumentos.add_argument('--carpeta', default=CARPETA_PAGINAS, help="Carpeta con las páginas guardadas (.html)")
+    argumentos.add_argument('--descargar', action='store_true', help="Descargar antes las portadas de SOURCES")
+    argumentos.add_argument('--repeticiones', type=int, default=5, help="Repeticiones por medición de tiempo")
+    args = argumentos.parse_args()
+    
+    if args.descargar:
+        print(f"🌐 Descargando portadas en {args.carpeta}...")
+        descargar_portadas(args.carpeta)
+    
+    rutas = sorted(glob.glob(os.path.join(args.carpeta, '*.html')))
+    if not rutas:
+        print(f"❌ No hay páginas en {args.carpeta}. Usa --descargar para guardarlas.")
+        sys.exit(1)
+    
+    print("=" * 70)
+    print("   ⏱️  BENCHMARK DE PARSERS HTML")
+    print("=" * 70)
+    
+    # Cada medición de memoria en un proceso limpio para que los picos no se mezclen
+    contexto = multiprocessing.get_context('spawn')
+    totales = {parser: 0.0 for parser in NewsSourcesScraper.PARSERS}
+    
+    for ruta in rutas:
+        with open(ruta, 'rb') as f:
+            content = f.read()
+        print(f"\n📄 {os.path.basename(ruta)} ({len(content) // 1024} KB)")
+        
+        for parser in NewsSourcesScraper.PARSERS:
+            tiempos = medir_tiempos(parser, content, args.repeticiones)
+            with contexto.Pool(1) as pool:
+                memoria = pool.apply(medir_memoria, (parser, ruta))
+            totales[parser] += tiempos['total_ms']
+            print(f"   {parser:<12} parseo {tiempos['parseo_ms']:8.1f} ms | "
+                  f"parseo+extracción {tiempos['total_ms']:8.1f} ms | "
+                  f"pico RSS {memoria['rss_kb'] / 1024:6.1f} MB | "
+                  f"pico Python {memoria['python_kb'] / 1024:6.1f} MB | "
+                  f"{tiempos['articulos']} artículos")
+    
+    print(f"\n{'='*70}")
+    print("📊 TOTAL parseo + extracción (todas las páginas)")
+    referencia = totales['html.parser'] or 1
+    for parser, total in totales.items():
+        print(f"   {parser:<12} {total:8.1f} ms  (x{referencia / total if total else 0:.1f} frente a html.parser)")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
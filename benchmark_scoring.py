@@ -0,0 +1,225 @@
+"""
+Paridad y benchmark del scoring de relevancia por lotes (batch_scoring)
+Comprueba que score_articles y similarity_scores dan la misma 'relevancia' y
+'tipo_match' que el scorer por artículo original (copia congelada de
+calculate_similarity y filter_by_keywords de antes de keyword_matcher, para que
+la referencia no cambie con el código que se compara), y compara los tiempos
+
+Los candidatos salen de las portadas guardadas (ver benchmark_parsers.py --descargar)
+o, si no hay, se generan combinando palabras de las keywords y del tema
+
+Uso:
+    python benchmark_scoring.py
+    python benchmark_scoring.py --articulos 5000 --tema "Inteligencia artificial en salud"
+    python benchmark_scoring.py --keywords IA "machine learning" --repeticiones 10
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+import batch_scoring
+from keyword_matcher import compile_query
+from news_sources_scraper import NewsSourcesScraper
+
+
+CARPETA_PAGINAS = os.path.join('benchmarks', 'paginas')
+
+# Diferencia máxima admitida entre el score por lotes y el score por artículo
+TOLERANCIA = 1e-9
+
+RELLENO = ['gobierno', 'mercado', 'fútbol', 'clima', 'elecciones', 'economía', 'ciencia',
+           'tecnología', 'datos', 'salud', 'empresa', 'estudio', 'nuevo', 'modelo', 'red']
+
+
+def candidatos_guardados(carpeta: str) -> list:
+    """Artículos candidatos (sin filtrar) de las portadas guardadas"""
+    scraper = NewsSourcesScraper()
+    articulos = []
+    for ruta in sorted(glob.glob(os.path.join(carpeta, '*.html'))):
+        with open(ruta, 'rb') as f:
+            document = scraper.parse_document(f.read())
+        articulos.extend(scraper.extract_articles_generic(document, 'https://example.com/'))
+    return articulos
+
+
+def candidatos_sinteticos(cantidad: int, keywords: list, tema: str) -> list:
+    """Artículos con títulos y descripciones que mezclan keywords, tema y relleno"""
+    aleatorio = random.Random(7)
+    palabras = RELLENO + [w for texto in keywords + [tema] for w in texto.split()] + keywords
+    
+    def frase(longitud: int) -> str:
+        return ' '.join(aleatorio.choice(palabras) for _ in range(longitud))
+    
+    return [{
+        'titulo': frase(aleatorio.randint(4, 14)).capitalize(),
+        'url': f'https://example.com/articulo-{i}',
+        'descripcion': frase(aleatorio.choice([0, 20, 45])),
+        'imagen': '',
+        'fecha': ''
+    } for i in range(cantidad)]
+
+
+def similitud_original(text: str, keywords: list, tema: str) -> float:
+    """
+    Referencia congelada: calculate_similarity tal como era antes de keyword_matcher
+    (sin consulta compilada, normalizando el texto y cada keyword en cada llamada)
+    """
+    text_lower = text.lower()
+    text_normalized = re.sub(r'[^\w\s]', ' ', text_lower)
+    tema_normalized = re.sub(r'[^\w\s]', ' ', tema.lower())
+    tema_words = [w for w in tema_normalized.split() if len(w) > 3]
+    
+    score = 0.0
+    keywords_found = 0
+    tema_words_found = 0
+    
+    # 1. Coincidencia exacta de keywords completas y de todas sus palabras
+    for kw in keywords:
+        kw_normalized = re.sub(r'[^\w\s]', ' ', kw.lower())
+        if kw_normalized in text_normalized:
+            keywords_found += 1
+            score += 20 + len(kw_normalized) * 4
+        
+        kw_words = [w for w in kw_normalized.split() if len(w) > 2]
+        if len(kw_words) > 1:
+            matches = sum(1 for word in kw_words if word in text_normalized)
+            if matches == len(kw_words):
+                keywords_found += 1
+                score += 15
+            elif matches >= len(kw_words) * 0.8:
+                score += 10
+    
+    # 2. Coincidencia de palabras del tema
+    for word in tema_words:
+        if word in text_normalized:
+            tema_words_found += 1
+            score += 8
+    
+    # 3. Verificación de correlación temática (keywords principales)
+    keywords_principales = [kw for kw in keywords if len(kw.split()) == 1 or len(kw) > 8]
+    if keywords_principales:
+        encontradas = sum(1 for kw in keywords_principales if kw.lower() in text_normalized)
+        porcentaje_keywords = encontradas / len(keywords_principales)
+        if porcentaje_keywords < 0.3:
+            score *= 0.3
+        elif porcentaje_keywords >= 0.7:
+            score += 25
+    
+    # 4. Palabras sueltas de refuerzo, solo si hay alguna coincidencia previa
+    if keywords_found > 0 or tema_words_found > 0:
+        all_keywords_words = []
+        for kw in keywords:
+            kw_normalized = re.sub(r'[^\w\s]', ' ', kw.lower())
+            all_keywords_words.extend([w for w in kw_normalized.split() if len(w) > 3])
+        for kw_word in set(all_keywords_words):
+            if kw_word in text_normalized:
+                score += 2
+    
+    # 5. Bonus por keyword en textos cortos (probablemente títulos)
+    if len(text) < 200:
+        for kw in keywords:
+            if kw.lower() in text_lower:
+                score += 8
+    
+    # 6. Penalización si no hay suficiente correlación
+    if keywords_found == 0 and tema_words_found < 2:
+        score *= 0.2
+    
+    return min(score, 200)
+
+
+def clasificar_por_articulo(articulos: list, keywords: list, tema: str) -> list:
+    """
+    Referencia congelada: la clasificación de filter_by_keywords artículo por
+    artículo, tal como era antes de keyword_matcher y batch_scoring
+    """
+    puntuaciones = []
+    for article in articulos:
+        text_to_search = f"{article['titulo']} {article['descripcion']}".lower()
+        encontradas = [kw for kw in keywords if kw.lower() in text_to_search]
+        if encontradas:
+            relevance = len(encontradas) * 30 + 100
+            if len(encontradas) >= len(keywords) * 0.5:
+                relevance += 50
+            puntuaciones.append((relevance, 'exacto'))
+            continue
+        
+        score = similitud_original(f"{article['titulo']} {article['descripcion']}", keywords, tema) if tema else 0
+        if tema and score >= batch_scoring.UMBRAL_MINIMO_SIMILAR:
+            puntuaciones.append((score, 'similar'))
+        elif tema and score >= batch_scoring.UMBRAL_MINIMO_FLEXIBLE:
+            puntuaciones.append((score, 'flexible'))
+        else:
+            puntuaciones.append(None)
+    return puntuaciones
+
+
+def diferencias(esperadas: list, obtenidas: list) -> int:
+    """Número de artículos cuya relevancia o tipo_match no coincide"""
+    distintas = 0
+    for esperada, obtenida in zip(esperadas, obtenidas):
+        if esperada is None or obtenida is None:
+            distintas += esperada != obtenida
+        elif esperada[1] != obtenida[1] or abs(esperada[0] - obtenida[0]) > TOLERANCIA:
+            distintas += 1
+    return distintas + abs(len(esperadas) - len(obtenidas))
+
+
+def cronometrar(funcion, repeticiones: int) -> float:
+    """Tiempo medio (ms) de una llamada"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Paridad y benchmark del scoring por lotes")
+    argumentos.add_argument('--carpeta', default=CARPETA_PAGINAS, help="Carpeta con las portadas guardadas (.html)")
+    argumentos.add_argument('--articulos', type=int, default=2000, help="Artículos sintéticos si no hay portadas")
+    argumentos.add_argument('--keywords', nargs='+', default=['inteligencia artificial', 'IA', 'machine learning', 'salud'])
+    argumentos.add_argument('--tema', default='Inteligencia artificial aplicada a la salud pública')
+    argumentos.add_argument('--repeticiones', type=int, default=5, help="Repeticiones por medición de tiempo")
+    args = argumentos.parse_args()
+    
+    articulos = candidatos_guardados(args.carpeta)
+    origen = args.carpeta
+    if not articulos:
+        articulos = candidatos_sinteticos(args.articulos, args.keywords, args.tema)
+        origen = 'sintéticos'
+    
+    print("=" * 70)
+    print("   ⚖️  SCORING DE RELEVANCIA POR LOTES")
+    print("=" * 70)
+    print(f"📄 {len(articulos)} artículos ({origen}) | NumPy: {'sí' if batch_scoring.np is not None else 'no (por artículo)'}")
+    
+    # Paridad de la clasificación de filter_by_keywords
+    esperadas = clasificar_por_articulo(articulos, args.keywords, args.tema)
+    obtenidas = batch_scoring.score_articles(articulos, args.keywords, args.tema)
+    fallos = diferencias(esperadas, obtenidas)
+    
+    # Paridad de la relevancia con contenido (como en _build_finding)
+    textos = [f"{a['titulo']} {a['descripcion']} {a['descripcion'] * 8}" for a in articulos]
+    query = compile_query(args.keywords, args.tema)
+    por_lotes = batch_scoring.similarity_scores(query, textos)
+    fallos += sum(1 for texto, score in zip(textos, por_lotes)
+                  if abs(similitud_original(texto, args.keywords, args.tema) - score) > TOLERANCIA)
+    
+    print(f"{'✅' if fallos == 0 else '❌'} Paridad con el scorer por artículo: {fallos} diferencias")
+    
+    por_articulo_ms = cronometrar(lambda: clasificar_por_articulo(articulos, args.keywords, args.tema), args.repeticiones)
+    lotes_ms = cronometrar(lambda: batch_scoring.score_articles(articulos, args.keywords, args.tema), args.repeticiones)
+    print(f"⏱️  Por artículo {por_articulo_ms:8.1f} ms | por lotes {lotes_ms:8.1f} ms "
+          f"(x{por_articulo_ms / lotes_ms if lotes_ms else 0:.1f})")
+    print(f"{'='*70}\n")
+    
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cache de candidatos a artículo por página (portadas y búsquedas de las fuentes)
+Los candidatos de extract_candidates no dependen de la búsqueda: si una página no
+ha cambiado, los ya extraídos sirven sin volver a parsearla
+
+- Por página se guardan los validadores HTTP de la última descarga (ETag /
+  Last-Modified) para pedirla con una petición condicional, el hash del HTML y
+  los candidatos extraídos
+- Dentro del TTL (corto: las portadas cambian cada pocos minutos) los candidatos
+  se sirven sin tocar la red, así que búsquedas distintas en poco tiempo hacen
+  un solo crawl de cada portada; pasado el TTL se revalidan
+- Un lock por página evita que búsquedas simultáneas la descarguen a la vez
+- En memoria, seguro entre hilos, con expulsión LRU al superar max_entries
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from article_selectors import Candidate
+
+
+class CandidateCache:
+    """Candidatos sin filtrar por página, con los validadores de su última descarga"""
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 120):
+        """
+        Args:
+            max_entries: Páginas guardadas como máximo
+            ttl: Segundos durante los que los candidatos se sirven sin revalidar (0 = revalidar siempre)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._page_locks = {}  # (parser, url) -> lock de descarga
+        self._entries = OrderedDict()  # (parser, url) -> entrada (orden = uso, la más reciente al final)
+    
+    def get(self, parser: str, url: str) -> Optional[Dict]:
+        """
+        Entrada de la página extraída con ese parser, o None
+        La entrada tiene las claves: hash, candidatos, etag, last_modified, guardado
+        """
+        with self._lock:
+            entry = self._entries.get((parser, url))
+            if entry is not None:
+                self._entries.move_to_end((parser, url))
+            return entry
+    
+    def is_fresh(self, entry: Dict) -> bool:
+        """True si los candidatos se guardaron o revalidaron hace menos del TTL"""
+        return time.time() - entry['guardado'] < self.ttl
+    
+    def lock_for(self, parser: str, url: str) -> threading.Lock:
+        """Lock de descarga de la página (una sola descarga simultánea por página)"""
+        with self._lock:
+            return self._page_locks.setdefault((parser, url), threading.Lock())
+    
+    def store(self, parser: str, url: str, html_hash: str, candidatos: List[Candidate], validators: Dict):
+        """Guarda (o renueva) los candidatos de la página y los validadores de su última respuesta"""
+        entry = {
+            'hash': html_hash,
+            'candidatos': candidatos,
+            'etag': validators.get('etag'),
+            'last_modified': validators.get('last_modified'),
+            'guardado': time.time()
+        }
+        with self._lock:
+            self._entries[(parser, url)] = entry
+            self._entries.move_to_end((parser, url))
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._page_locks.pop(evicted, None)
+    
+    def clear(self):
+        """Vacía el cache"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
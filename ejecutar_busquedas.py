@@ -4,20 +4,38 @@ Extrae noticias de múltiples fuentes sobre un tema específico
 """
 
 from news_sources_scraper import NewsSourcesScraper
+from http_cache import HTTPResponseCache
+from robots_cache import shared_robots_cache
+from seen_index import SeenUrlIndex
+from result_serializer import ResultSerializer
+import os
 import sys
 from datetime import datetime
 
 
-def ejecutar_busqueda(tema: str, keywords: list = None):
+def crear_scraper(procesos: bool = False) -> NewsSourcesScraper:
+    # Cache HTTP en disco: búsquedas repetidas reutilizan páginas ya descargadas
+    # robots.txt y el índice de artículos vistos se guardan junto a él
+    # Con procesos, el HTML se parsea en un proceso por núcleo en lugar de en los hilos
+    return NewsSourcesScraper(
+        http_cache=HTTPResponseCache(),
+        robots_cache=shared_robots_cache(os.path.join('cache_http', 'robots.json')),
+        seen_index=SeenUrlIndex(os.path.join('cache_http', 'vistos.sqlite')),
+        parse_processes=(os.cpu_count() or 1) if procesos else 0
+    )
+
+
+def ejecutar_busqueda(tema: str, keywords: list = None, incremental: bool = False,
+                      procesos: bool = False):
     """
     Ejecuta una búsqueda por tema
     
     Args:
         tema: Tema de búsqueda
         keywords: Lista de palabras clave (opcional, si no se proporciona usa el tema)
+        incremental: Solo artículos nuevos o modificados desde la última ejecución
+        procesos: Parsear el HTML en un pool de procesos (uno por núcleo)
     """
-    scraper = NewsSourcesScraper()
-    
     print("=" * 70)
     print("   🕷️  SCRAPER DE NOTICIAS MULTI-FUENTE")
     print("=" * 70)
@@ -30,15 +48,18 @@ def ejecutar_busqueda(tema: str, keywords: list = None):
     
     print(f"📌 Palabras clave: {', '.join(keywords)}\n")
     
-    # Ejecutar búsqueda
-    resultado = scraper.generate_search_result(
-        search_query=tema,
-        keywords=keywords
-    )
-    
-    # Guardar resultado
-    filename = f"busqueda_{tema.lower().replace(' ', '_').replace('/', '_')}.json"
-    scraper.save_results(resultado, filename)
+    # Ejecutar búsqueda (al salir se cierra el scraper y su pool de procesos de parseo)
+    with crear_scraper(procesos) as scraper:
+        resultado = scraper.generate_search_result(
+            search_query=tema,
+            keywords=keywords,
+            incremental=incremental
+        )
+        
+        # Guardar resultado (el incremental aparte, para no sustituir al completo)
+        sufijo = '_nuevos' if incremental else ''
+        filename = f"busqueda_{tema.lower().replace(' ', '_').replace('/', '_')}{sufijo}.json"
+        scraper.save_results(resultado, filename)
     
     # Mostrar resumen
     print(f"\n{'='*70}")
@@ -64,18 +85,92 @@ def ejecutar_busqueda(tema: str, keywords: list = None):
     return resultado
 
 
+def ejecutar_busqueda_stream(tema: str, keywords: list = None, incremental: bool = False,
+                             procesos: bool = False):
+    """
+    Ejecuta una búsqueda mostrando cada hallazgo en cuanto está listo
+    Los hallazgos se guardan uno por línea (NDJSON) a medida que llegan, sin
+    acumular el resultado completo en memoria
+    
+    Args:
+        tema: Tema de búsqueda
+        keywords: Lista de palabras clave (opcional, si no se proporciona usa el tema)
+        incremental: Solo artículos nuevos o modificados desde la última ejecución
+        procesos: Parsear el HTML en un pool de procesos (uno por núcleo)
+    """
+    print("=" * 70)
+    print("   🕷️  SCRAPER DE NOTICIAS MULTI-FUENTE (STREAMING)")
+    print("=" * 70)
+    print(f"\n📅 Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🔍 Tema de búsqueda: {tema}")
+    
+    # Si no se proporcionan keywords, usar el tema
+    if not keywords:
+        keywords = [tema]
+    
+    print(f"📌 Palabras clave: {', '.join(keywords)}\n")
+    
+    resultados_dir = 'resultados'
+    if not os.path.exists(resultados_dir):
+        os.makedirs(resultados_dir)
+    sufijo = '_nuevos' if incremental else ''
+    filepath = os.path.join(resultados_dir, f"busqueda_{tema.lower().replace(' ', '_').replace('/', '_')}{sufijo}.ndjson")
+    
+    serializador = ResultSerializer(indent=None)  # Una línea por evento
+    resumen = None
+    numero = 0
+    with crear_scraper(procesos) as scraper, open(filepath, 'wb') as f:
+        for evento in scraper.iter_search_results(search_query=tema, keywords=keywords, incremental=incremental):
+            f.write(serializador.dumps(evento) + b"\n")
+            f.flush()
+            
+            if evento['evento'] == 'hallazgo':
+                numero += 1
+                hallazgo = evento['datos']
+                print(f"📰 {numero}. {hallazgo['titulo']}")
+                print(f"   Fuente: {hallazgo['fuente']} | Relevancia: {hallazgo['relevancia']:.0f}")
+                print(f"   URL: {hallazgo['url']}")
+                if hallazgo.get('contenido'):
+                    print(f"   Contenido: {len(hallazgo['contenido'])} caracteres extraídos")
+                print()
+            elif evento['evento'] == 'resumen':
+                resumen = evento['datos']
+    
+    print(f"\n💾 Resultados guardados en: {filepath}")
+    print(f"\n{'='*70}")
+    print("📊 RESULTADOS")
+    print(f"{'='*70}")
+    if resumen:
+        print(f"Total de hallazgos: {resumen['total_hallazgos']}")
+        print(f"Fuentes exitosas: {resumen['fuentes_exitosas']}/{resumen['total_fuentes_consultadas']}")
+    print(f"\n{'='*70}")
+    print("✅ Proceso finalizado")
+    print(f"{'='*70}\n")
+    
+    return resumen
+
+
 if __name__ == "__main__":
+    # --stream: mostrar los hallazgos a medida que llegan
+    # --incremental: solo artículos nuevos o modificados desde la última ejecución
+    # --procesos: parsear el HTML en un proceso por núcleo
+    opciones = {opcion: opcion in sys.argv[1:] for opcion in ('--stream', '--incremental', '--procesos')}
+    sys.argv = [arg for arg in sys.argv if arg not in opciones]
+    
     if len(sys.argv) < 2:
         print("=" * 70)
         print("   🕷️  SCRAPER DE NOTICIAS MULTI-FUENTE")
         print("=" * 70)
         print("\n📖 USO:")
-        print("   python ejecutar_busquedas.py \"<tema>\" [keyword1] [keyword2] ...")
+        print("   python ejecutar_busquedas.py \"<tema>\" [keyword1] [keyword2] ... [--stream] [--incremental] [--procesos]")
         print("\n📝 EJEMPLOS:")
         print("   python ejecutar_busquedas.py \"Inteligencia Artificial\"")
         print("   python ejecutar_busquedas.py \"Inteligencia Artificial\" \"IA\" \"AI\" \"machine learning\"")
         print("   python ejecutar_busquedas.py \"Cambio climático\"")
         print("   python ejecutar_busquedas.py \"Tecnología\" \"tech\" \"innovación\"")
+        print("   python ejecutar_busquedas.py \"Cambio climático\" --stream   # hallazgos a medida que llegan")
+        print("   python ejecutar_busquedas.py \"Cambio climático\" --incremental   # solo lo nuevo desde la última vez")
+        print("   python ejecutar_busquedas.py \"Cambio climático\" --procesos   # parseo en todos los núcleos")
         print("\n💡 NOTA: El tema debe ir entre comillas dobles si contiene espacios")
         print("=" * 70)
         sys.exit(1)
@@ -83,4 +178,9 @@ if __name__ == "__main__":
     tema = sys.argv[1]
     keywords = sys.argv[2:] if len(sys.argv) > 2 else None
     
-    ejecutar_busqueda(tema, keywords)
+    if opciones['--stream']:
+        ejecutar_busqueda_stream(tema, keywords, incremental=opciones['--incremental'],
+                                 procesos=opciones['--procesos'])
+    else:
+        ejecutar_busqueda(tema, keywords, incremental=opciones['--incremental'],
+                          procesos=opciones['--procesos'])
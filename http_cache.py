@@ -0,0 +1,185 @@
+"""
+Cache HTTP persistente en disco para el scraper de noticias
+Guarda las respuestas por URL junto con sus validadores (ETag / Last-Modified)
+
+- Dentro del TTL la respuesta se sirve directamente desde disco, sin tocar la red
+- Pasado el TTL se revalida con una petición condicional (If-None-Match /
+  If-Modified-Since); si el servidor responde 304 se reutiliza el cuerpo guardado
+- Cuando el tamaño total supera max_bytes se eliminan las entradas usadas
+  hace más tiempo (LRU)
+- Las lecturas no escriben: el último acceso de cada URL se anota en memoria y se
+  guarda por lotes (con la siguiente escritura, o cada TOUCH_BATCH accesos o
+  TOUCH_INTERVAL segundos), y el tamaño total se lleva en un contador en lugar de
+  sumarlo en cada store
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Accesos anotados en memoria como máximo antes de guardarlos en la base de datos
+TOUCH_BATCH = 64
+# Segundos como máximo que un acceso anotado espera a guardarse
+TOUCH_INTERVAL = 30.0
+
+
+class HTTPResponseCache:
+    """Cache de respuestas HTTP en SQLite con TTL, revalidación y expulsión LRU"""
+    
+    def __init__(self, cache_dir: str = 'cache_http', ttl: float = 600, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Carpeta donde se guarda la base de datos del cache
+            ttl: Segundos durante los que una respuesta se considera fresca
+            max_bytes: Tamaño máximo total de los cuerpos guardados
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        
+        self._conn = sqlite3.connect(os.path.join(cache_dir, 'respuestas.db'), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS respuestas (
+                url TEXT PRIMARY KEY,
+                contenido BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                guardado REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL,
+                tamano INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ultimo_acceso ON respuestas (ultimo_acceso)")
+        self._conn.commit()
+        
+        self._touched = {}  # URL -> último acceso todavía sin guardar
+        self._touched_since = 0.0  # Momento del acceso pendiente más antiguo
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(tamano), 0) FROM respuestas").fetchone()[0]
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Retorna la entrada guardada para la URL (fresca o no) o None si no existe
+        La entrada tiene las claves: contenido, etag, last_modified, guardado
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT contenido, etag, last_modified, guardado FROM respuestas WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touch(url)
+        
+        return {
+            'contenido': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'guardado': row[3]
+        }
+    
+    def is_fresh(self, entry: Dict) -> bool:
+        """True si la entrada todavía está dentro del TTL"""
+        return time.time() - entry['guardado'] < self.ttl
+    
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        """Headers para revalidar una entrada (o unos validadores) con una petición condicional"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def store(self, url: str, content: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Guarda (o reemplaza) la respuesta de una URL y aplica la expulsión LRU"""
+        if len(content) > self.max_bytes:
+            return
+        
+        now = time.time()
+        with self._lock:
+            self._touched.pop(url, None)
+            previo = self._conn.execute("SELECT tamano FROM respuestas WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO respuestas (url, contenido, etag, last_modified, guardado, ultimo_acceso, tamano) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, sqlite3.Binary(content), etag, last_modified, now, now, len(content))
+            )
+            self._total_bytes += len(content) - (previo[0] if previo else 0)
+            self._evict()
+            self._conn.commit()
+    
+    def refresh(self, url: str):
+        """Marca una entrada como revalidada (respuesta 304): reinicia su TTL"""
+        now = time.time()
+        with self._lock:
+            self._touched.pop(url, None)
+            self._conn.execute("UPDATE respuestas SET guardado = ?, ultimo_acceso = ? WHERE url = ?", (now, now, url))
+            self._write_touched()
+            self._conn.commit()
+    
+    def flush(self):
+        """Guarda los accesos anotados en memoria (el orden LRU en disco queda al día)"""
+        with self._lock:
+            if self._touched:
+                self._write_touched()
+                self._conn.commit()
+    
+    def _touch(self, url: str):
+        """Anota el acceso a una URL y guarda el lote si toca (requiere el lock)"""
+        now = time.time()
+        if not self._touched:
+            self._touched_since = now
+        self._touched[url] = now
+        if len(self._touched) >= TOUCH_BATCH or now - self._touched_since >= TOUCH_INTERVAL:
+            self._write_touched()
+            self._conn.commit()
+    
+    def _write_touched(self):
+        """Escribe los accesos anotados en la transacción en curso (requiere el lock)"""
+        if self._touched:
+            self._conn.executemany("UPDATE respuestas SET ultimo_acceso = ? WHERE url = ?",
+                                   [(instante, url) for url, instante in self._touched.items()])
+            self._touched.clear()
+    
+    def _evict(self):
+        """Elimina las entradas menos usadas hasta quedar por debajo de max_bytes (requiere el lock)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        
+        self._write_touched()  # El orden LRU tiene en cuenta los accesos todavía sin guardar
+        for url, tamano in self._conn.execute(
+            "SELECT url, tamano FROM respuestas ORDER BY ultimo_acceso ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM respuestas WHERE url = ?", (url,))
+            self._total_bytes -= tamano
+            if self._total_bytes <= self.max_bytes:
+                break
+    
+    def clear(self):
+        """Vacía el cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM respuestas")
+            self._conn.commit()
+            self._touched.clear()
+            self._total_bytes = 0
+    
+    def stats(self) -> Dict:
+        """Estadísticas del cache (número de entradas y tamaño total)"""
+        with self._lock:
+            entradas, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM respuestas"
+            ).fetchone()
+            self._total_bytes = total  # Corrige el contador si otro proceso usa la misma base de datos
+        return {
+            'entradas': entradas,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl
+        }
@@ -0,0 +1,160 @@
+"""
+Transporte HTTP de las sesiones de requests del scraper
+Con las descargas en paralelo, el HTTPAdapter por defecto (10 conexiones por host,
+sin reintentos) se queda corto: las conexiones que no caben en el pool se cierran
+tras cada petición y hay que volver a abrirlas (TCP + TLS) en la siguiente
+
+- build_http_adapter: pool de conexiones por host dimensionado para la concurrencia
+  del scraper, keep-alive y reintentos solo de conexión (nunca se repite una
+  petición que el servidor ya ha recibido)
+- HTTPXAdapter: transporte opcional con HTTP/2 (httpx + h2), que multiplexa todas
+  las peticiones a un host sobre una sola conexión. Respeta stream=True: el cuerpo
+  se lee por partes (iter_content) sin descargarlo entero antes. Los Set-Cookie
+  llegan a la sesión igual que con HTTPAdapter (también los de las redirecciones)
+"""
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from types import SimpleNamespace
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # Opcional: sin httpx no hay HTTP/2
+    httpx = None
+
+
+# Reintentos de conexión (DNS, conexión rechazada) con espera creciente entre ellos
+CONNECT_RETRIES = 2
+RETRY_BACKOFF = 0.3
+
+# Headers propios de HTTP/1.1 que HTTP/2 no admite
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+
+class HTTPXHeaders:
+    """
+    Headers de una respuesta httpx con la parte de la interfaz de http.client.HTTPMessage
+    que usa http.cookiejar para leer los Set-Cookie (get_all)
+    """
+    
+    def __init__(self, headers: 'httpx.Headers'):
+        self._headers = headers
+    
+    def get_all(self, name: str, default=None):
+        valores = self._headers.get_list(name)
+        return valores if valores else default
+
+
+class HTTPXStream:
+    """
+    Cuerpo de una respuesta httpx (abierta en streaming o ya leída), con la parte de
+    la interfaz de response.raw (urllib3) que usa requests: stream() para iter_content,
+    close() y _original_response.msg, de donde la sesión extrae las cookies
+    """
+    
+    def __init__(self, respuesta: 'httpx.Response', request: requests.PreparedRequest):
+        self._respuesta = respuesta
+        self._request = request
+        # requests solo guarda las cookies de respuestas con _original_response (http.client)
+        self._original_response = SimpleNamespace(msg=HTTPXHeaders(respuesta.headers))
+    
+    def stream(self, chunk_size: int = None, decode_content: bool = True):
+        """Trozos del cuerpo a medida que llegan (httpx ya los descomprime)"""
+        try:
+            yield from self._respuesta.iter_bytes(chunk_size)
+        except httpx.DecodingError as e:
+            raise requests.exceptions.ContentDecodingError(e, request=self._request)
+        except httpx.TransportError as e:
+            # Como requests con urllib3: un error de lectura a mitad del cuerpo es de conexión
+            raise requests.exceptions.ConnectionError(e, request=self._request)
+    
+    @property
+    def closed(self) -> bool:
+        return self._respuesta.is_closed
+    
+    def close(self):
+        """Cierra la respuesta y devuelve la conexión al pool del cliente"""
+        self._respuesta.close()
+    
+    release_conn = close
+
+
+class HTTPXAdapter(BaseAdapter):
+    """
+    Adaptador de requests que envía las peticiones con un cliente httpx (HTTP/2)
+    La sesión de requests sigue gestionando headers, cookies y redirecciones
+    (verify, cert y proxies son los del cliente, no los de cada petición)
+    """
+    
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 32, http2: bool = True):
+        if httpx is None:
+            raise ImportError("HTTPXAdapter necesita httpx (pip install 'httpx[http2]')")
+        super().__init__()
+        self.client = httpx.Client(transport=httpx.HTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            retries=CONNECT_RETRIES
+        ), cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])))
+        # El cliente (compartido por todas las sesiones que montan el adaptador) no guarda
+        # ni envía cookies: de eso se encarga cada sesión de requests
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        # requests admite (conexión, lectura) como timeout
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS}
+        try:
+            peticion = self.client.build_request(request.method, request.url, headers=headers,
+                                                 content=request.body, timeout=timeout)
+            # Con stream, solo se leen los headers: el cuerpo queda en HTTPXStream
+            respuesta = self.client.send(peticion, stream=stream, follow_redirects=False)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        
+        response = requests.Response()
+        response.status_code = respuesta.status_code
+        response.reason = respuesta.reason_phrase
+        response.headers = CaseInsensitiveDict(respuesta.headers.multi_items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = HTTPXStream(respuesta, request)
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        if not stream:
+            response._content = respuesta.content  # httpx ya lo ha descomprimido
+            response._content_consumed = True
+        return response
+    
+    def close(self):
+        self.client.close()
+
+
+def build_http_adapter(pool_connections: int = 32, pool_maxsize: int = 10, http2: bool = False) -> BaseAdapter:
+    """
+    Adaptador para montar en una requests.Session
+    
+    Args:
+        pool_connections: Hosts distintos cuyo pool de conexiones se conserva
+        pool_maxsize: Conexiones abiertas como máximo por host (las peticiones
+                      simultáneas a un mismo host no deberían superarlo)
+        http2: Usar HTTP/2 con httpx si está instalado (si no, HTTP/1.1 con keep-alive)
+    """
+    if http2:
+        try:
+            return HTTPXAdapter(max_connections=pool_connections * pool_maxsize, max_keepalive=pool_maxsize * 4)
+        except ImportError as e:
+            print(f"  ⚠️  HTTP/2 no disponible ({e}); se usa HTTP/1.1")
+    
+    # Los errores de lectura no se reintentan (read=False), como en el adaptador por defecto
+    retries = Retry(total=CONNECT_RETRIES, connect=CONNECT_RETRIES, read=False, backoff_factor=RETRY_BACKOFF)
+    return HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries)
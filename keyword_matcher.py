@@ -0,0 +1,210 @@
+"""
+Consulta de keywords precompilada para el scoring de relevancia
+quick_title_check, calculate_similarity y filter_by_keywords normalizaban cada
+keyword y el tema en cada artículo y luego buscaban cada palabra por separado;
+CompiledQuery hace ese trabajo una sola vez por búsqueda y, en cada texto, averigua
+en una pasada qué términos aparecen. Los scores son idénticos a los originales.
+
+- Con pocos términos (lo habitual) cada término único se busca una vez con `in`,
+  que recorre el texto en C y es más rápido que una regex combinada en Python
+- Con muchos términos, si está instalado pyahocorasick, se usa un autómata
+  Aho-Corasick que encuentra todos en un único recorrido del texto
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # Opcional: sin él se usa la búsqueda con `in`
+    ahocorasick = None
+
+
+# Caracteres que se sustituyen por espacios al normalizar (compilado una vez)
+NON_WORD = re.compile(r'[^\w\s]')
+
+# A partir de cuántos términos únicos compensa el autómata frente a la búsqueda con `in`
+AHOCORASICK_MIN_TERMS = 24
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y caracteres especiales sustituidos por espacios"""
+    return NON_WORD.sub(' ', text.lower())
+
+
+class TermMatcher:
+    """Encuentra qué términos de un conjunto fijo aparecen (como subcadena) en un texto"""
+    
+    def __init__(self, terms):
+        self.terms = frozenset(terms)
+        self._always = frozenset(term for term in self.terms if not term)  # '' está en cualquier texto
+        self._automaton = None
+        
+        searchable = [term for term in self.terms if term]
+        if ahocorasick is not None and len(searchable) >= AHOCORASICK_MIN_TERMS:
+            self._automaton = ahocorasick.Automaton()
+            for term in searchable:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+    
+    def present(self, text: str) -> Set[str]:
+        """Términos que aparecen en el texto"""
+        if self._automaton is not None:
+            found = {term for _, term in self._automaton.iter(text)}
+            return found | self._always if self._always else found
+        return {term for term in self.terms if term in text}
+
+
+class CompiledQuery:
+    """
+    Keywords y tema de una búsqueda ya normalizados, con los términos que
+    usan las funciones de scoring agrupados para buscarlos de una vez
+    """
+    
+    def __init__(self, keywords: Tuple[str, ...], tema: str):
+        self.keywords = list(keywords)
+        self.tema = tema
+        
+        self.keywords_lower = [kw.lower() for kw in keywords]
+        self.keywords_normalized = [normalize(kw) for kw in keywords]
+        # Palabras de cada keyword: > 2 caracteres para la coincidencia por palabras
+        self.keyword_words = [[w for w in kw.split() if len(w) > 2] for kw in self.keywords_normalized]
+        # Palabras significativas del tema (más de 3 caracteres)
+        self.tema_words = [w for w in normalize(tema).split() if len(w) > 3]
+        # Keywords principales: de una palabra o largas (se buscan sin normalizar)
+        self.keywords_principales = [kw.lower() for kw in keywords if len(kw.split()) == 1 or len(kw) > 8]
+        # Palabras sueltas de refuerzo (> 3 caracteres, sin repetir)
+        self.all_keywords_words = {w for kw in self.keywords_normalized for w in kw.split() if len(w) > 3}
+        
+        # Términos que se buscan en el texto normalizado y en el texto en minúsculas
+        self.normalized_matcher = TermMatcher(
+            self.keywords_normalized +
+            [w for words in self.keyword_words for w in words] +
+            self.tema_words +
+            self.keywords_principales +
+            list(self.all_keywords_words)
+        )
+        self.lower_matcher = TermMatcher(self.keywords_lower)
+        
+        # Cota superior de similarity(): todos sus términos suman y las penalizaciones
+        # solo reducen, así que ningún texto supera el score con todo presente
+        self.max_similarity = min(200, (
+            sum(20 + len(kw) * 4 for kw in self.keywords_normalized) +
+            15 * sum(1 for words in self.keyword_words if len(words) > 1) +
+            8 * len(self.tema_words) +
+            (25 if self.keywords_principales else 0) +
+            2 * len(self.all_keywords_words) +
+            8 * len(self.keywords_lower)
+        ))
+    
+    def title_matches(self, title: str) -> bool:
+        """Lógica de quick_title_check: True si el título tiene relación con el tema/keywords"""
+        if not self.keywords and not self.tema:
+            return True  # Si no hay filtro, aceptar todos
+        
+        present = self.normalized_matcher.present(normalize(title))
+        
+        # Verificar keywords
+        for kw_normalized, kw_words in zip(self.keywords_normalized, self.keyword_words):
+            # Coincidencia exacta de keyword completa
+            if kw_normalized in present:
+                return True
+            # Coincidencia de todas las palabras de la keyword
+            if len(kw_words) > 1:
+                matches = sum(1 for word in kw_words if word in present)
+                if matches >= len(kw_words) * 0.7:  # Al menos 70% de palabras
+                    return True
+        
+        # Verificar tema
+        if self.tema:
+            # Requiere al menos 2 palabras del tema
+            matches = sum(1 for word in self.tema_words if word in present)
+            if matches >= 2:
+                return True
+            # O al menos 1 palabra si el tema es corto
+            if len(self.tema_words) <= 2 and matches >= 1:
+                return True
+        
+        return False  # No hay relación suficiente
+    
+    def similarity(self, text: str) -> float:
+        """Lógica de calculate_similarity: score de 0 a 200"""
+        present = self.normalized_matcher.present(normalize(text))
+        
+        score = 0.0
+        keywords_found = 0
+        tema_words_found = 0
+        
+        # 1. Coincidencia exacta de keywords completas (peso MUY alto - obligatorio)
+        for kw_normalized, kw_words in zip(self.keywords_normalized, self.keyword_words):
+            if kw_normalized in present:
+                keywords_found += 1
+                # Puntuación basada en longitud de keyword (keywords más largas = más específicas)
+                score += 20 + len(kw_normalized) * 4
+            
+            # Coincidencia de todas las palabras de la keyword (más estricto)
+            if len(kw_words) > 1:
+                matches = sum(1 for word in kw_words if word in present)
+                if matches == len(kw_words):  # Todas las palabras coinciden (obligatorio)
+                    keywords_found += 1
+                    score += 15
+                elif matches >= len(kw_words) * 0.8:  # Al menos 80% de palabras (más estricto)
+                    score += 10
+        
+        # 2. Coincidencia de palabras del tema (peso medio-alto)
+        for word in self.tema_words:
+            if word in present:
+                tema_words_found += 1
+                score += 8
+        
+        # 3. Verificación de correlación temática
+        # Requiere que al menos el 50% de las keywords principales estén presentes
+        if self.keywords_principales:
+            encontradas = sum(1 for kw in self.keywords_principales if kw in present)
+            porcentaje_keywords = encontradas / len(self.keywords_principales)
+            
+            # Si menos del 30% de keywords principales están presentes, penalizar
+            if porcentaje_keywords < 0.3:
+                score *= 0.3
+            # Si más del 70% están presentes, bonus
+            elif porcentaje_keywords >= 0.7:
+                score += 25
+        
+        # 4. Coincidencias parciales de palabras individuales (solo si hay contexto)
+        if keywords_found > 0 or tema_words_found > 0:
+            for kw_word in self.all_keywords_words:
+                if kw_word in present:
+                    score += 2
+        
+        # 5. Bonus por coincidencia en el título (si el texto parece ser un título)
+        if len(text) < 200:
+            present_lower = self.lower_matcher.present(text.lower())
+            for kw in self.keywords_lower:
+                if kw in present_lower:
+                    score += 8
+        
+        # 6. Penalización si no hay suficiente correlación
+        # Requiere al menos 1 keyword completa O 2+ palabras del tema
+        if keywords_found == 0 and tema_words_found < 2:
+            score *= 0.2
+        
+        return min(score, 200)
+    
+    def keywords_in(self, text_lower: str) -> List[str]:
+        """Keywords que aparecen literalmente en un texto ya pasado a minúsculas (filter_by_keywords)"""
+        present = self.lower_matcher.present(text_lower)
+        return [kw for kw, kw_lower in zip(self.keywords, self.keywords_lower) if kw_lower in present]
+
+
+@lru_cache(maxsize=256)
+def _compile(keywords: Tuple[str, ...], tema: str) -> CompiledQuery:
+    return CompiledQuery(keywords, tema)
+
+
+def compile_query(keywords: Optional[List[str]], tema: str = "") -> CompiledQuery:
+    """
+    Consulta compilada para unas keywords y un tema
+    Se reutiliza entre llamadas: una búsqueda compila su consulta una sola vez
+    """
+    return _compile(tuple(keywords or ()), tema or "")
@@ -0,0 +1,411 @@
+"""
+Extracción rápida con lxml puro (backend de parser 'lxml-fast')
+Implementa la misma lógica que NewsSourcesScraper.extract_articles_generic y
+extract_content_from_soup directamente sobre el árbol de lxml, sin construir
+el árbol de BeautifulSoup (que es el mayor coste de CPU por página)
+
+ContentFeed parsea la página de un artículo a medida que se descarga y avisa en
+cuanto el texto que extraería extract_content ya no puede cambiar, para dejar de
+leer el resto de la página
+"""
+
+import codecs
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import lxml.html
+from bs4.dammit import EncodingDetector
+from lxml import etree
+
+from article_selectors import Candidate, CandidateCollector, new_candidate, select_articles
+
+
+# Texto que BeautifulSoup.get_text() no incluye
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+# Elementos que extract_content quita del contenedor antes de tomar sus párrafos
+CONTENT_DROP_TAGS = ["script", "style", "nav", "aside", "footer", "header", "iframe"]
+
+# Caracteres de texto que se guardan del contenido de un artículo
+MAX_CONTENT_CHARS = 10000
+
+
+def _has_class(name: str) -> str:
+    """XPath equivalente al selector CSS .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _class_contains(value: str) -> str:
+    """XPath equivalente al selector CSS [class*="value"]"""
+    return f"contains(@class, '{value}')"
+
+
+# Mismos selectores que extract_content_from_soup
+CONTENT_XPATHS = [
+    '//article',
+    f"//*[{_has_class('article-content')}]",
+    f"//*[{_has_class('post-content')}]",
+    f"//*[{_has_class('entry-content')}]",
+    f"//*[{_has_class('article-body')}]",
+    f"//*[{_has_class('content')}]",
+    f"//*[{_class_contains('article-content')}]",
+    f"//*[{_class_contains('post-content')}]",
+    f"//*[{_class_contains('entry-content')}]",
+    '//main//article',
+    f"//*[{_has_class('main-content')}]//article",
+]
+
+def detect_encoding(content: bytes) -> str:
+    """
+    Codificación del HTML con el mismo orden de preferencia que BeautifulSoup:
+    la declarada en el documento, luego UTF-8 y por último windows-1252
+    """
+    declared = EncodingDetector.find_declared_encoding(content, is_html=True)
+    if declared:
+        return declared
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'windows-1252'
+
+
+def detect_prefix_encoding(prefix: bytes) -> str:
+    """
+    detect_encoding con solo el principio de la página (parseo incremental)
+    Un carácter UTF-8 cortado al final del fragmento no cuenta como inválido
+    """
+    declared = EncodingDetector.find_declared_encoding(prefix, is_html=True)
+    if declared:
+        return declared
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'windows-1252'
+
+
+def parse_html(content: bytes) -> lxml.html.HtmlElement:
+    """Parsea el HTML crudo de una página con lxml"""
+    try:
+        parser = lxml.html.HTMLParser(encoding=detect_encoding(content))
+    except LookupError:  # Codificación declarada desconocida para lxml
+        parser = None
+    return lxml.html.document_fromstring(content, parser=parser)
+
+
+def text_of(element) -> str:
+    """Equivalente a BeautifulSoup get_text(strip=True)"""
+    if not any(True for _ in element.iter(*SKIP_TEXT_TAGS)):
+        return ''.join(s.strip() for s in element.itertext())
+    
+    parts = []
+    _collect_text(element, parts)
+    return ''.join(parts)
+
+
+def _collect_text(element, parts: List[str]):
+    if isinstance(element.tag, str) and element.tag not in SKIP_TEXT_TAGS and element.text:
+        text = element.text.strip()
+        if text:
+            parts.append(text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                parts.append(tail)
+
+
+def _class_of(element) -> str:
+    return (element.get('class') or '').lower()
+
+
+def _first(element, tag: str):
+    """Primer descendiente con la etiqueta indicada (como Tag.find de BeautifulSoup)"""
+    return next(element.iterdescendants(tag), None)
+
+
+def _first_link(element):
+    return next((a for a in element.iterdescendants('a') if a.get('href') is not None), None)
+
+
+def _discover_candidates(tree) -> tuple:
+    """
+    Recorre el árbol una sola vez y retorna (candidatos a artículo sin duplicados,
+    enlaces que parecen artículos), igual que NewsSourcesScraper._discover_candidates
+    """
+    collector = CandidateCollector()
+    for element in tree.iter(etree.Element):
+        class_string = element.get('class') or ''
+        collector.add(element, element.tag, class_string.split(), class_string)
+        if element.tag == 'a':
+            href = element.get('href')
+            if href is not None:
+                collector.add_link(element, href, text_of(element))
+    return collector.candidates(), collector.article_links
+
+
+def extract_articles(tree, base_url: str, title_check: Optional[Callable[[str], bool]] = None) -> List[Dict]:
+    """
+    Versión lxml de extract_articles_generic
+    
+    Args:
+        tree: Documento parseado con parse_html
+        base_url: URL base para normalizar enlaces relativos
+        title_check: Filtro temprano por título (None para aceptar todos)
+    """
+    return select_articles(extract_candidates(tree, base_url), title_check)
+
+
+def extract_candidates(tree, base_url: str) -> List[Candidate]:
+    """Versión lxml de NewsSourcesScraper.extract_candidates (candidatos sin filtrar)"""
+    candidates = []
+    
+    found_articles, article_links = _discover_candidates(tree)
+    
+    for article in found_articles[:20]:
+        try:
+            # Extraer título - múltiples estrategias
+            title = ''
+            title_elem = None
+            
+            for tag in ['h1', 'h2', 'h3', 'h4', 'h5']:
+                title_elem = _first(article, tag)
+                if title_elem is not None:
+                    title = text_of(title_elem)
+                    if len(title) >= 10:
+                        break
+            
+            if not title or len(title) < 10:
+                link_elem = _first_link(article)
+                if link_elem is not None:
+                    title = text_of(link_elem)
+                    title_elem = link_elem
+            
+            if not title or len(title) < 10:
+                title = (article.get('data-title') or
+                         article.get('aria-label') or
+                         article.get('title', '')).strip()
+            
+            if not title or len(title) < 10:
+                continue
+            
+            # Extraer enlace - múltiples estrategias
+            link = ''
+            link_elem = _first_link(article)
+            
+            if link_elem is not None:
+                link = link_elem.get('href', '')
+            elif title_elem is not None and title_elem.tag == 'a':
+                link = title_elem.get('href', '')
+            elif article.tag == 'a':
+                link = article.get('href', '')
+            
+            if not link:
+                continue
+            if not link.startswith('http'):
+                link = urljoin(base_url, link)
+            
+            candidate = new_candidate('articulo', title, link)
+            candidates.append(candidate)
+            
+            # Extraer descripción
+            description = ''
+            for index, p in enumerate(article.iterdescendants('p', 'div')):
+                if index >= 3:
+                    break
+                text = text_of(p)
+                if len(text) > 30 and len(text) < 500:
+                    description = text[:300]
+                    break
+            
+            if not description:
+                description = (article.get('data-description') or
+                               article.get('data-summary') or '').strip()[:300]
+            
+            # Extraer imagen
+            image = ''
+            img_elem = _first(article, 'img')
+            if img_elem is not None:
+                image = (img_elem.get('src') or
+                         img_elem.get('data-src') or
+                         img_elem.get('data-lazy-src') or
+                         img_elem.get('data-original') or '')
+                if image and not image.startswith('http'):
+                    image = urljoin(base_url, image)
+            
+            # Extraer fecha
+            date = ''
+            date_elem = _first(article, 'time')
+            if date_elem is not None:
+                date = date_elem.get('datetime', '') or text_of(date_elem)
+            
+            if not date:
+                for de in article.iterdescendants('time', 'span', 'div'):
+                    if any(keyword in _class_of(de) for keyword in ['date', 'time', 'published', 'updated']):
+                        date = de.get('datetime', '') or text_of(de)
+                        if date:
+                            break
+            
+            candidates[-1] = candidate._replace(descripcion=description, imagen=image, fecha=date, valido=True)
+        
+        except Exception:
+            continue
+    
+    for link_elem in article_links[:15]:
+        try:
+            href = link_elem.get('href', '')
+            if not href.startswith('http'):
+                href = urljoin(base_url, href)
+            
+            candidate = new_candidate('enlace', '', href)
+            candidates.append(candidate)
+            candidates[-1] = candidate._replace(titulo=text_of(link_elem), valido=True)
+        except Exception:
+            continue
+    
+    return candidates
+
+
+def _paragraphs_text(container) -> str:
+    content_parts = []
+    for p in container.iterdescendants('p', 'div'):
+        text = text_of(p)
+        if text and len(text) > 20:
+            content_parts.append(text)
+    return "\n\n".join(content_parts)
+
+
+def _drop(container, tags: List[str]):
+    for element in list(container.iterdescendants(*tags)):
+        element.drop_tree()  # Conserva el texto que sigue al elemento, igual que decompose()
+
+
+def extract_content(tree) -> str:
+    """Versión lxml de extract_content_from_soup"""
+    content_text = ""
+    
+    for xpath in CONTENT_XPATHS:
+        matches = tree.xpath(xpath)
+        if matches:
+            content_elem = matches[0]
+            _drop(content_elem, CONTENT_DROP_TAGS)
+            content_text = _paragraphs_text(content_elem)
+            if content_text:
+                break
+    
+    if not content_text:
+        body = next(tree.iter('body'), None)
+        if body is not None:
+            _drop(body, ["script", "style", "nav", "aside", "footer", "header", "iframe", "noscript"])
+            main_content = next((
+                e for e in body.iterdescendants('main', 'article', 'div')
+                if 'content' in _class_of(e) or 'article' in _class_of(e) or 'post' in _class_of(e)
+            ), None)
+            if main_content is not None:
+                content_text = _paragraphs_text(main_content)
+    
+    return content_text[:MAX_CONTENT_CHARS]
+
+
+def _kept_text_length(element) -> int:
+    """
+    Cota inferior de la longitud de text_of(element) tras quitarle CONTENT_DROP_TAGS
+    (al quitar un elemento su tail se une al texto anterior, y unidos pierden menos
+    espacios con strip que por separado)
+    """
+    parts = []
+    
+    def collect(node):
+        if node.tag not in SKIP_TEXT_TAGS and node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in CONTENT_DROP_TAGS:
+                collect(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+    
+    collect(element)
+    return sum(len(part) for part in parts)
+
+
+class ContentFeed:
+    """
+    Parseo incremental de la página de un artículo para extract_content
+    
+    El contenido sale del primer <article> de la página (el primer selector de
+    CONTENT_XPATHS) si tiene párrafos con texto. Como el árbol crece siempre por el
+    final del documento, los párrafos ya cerrados no cambian ni de texto ni de
+    posición, y el texto de uno abierto solo crece por el final (lo que ya tiene es
+    un prefijo del definitivo), así que el resultado es definitivo (igual que con
+    la página entera) cuando:
+    - el primer <article> se ha cerrado y tiene texto, o
+    - sus párrafos ya cerrados, más el texto que ya tiene el primero abierto (un
+      <div> que envuelve todo el artículo, por ejemplo), suman MAX_CONTENT_CHARS
+    Si no hay <article> o no tiene texto hacen falta los demás selectores y se lee todo
+    """
+    
+    def __init__(self, encoding: Optional[str]):
+        try:
+            self.parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        except LookupError:  # Codificación declarada desconocida para lxml
+            self.parser = etree.HTMLPullParser(events=('start', 'end'))
+        self.parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        self.article = None  # Primer <article> de la página
+        self.closed = set()  # Párrafos (p, div) ya cerrados desde que empezó el <article>, y él mismo
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Parsea un fragmento más; retorna True si el contenido ya es definitivo"""
+        self.parser.feed(chunk)
+        for event, element in self.parser.read_events():
+            if event == 'start':
+                if self.article is None and element.tag == 'article':
+                    self.article = element
+            elif self.article is not None and (element.tag in ('p', 'div') or element is self.article):
+                self.closed.add(element)
+        return self.ready()
+    
+    def ready(self) -> bool:
+        if self.article is None:
+            return False
+        length = self._stable_length()
+        if self.article in self.closed:
+            return length > 0
+        return length >= MAX_CONTENT_CHARS
+    
+    def _stable_length(self) -> int:
+        """Cota inferior de los caracteres de contenido que ya no pueden cambiar"""
+        length = 0
+        dropped = None  # Elemento quitado cuyos descendientes se saltan
+        for element in self.article.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue
+            if dropped is not None:
+                if dropped in element.iterancestors():
+                    continue
+                dropped = None
+            if element.tag in CONTENT_DROP_TAGS:
+                dropped = element
+                continue
+            if element.tag not in ('p', 'div'):
+                continue
+            text_length = _kept_text_length(element)
+            if text_length > 20:
+                length += text_length + (2 if length else 0)  # Separador "\n\n"
+                if length >= MAX_CONTENT_CHARS:
+                    break
+            if element not in self.closed:
+                # Abierto: lo que sigue en el documento son sus descendientes, que van
+                # detrás de su texto en el resultado y todavía pueden cambiar
+                break
+        return length
+    
+    def close(self) -> lxml.html.HtmlElement:
+        """Termina el parseo (cierra los elementos abiertos) y retorna el documento"""
+        return self.parser.close()
+
+
+def is_lxml_tree(document) -> bool:
+    """True si el documento es un árbol de lxml (y no un BeautifulSoup)"""
+    return isinstance(document, etree._Element)
@@ -3,11 +3,19 @@ Menú interactivo para el scraper de noticias
 """
 
 from news_sources_scraper import NewsSourcesScraper
+from http_cache import HTTPResponseCache
+from robots_cache import shared_robots_cache
 from datetime import datetime
 import os
 import sys
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from typing import Iterator
+import queue
 import threading
+from search_jobs import QueueFullError, SearchJob, SearchJobQueue
+from result_store import SearchResult
+from result_serializer import ResultSerializer
+from scraper_pool import ScraperPool
 
 
 def obtener_banner_red():
@@ -171,7 +179,7 @@ def opcion_tema(scraper: NewsSourcesScraper):
         print("✅ Proceso finalizado")
         print(f"💾 Resultados guardados en: {filename}")
         print(f"{'='*70}\n")
-        
+    
     except KeyboardInterrupt:
         print("\n\n⚠️  Búsqueda interrumpida por el usuario.")
     except Exception as e:
@@ -250,7 +258,10 @@ def opcion_fuentes(scraper: NewsSourcesScraper):
 
 
 # Variables globales para el servidor API
-api_scraper = None
+API_WORKERS = 4  # Búsquedas simultáneas de la API (una por scraper del pool)
+# JSON compacto de las respuestas grandes (resultados, NDJSON y SSE), enviado por trozos
+serializador_api = ResultSerializer(indent=None)
+api_pool = None
 app = Flask(__name__)
 server_thread = None
 server_running = False
@@ -259,48 +270,92 @@ server_port = None
 server_shutdown = None
 
 
+def ejecutar_trabajo(job: SearchJob) -> SearchResult:
+    """
+    Ejecuta una búsqueda encolada (en un hilo de la cola) con un scraper del pool
+    El resultado se guarda compacto mientras el trabajo se conserva en la cola
+    """
+    with api_pool.scraper() as scraper:
+        resultado = scraper.generate_search_result(
+            search_query=job.tema,
+            keywords=job.keywords,
+            progress=job.add_event,
+            compact=True
+        )
+        
+        # Guardar resultado (opcional, puedes comentarlo si no quieres guardar)
+        # Con el id del trabajo: búsquedas del mismo tema con otras keywords se ejecutan a la vez
+        filename = f"busqueda_{job.tema.lower().replace(' ', '_').replace('/', '_')}_{job.id}.json"
+        scraper.save_results(resultado, filename)
+    job.archivo_guardado = filename
+    return resultado
+
+
+# Cola de búsquedas de la API: tantos hilos como scrapers en el pool
+# Las búsquedas idénticas se unen y sus repeticiones en 5 minutos reutilizan el resultado
+cola_busquedas = SearchJobQueue(ejecutar_trabajo, workers=API_WORKERS, max_pending=20, result_ttl=300)
+
+
+def leer_busqueda(data: dict):
+    """
+    Tema y keywords de una petición de búsqueda
+    Retorna (tema, keywords) o None si falta el tema
+    """
+    if not data or 'tema' not in data:
+        return None
+    
+    tema = data['tema']
+    keywords = data.get('keywords', None)
+    
+    # Si no hay keywords, usar el tema
+    if not keywords:
+        keywords = [tema]
+    else:
+        # Añadir el tema a las keywords si no está
+        if tema.lower() not in [kw.lower() for kw in keywords]:
+            keywords.insert(0, tema)
+    return tema, keywords
+
+
+def error_sin_tema():
+    return jsonify({
+        'error': 'Se requiere el campo "tema" en el JSON',
+        'ejemplo': {'tema': 'Inteligencia Artificial', 'keywords': ['IA', 'AI']}
+    }), 400
+
+
 @app.route('/buscar', methods=['POST'])
 def buscar_api():
-    """Endpoint API para realizar búsquedas"""
+    """Endpoint API para encolar una búsqueda; responde al momento con el id del trabajo"""
     try:
-        data = request.get_json()
-        
-        if not data or 'tema' not in data:
-            return jsonify({
-                'error': 'Se requiere el campo "tema" en el JSON',
-                'ejemplo': {'tema': 'Inteligencia Artificial', 'keywords': ['IA', 'AI']}
-            }), 400
-        
-        tema = data['tema']
-        keywords = data.get('keywords', None)
-        
-        # Si no hay keywords, usar el tema
-        if not keywords:
-            keywords = [tema]
-        else:
-            # Añadir el tema a las keywords si no está
-            if tema.lower() not in [kw.lower() for kw in keywords]:
-                keywords.insert(0, tema)
-        
-        # Ejecutar búsqueda usando la lógica existente
-        resultado = api_scraper.generate_search_result(
-            search_query=tema,
-            keywords=keywords
-        )
+        busqueda = leer_busqueda(request.get_json())
+        if busqueda is None:
+            return error_sin_tema()
+        tema, keywords = busqueda
         
-        # Guardar resultado (opcional, puedes comentarlo si no quieres guardar)
-        filename = f"busqueda_{tema.lower().replace(' ', '_').replace('/', '_')}.json"
-        api_scraper.save_results(resultado, filename)
+        try:
+            job = cola_busquedas.submit(tema, keywords)
+        except QueueFullError as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e),
+                'cola': cola_busquedas.status()
+            })
+            response.headers['Retry-After'] = '30'
+            return response, 503
         
-        # Retornar resultado en JSON
         return jsonify({
             'success': True,
+            'id': job.id,
+            'estado': job.estado,
             'tema': tema,
             'keywords': keywords,
-            'resultado': resultado,
-            'archivo_guardado': filename
-        }), 200
-        
+            'posicion_en_cola': cola_busquedas.position(job),
+            'solicitudes': job.solicitudes,  # > 1 si se unió a una búsqueda idéntica
+            'url_estado': f"/buscar/{job.id}",
+            'url_eventos': f"/buscar/{job.id}/eventos"
+        }), 202
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -308,12 +363,107 @@ def buscar_api():
         }), 500
 
 
+@app.route('/buscar/stream', methods=['POST'])
+def buscar_stream():
+    """
+    Búsqueda en streaming: cada hallazgo se envía en cuanto está listo
+    NDJSON (una línea JSON por evento) o Server-Sent Events si se pide con
+    Accept: text/event-stream o ?formato=sse
+    Opcional: "top_n" (y "relevancia_minima") para detener la búsqueda en cuanto
+    haya top_n hallazgos con esa relevancia
+    """
+    data = request.get_json(silent=True)
+    busqueda = leer_busqueda(data)
+    if busqueda is None:
+        return error_sin_tema()
+    tema, keywords = busqueda
+    
+    try:
+        top_n = int(data['top_n']) if data.get('top_n') is not None else None
+        relevancia_minima = float(data.get('relevancia_minima', 0))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': '"top_n" y "relevancia_minima" deben ser números'}), 400
+    
+    sse = request.args.get('formato') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+    
+    # Un scraper del pool durante todo el stream; si no hay ninguno libre, no se espera
+    try:
+        scraper = api_pool.acquire(timeout=5)
+    except queue.Empty:
+        response = jsonify({'success': False, 'error': 'Todos los scrapers están ocupados, reintenta más tarde'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    def generar():
+        try:
+            for evento in scraper.iter_search_results(search_query=tema, keywords=keywords,
+                                                      top_n=top_n, min_relevance=relevancia_minima):
+                if sse:
+                    yield from formato_sse(evento['evento'], evento['datos'])
+                else:
+                    yield serializador_api.dumps(evento) + b"\n"
+        finally:
+            api_pool.release(scraper)
+    
+    if sse:
+        return Response(generar(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    return Response(generar(), mimetype='application/x-ndjson')
+
+
+@app.route('/buscar/cola', methods=['GET'])
+def estado_cola():
+    """Ocupación de la cola de búsquedas"""
+    return jsonify(cola_busquedas.status()), 200
+
+
+@app.route('/buscar/<job_id>', methods=['GET'])
+def estado_busqueda(job_id):
+    """Estado de una búsqueda encolada (incluye el resultado cuando termina)"""
+    job = cola_busquedas.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Búsqueda no encontrada (o ya caducada)'}), 404
+    # El resultado se serializa por trozos mientras se envía
+    return Response(serializador_api.iter_encode(job.to_dict(cola_busquedas.position(job), lazy=True)),
+                    status=200, mimetype='application/json')
+
+
+def formato_sse(evento: str, datos: dict) -> Iterator[bytes]:
+    """Mensaje en formato Server-Sent Events, por trozos (el JSON compacto va en una sola línea)"""
+    yield f"event: {evento}\ndata: ".encode('utf-8')
+    yield from serializador_api.iter_encode(datos)
+    yield b"\n\n"
+
+
+@app.route('/buscar/<job_id>/eventos', methods=['GET'])
+def eventos_busqueda(job_id):
+    """Progreso de una búsqueda como Server-Sent Events hasta que termina"""
+    job = cola_busquedas.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Búsqueda no encontrada (o ya caducada)'}), 404
+    
+    def generar():
+        enviados = 0
+        while True:
+            eventos, terminado = job.wait_events(enviados, timeout=15)
+            for evento, datos in eventos:
+                yield from formato_sse(evento, datos)
+            enviados += len(eventos)
+            if terminado and not eventos:
+                yield from formato_sse('fin', job.to_dict(lazy=True))
+                return
+            if not eventos:
+                yield b": sigue en curso\n\n"  # Comentario SSE para mantener viva la conexión
+    
+    return Response(generar(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Endpoint para verificar que el servidor está funcionando"""
     return jsonify({
         'status': 'ok',
-        'servicio': 'Scraper de Noticias API'
+        'servicio': 'Scraper de Noticias API',
+        'cola': cola_busquedas.status()
     }), 200
 
 
@@ -324,7 +474,11 @@ def info():
         'servicio': 'Scraper de Noticias API',
         'version': '1.0',
         'endpoints': {
-            'POST /buscar': 'Realizar búsqueda por tema',
+            'POST /buscar': 'Encolar una búsqueda por tema (responde con el id del trabajo)',
+            'POST /buscar/stream': 'Búsqueda en streaming: hallazgos como NDJSON o SSE a medida que llegan',
+            'GET /buscar/<id>': 'Estado y resultado de una búsqueda',
+            'GET /buscar/<id>/eventos': 'Progreso de una búsqueda (Server-Sent Events)',
+            'GET /buscar/cola': 'Ocupación de la cola de búsquedas',
             'GET /health': 'Verificar estado del servidor'
         },
         'ejemplo_uso': {
@@ -340,9 +494,11 @@ def info():
 
 def iniciar_servidor_api(scraper: NewsSourcesScraper, host='0.0.0.0', port=5000):
     """Inicia el servidor API Flask en un hilo"""
-    global api_scraper, server_running, server_host, server_port, server_shutdown
+    global api_pool, server_running, server_host, server_port, server_shutdown
     
-    api_scraper = scraper
+    # Cada búsqueda usa su propio scraper; caches, robots.txt, throttle y conexiones se comparten
+    if api_pool is None:
+        api_pool = ScraperPool.from_scraper(scraper, size=API_WORKERS)
     server_host = host
     server_port = port
     server_running = True
@@ -350,7 +506,8 @@ def iniciar_servidor_api(scraper: NewsSourcesScraper, host='0.0.0.0', port=5000)
     def run_server():
         global server_shutdown
         from werkzeug.serving import make_server
-        server = make_server(host, port, app)
+        # Multihilo: las consultas de estado y los streams de eventos no se bloquean entre sí
+        server = make_server(host, port, app, threaded=True)
         server_shutdown = server.shutdown
         
         print(f"\n{'='*70}")
@@ -363,6 +520,8 @@ def iniciar_servidor_api(scraper: NewsSourcesScraper, host='0.0.0.0', port=5000)
         print(f"   curl -X POST http://{host}:{port}/buscar \\")
         print(f"        -H 'Content-Type: application/json' \\")
         print(f"        -d '{{\"tema\": \"Inteligencia Artificial\", \"keywords\": [\"IA\", \"AI\"]}}'")
+        print(f"   curl http://{host}:{port}/buscar/<id>          # estado y resultado")
+        print(f"   curl -N http://{host}:{port}/buscar/<id>/eventos  # progreso en vivo")
         print(f"\n⚠️  El servidor está corriendo en segundo plano")
         print(f"{'='*70}\n")
         
@@ -440,6 +599,10 @@ def opcion_servidor_api(scraper: NewsSourcesScraper):
             print(f"\n🟢 Estado: CORRIENDO")
             print(f"📍 URL base: http://{server_host}:{server_port}")
             print(f"📡 Endpoint de búsqueda: POST http://{server_host}:{server_port}/buscar")
+            print(f"🔎 Estado de una búsqueda: GET http://{server_host}:{server_port}/buscar/<id>")
+            print(f"📶 Progreso en vivo (SSE): GET http://{server_host}:{server_port}/buscar/<id>/eventos")
+            print(f"📥 Cola de búsquedas: GET http://{server_host}:{server_port}/buscar/cola")
+            print(f"🌊 Streaming (NDJSON/SSE): POST http://{server_host}:{server_port}/buscar/stream")
             print(f"❤️  Health check: GET http://{server_host}:{server_port}/health")
             print(f"📋 Información: GET http://{server_host}:{server_port}/")
             print(f"\n💡 Ejemplo de uso con curl:")
@@ -450,6 +613,8 @@ def opcion_servidor_api(scraper: NewsSourcesScraper):
             print(f"   import requests")
             print(f"   response = requests.post('http://{server_host}:{server_port}/buscar',")
             print(f"       json={{\"tema\": \"Inteligencia Artificial\"}})")
+            print(f"   job_id = response.json()['id']")
+            print(f"   estado = requests.get(f'http://{server_host}:{server_port}/buscar/{{job_id}}').json()")
             input("\n\nPresiona Enter para continuar...")
         
         elif opcion == '2':
@@ -519,7 +684,12 @@ def opcion_servidor_api(scraper: NewsSourcesScraper):
 
 def main():
     """Función principal del menú interactivo"""
-    scraper = NewsSourcesScraper()
+    # Cache HTTP en disco: búsquedas repetidas reutilizan páginas ya descargadas
+    # robots.txt se guarda junto a él para no descargarlo en cada arranque
+    scraper = NewsSourcesScraper(
+        http_cache=HTTPResponseCache(),
+        robots_cache=shared_robots_cache(os.path.join('cache_http', 'robots.json'))
+    )
     
     while True:
         limpiar_pantalla()
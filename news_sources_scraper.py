@@ -13,18 +13,112 @@ NOTA LEGAL IMPORTANTE:
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-from typing import List, Dict, Optional
-from datetime import datetime
+from bs4 import BeautifulSoup, Tag
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 import time
-import re
 import random
 import os
+import tempfile
 import uuid
+import threading
+import queue
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.robotparser import RobotFileParser
 
+from http_cache import HTTPResponseCache
+from robots_cache import RobotsCache, shared_robots_cache
+from article_store import ArticleContentStore, content_hash
+from seen_index import SeenUrlIndex, search_scope
+from candidate_cache import CandidateCache
+from http_transport import build_http_adapter
+from parse_workers import ParsePool
+import lxml_extractor
+from article_selectors import ArticleRecord, Candidate, CandidateCollector, iter_articles, new_candidate, select_articles
+from keyword_matcher import compile_query
+from result_store import FindingsSummary, SearchResult, StringPool, result_dict
+from result_serializer import ResultSerializer
+from batch_scoring import score_articles, similarity_scores
+
+
+# Resultado de fetch_content cuando una petición condicional con validadores responde 304
+NOT_MODIFIED = object()
+
+# Parseo incremental de artículos: tamaño de cada lectura del socket y bytes que se
+# reúnen antes de empezar a parsear, para detectar la codificación de la página
+STREAM_CHUNK_SIZE = 16 * 1024
+ENCODING_PREFIX_BYTES = 64 * 1024
+
+
+class IncrementalPage:
+    """
+    Página de un artículo que se parsea a medida que llegan sus trozos (ver
+    lxml_extractor.ContentFeed); común a los motores síncrono y asíncrono
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.chunks = []
+        self.total = 0  # Bytes recibidos
+        self.feed = None  # Se crea al reunir el prefijo que da la codificación
+        self.listo = False  # El contenido ya es definitivo
+    
+    def add(self, chunk: bytes) -> bool:
+        """Añade un trozo; retorna True si hay que dejar de leer la página"""
+        self.chunks.append(chunk)
+        self.total += len(chunk)
+        if self.feed is None:
+            if self.total < min(ENCODING_PREFIX_BYTES, self.max_bytes):
+                return False
+            prefix = b''.join(self.chunks)
+            self.feed = lxml_extractor.ContentFeed(lxml_extractor.detect_prefix_encoding(prefix))
+            self.listo = self.feed.feed(prefix)
+        else:
+            self.listo = self.feed.feed(chunk)
+        return self.listo or self.total >= self.max_bytes
+    
+    def content(self) -> bytes:
+        return b''.join(self.chunks)
+    
+    def text(self) -> str:
+        """Termina el parseo y extrae el texto del artículo con lo recibido"""
+        if self.feed is None:  # Página más pequeña que el prefijo de la codificación
+            content = self.content()
+            self.feed = lxml_extractor.ContentFeed(lxml_extractor.detect_prefix_encoding(content))
+            self.feed.feed(content)
+        return lxml_extractor.extract_content(self.feed.close())
+
+
+class DomainThrottle:
+    """
+    Controla la pausa de cortesía entre peticiones a un mismo dominio.
+    Cada dominio tiene su propio turno, así que dominios distintos no se esperan entre sí.
+    """
+    
+    def __init__(self, min_delay: float = 1.0, max_delay: float = 2.0):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._locks = {}  # Un lock por dominio
+        self._next_allowed = {}  # Momento (monotónico) a partir del cual se puede volver a pedir
+        self._guard = threading.Lock()
+    
+    def _lock_for(self, domain: str) -> threading.Lock:
+        with self._guard:
+            if domain not in self._locks:
+                self._locks[domain] = threading.Lock()
+            return self._locks[domain]
+    
+    def wait(self, url: str):
+        """Bloquea hasta que sea el turno del dominio de la URL y reserva el siguiente"""
+        domain = urlparse(url).netloc
+        with self._lock_for(domain):
+            pending = self._next_allowed.get(domain, 0.0) - time.monotonic()
+            if pending > 0:
+                time.sleep(pending)
+            # Delay moderado para evitar bloqueos (1-2 segundos) antes de la siguiente petición
+            self._next_allowed[domain] = time.monotonic() + random.uniform(self.min_delay, self.max_delay)
+
 
 class NewsSourcesScraper:
     """Scraper especializado para múltiples fuentes de noticias"""
@@ -43,8 +137,44 @@ class NewsSourcesScraper:
         "https://deepmind.google/blog/"
     ]
     
-    def __init__(self):
+    # Backends de parseo: los dos primeros construyen un árbol de BeautifulSoup,
+    # 'lxml-fast' trabaja directamente sobre el árbol de lxml (el más rápido)
+    PARSERS = ('html.parser', 'lxml', 'lxml-fast')
+    
+    def __init__(self, max_workers: int = 8, content_workers: int = 16, max_per_host: int = 2,
+                 http_cache: Optional[HTTPResponseCache] = None,
+                 content_store: Optional[ArticleContentStore] = None,
+                 parser: str = 'lxml',
+                 robots_cache: Optional[RobotsCache] = None,
+                 throttle: Optional[DomainThrottle] = None,
+                 http_adapter: Optional[requests.adapters.HTTPAdapter] = None,
+                 seen_index: Optional[SeenUrlIndex] = None,
+                 candidate_cache: Optional[CandidateCache] = None,
+                 pool_maxsize: Optional[int] = None,
+                 http2: bool = False,
+                 parse_processes: int = 0,
+                 parse_pool: Optional[ParsePool] = None,
+                 incremental_parse: bool = False,
+                 max_page_bytes: int = 2 * 1024 * 1024,
+                 string_pool: Optional[StringPool] = None,
+                 serializer: Optional[ResultSerializer] = None):
+        if parser not in self.PARSERS:
+            raise ValueError(f"Parser no soportado: {parser} (opciones: {', '.join(self.PARSERS)})")
+        if incremental_parse and parser != 'lxml-fast':
+            raise ValueError("El parseo incremental trabaja sobre el árbol de lxml: usa parser='lxml-fast'")
+        self.parser = parser  # Backend de parseo HTML
         self.session = requests.Session()
+        self.http2 = http2  # HTTP/2 con httpx si está instalado (ver http_transport)
+        # close() solo libera lo que crea el propio scraper, no lo compartido con otros
+        self._owns_http_adapter = http_adapter is None
+        self._owns_parse_pool = parse_pool is None and bool(parse_processes)
+        if http_adapter is None:
+            # Conexiones por host suficientes para la portada y las extracciones simultáneas
+            pool_maxsize = pool_maxsize or max(10, max_per_host * 2 + 2)
+            http_adapter = build_http_adapter(pool_connections=32, pool_maxsize=pool_maxsize, http2=http2)
+        # Pool de conexiones propio o compartido con otros scrapers (ver ScraperPool)
+        self.session.mount('http://', http_adapter)
+        self.session.mount('https://', http_adapter)
         # User-Agent del bot
         self.user_agent = 'Mozilla/5.0 (compatible; NewsBot/1.0)'
         # Headers más completos para evitar bloqueos
@@ -64,48 +194,98 @@ class NewsSourcesScraper:
             'Referer': 'https://www.google.com/'
         })
         self.results = []
-        self.robots_cache = {}  # Cache para robots.txt
+        # Cache de robots.txt (por defecto el compartido por todo el proceso)
+        self.robots_cache = robots_cache if robots_cache is not None else shared_robots_cache()
         self.cookies_cache = {}  # Cache de cookies por dominio (dinámicas)
-
-    def prepare_cookies(self, url: str):
+        self._domain_headers = {}  # Headers propios de cada dominio (Referer)
+        self.max_workers = max_workers  # Fuentes que se scrapean en paralelo
+        self.content_workers = content_workers  # Hilos de la etapa de extracción de contenido
+        self.max_per_host = max_per_host  # Extracciones simultáneas como máximo por host
+        # Pausa de cortesía por dominio (compartida si varios scrapers acceden a los mismos sitios)
+        self.throttle = throttle if throttle is not None else DomainThrottle(1.0, 2.0)
+        self.http_cache = http_cache  # Cache HTTP en disco (opcional)
+        # Contenido ya extraído por URL, para no volver a parsear artículos conocidos
+        self.content_store = content_store if content_store is not None else ArticleContentStore()
+        # Artículos ya vistos por búsqueda (opcional, necesario para el modo incremental)
+        self.seen_index = seen_index
+        # Candidatos ya extraídos de cada portada, reutilizados mientras no cambie
+        self.candidate_cache = candidate_cache if candidate_cache is not None else CandidateCache()
+        # Procesos que parsean el HTML descargado (None = se parsea en los hilos de descarga)
+        if parse_pool is None and parse_processes:
+            parse_pool = ParsePool(type(self), parser, parse_processes)
+        self.parse_pool = parse_pool
+        # Artículos parseados mientras se descargan, dejando de leer cuando el contenido
+        # ya está completo (ver extract_article_content) y como mucho max_page_bytes por página
+        self.incremental_parse = incremental_parse
+        self.max_page_bytes = max_page_bytes
+        # Cadenas internadas de los resultados compactos (compact=True en generate_search_result)
+        self.string_pool = string_pool if string_pool is not None else StringPool()
+        # JSON de save_results (por defecto sangrado, con orjson si está instalado)
+        self.serializer = serializer if serializer is not None else ResultSerializer()
+    
+    def close(self):
         """
-        Genera y aplica cookies dinámicas por dominio para simular sesiones.
+        Libera los recursos que creó el scraper: su pool de procesos de parseo
+        (parse_processes) y sus conexiones HTTP. Los compartidos (parse_pool,
+        http_adapter) quedan abiertos para quien los pasó
+        """
+        if self._owns_parse_pool and self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+        if self._owns_http_adapter:
+            self.session.close()
+        if self.http_cache:
+            self.http_cache.flush()  # Accesos pendientes del orden LRU
+        self.content_store.flush()
+    
+    def __enter__(self) -> 'NewsSourcesScraper':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def domain_cookies(self, domain: str) -> Dict[str, str]:
+        """
+        Retorna las cookies dinámicas de un dominio, generándolas la primera vez.
         Se cachean por dominio para mantener consistencia durante la ejecución.
         """
-        parsed = urlparse(url)
-        domain = parsed.netloc
-
         if domain not in self.cookies_cache:
             # Generar identificadores de sesión pseudoaleatorios
             session_id = uuid.uuid4().hex
             visitor_id = uuid.uuid4().hex[:16]
-            self.cookies_cache[domain] = {
+            # setdefault: si otro hilo ya las generó, se conservan las suyas
+            self.cookies_cache.setdefault(domain, {
                 'sessionid': session_id,
                 'visitor': visitor_id
-            }
-
+            })
+        return self.cookies_cache[domain]
+    
+    def prepare_cookies(self, url: str):
+        """
+        Genera y aplica cookies dinámicas por dominio para simular sesiones.
+        Se cachean por dominio para mantener consistencia durante la ejecución.
+        """
+        domain = urlparse(url).netloc
+        
         # Aplicar cookies al session actual
-        for ck, cv in self.cookies_cache[domain].items():
+        for ck, cv in self.domain_cookies(domain).items():
             self.session.cookies.set(ck, cv, domain=domain)
     
+    def _referer_headers(self, url: str) -> Dict[str, str]:
+        """Referer del dominio de la URL (un dict por dominio que se reutiliza, no se modifica)"""
+        parsed = urlparse(url)
+        headers = self._domain_headers.get(parsed.netloc)
+        if headers is None:
+            headers = self._domain_headers[parsed.netloc] = {'Referer': parsed.scheme + '://' + parsed.netloc}
+        return headers
+    
     def check_robots_txt(self, url: str) -> bool:
         """
         Verifica si el scraper puede acceder a una URL según robots.txt
         Retorna True si está permitido, False si está bloqueado
         """
         try:
-            parsed_url = urlparse(url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            robots_url = urljoin(base_url, '/robots.txt')
-            
-            # Usar cache si ya verificamos este dominio
-            if base_url in self.robots_cache:
-                rp = self.robots_cache[base_url]
-            else:
-                rp = RobotFileParser()
-                rp.set_url(robots_url)
-                rp.read()
-                self.robots_cache[base_url] = rp
+            rp = self._robots_for(self._robots_base(url))
             
             # Verificar si nuestro User-Agent puede acceder
             can_fetch = rp.can_fetch(self.user_agent, url)
@@ -114,159 +294,317 @@ class NewsSourcesScraper:
                 print(f"  🚫 robots.txt bloquea el acceso a esta URL")
             
             return can_fetch
-            
+        
         except Exception as e:
             # Si hay error al leer robots.txt, asumir que está permitido
             # (muchos sitios no tienen robots.txt o no es accesible)
             print(f"  ℹ️  No se pudo verificar robots.txt: {str(e)[:50]}")
             return True  # Permitir por defecto si no se puede verificar
     
+    def _robots_base(self, url: str) -> str:
+        """Dominio (esquema + host) al que corresponde el robots.txt de una URL"""
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+    
+    def _robots_for(self, base_url: str) -> RobotFileParser:
+        """RobotFileParser del dominio: del cache o descargado (una vez por dominio)"""
+        rp = self.robots_cache.get(base_url)
+        if rp is not None:
+            return rp
+        
+        with self.robots_cache.lock_for(base_url):
+            # Otro hilo pudo descargarlo mientras esperábamos el lock
+            rp = self.robots_cache.get(base_url)
+            if rp is None:
+                response = self.session.get(urljoin(base_url, '/robots.txt'), timeout=20)
+                texto = response.content.decode('utf-8') if response.status_code < 400 else ''
+                rp = self.robots_cache.store(base_url, response.status_code, texto)
+            return rp
+    
+    def prefetch_robots(self, urls: List[str]):
+        """
+        Descarga en paralelo los robots.txt que falten en el cache para las URLs dadas,
+        así las verificaciones posteriores no esperan una descarga por fuente
+        """
+        missing = self.robots_cache.missing([self._robots_base(url) for url in urls])
+        if not missing:
+            return
+        
+        def download(base_url: str):
+            try:
+                self._robots_for(base_url)
+            except Exception:
+                pass  # check_robots_txt lo reintentará e informará del error
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing)))) as executor:
+            list(executor.map(download, missing))
+    
     def fetch_page(self, url: str, timeout: int = 20, check_robots: bool = True) -> Optional[BeautifulSoup]:
-        """Obtiene y parsea una página con mejor manejo de errores"""
+        """
+        Obtiene y parsea una página con mejor manejo de errores
+        El árbol completo vive mientras el llamador lo conserve; para quedarse solo
+        con los artículos de la página, iter_page_articles lo libera al extraerlos
+        """
+        content = self.fetch_content(url, timeout=timeout, check_robots=check_robots)
+        if content is None:
+            return None
+        return BeautifulSoup(content, self.soup_parser())
+    
+    def fetch_document(self, url: str, timeout: int = 20, check_robots: bool = True):
+        """
+        Obtiene una página parseada con el backend configurado
+        (BeautifulSoup, o árbol de lxml si el parser es 'lxml-fast')
+        """
+        content = self.fetch_content(url, timeout=timeout, check_robots=check_robots)
+        if content is None:
+            return None
+        return self.parse_document(content)
+    
+    def soup_parser(self) -> str:
+        """Parser de BeautifulSoup equivalente al backend configurado"""
+        return 'lxml' if self.parser == 'lxml-fast' else self.parser
+    
+    def parse_document(self, content: bytes):
+        """Parsea HTML crudo con el backend configurado"""
+        if self.parser == 'lxml-fast':
+            return lxml_extractor.parse_html(content)
+        return BeautifulSoup(content, self.parser)
+    
+    def release_document(self, document):
+        """
+        Libera un árbol parseado en cuanto termina la extracción
+        El de BeautifulSoup tiene referencias circulares (padre/hijos, elemento
+        anterior/siguiente) y, sin decompose(), sigue en memoria hasta que pasa el
+        recolector de ciclos; el de lxml se libera al perder la última referencia
+        """
+        if isinstance(document, BeautifulSoup):
+            document.decompose()
+    
+    def parse_candidates(self, content: bytes, base_url: str) -> List[Candidate]:
+        """
+        Parsea una página y extrae sus candidatos (en el pool de procesos, si lo hay)
+        El árbol se libera al terminar: los candidatos no guardan referencias a él
+        """
+        if self.parse_pool is not None:
+            return self.parse_pool.candidates(content, base_url)
+        document = self.parse_document(content)
+        try:
+            return self.extract_candidates(document, base_url)
+        finally:
+            self.release_document(document)
+    
+    def parse_content(self, content: bytes) -> str:
+        """Parsea la página de un artículo y extrae su texto (en el pool de procesos, si lo hay)"""
+        if self.parse_pool is not None:
+            return self.parse_pool.content(content)
+        document = self.parse_document(content)
+        try:
+            return self.extract_content_from_soup(document)
+        finally:
+            self.release_document(document)
+    
+    def fetch_content(self, url: str, timeout: int = 20, check_robots: bool = True,
+                      validators: Optional[Dict] = None, cached: Optional[Dict] = None) -> Optional[bytes]:
+        """
+        Obtiene el HTML crudo de una página (usando el cache HTTP si está activo)
+        Retorna None si la página no es accesible o la respuesta está vacía
+        
+        validators: Validadores de la descarga anterior ('etag', 'last_modified') para
+                    pedir la página con una petición condicional si no está en el cache
+                    HTTP; se actualizan con los de la respuesta. Si el servidor responde
+                    304 se retorna NOT_MODIFIED
+        cached: Entrada del cache HTTP si el llamador ya la ha consultado
+        """
         try:
             # Verificar robots.txt antes de acceder
             if check_robots:
                 if not self.check_robots_txt(url):
                     return None
             
+            # Respuesta fresca en el cache: no hace falta tocar la red
+            if cached is None and self.http_cache:
+                cached = self.http_cache.get(url)
+            if cached and self.http_cache.is_fresh(cached):
+                print(f"  💾 Desde cache: {urlparse(url).netloc}")
+                return cached['contenido']
+            
             print(f"  📄 Accediendo a {urlparse(url).netloc}...")
-            # Delay moderado para evitar bloqueos (1-2 segundos)
-            time.sleep(random.uniform(1.0, 2.0))
+            # Pausa de cortesía por dominio (otros dominios siguen en paralelo)
+            self.throttle.wait(url)
             
-            # Actualizar referer con la URL actual
-            headers = self.session.headers.copy()
-            headers['Referer'] = urlparse(url).scheme + '://' + urlparse(url).netloc
+            # Solo los headers propios de la petición: requests los combina con los de
+            # la sesión, así que no hace falta copiarlos en cada petición
+            headers = self._referer_headers(url)
+            
+            # Revalidar la copia guardada con una petición condicional
+            if cached:
+                headers = {**headers, **self.http_cache.conditional_headers(cached)}
+            elif validators:
+                headers = {**headers, **HTTPResponseCache.conditional_headers(validators)}
             
             # Preparar cookies dinámicas por dominio
             self.prepare_cookies(url)
-
+            
             response = self.session.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+            
+            if cached and response.status_code == 304:
+                print(f"  💾 Sin cambios (304): {urlparse(url).netloc}")
+                self.http_cache.refresh(url)
+                return cached['contenido']
+            if validators and response.status_code == 304:
+                print(f"  💾 Sin cambios (304): {urlparse(url).netloc}")
+                return NOT_MODIFIED
+            
             response.raise_for_status()
             
             # Verificar que realmente recibimos contenido HTML
             if not response.content or len(response.content) < 100:
                 print(f"  ⚠️  Respuesta vacía o muy corta")
                 return None
-                
-            return BeautifulSoup(response.content, 'html.parser')
-        except requests.exceptions.ConnectionError as e:
-            print(f"  ⚠️  Error de conexión (posible bloqueo): {str(e)[:100]}")
+            
+            if self.http_cache:
+                self.http_cache.store(url, response.content,
+                                      etag=response.headers.get('ETag'),
+                                      last_modified=response.headers.get('Last-Modified'))
+            if validators is not None:
+                validators['etag'] = response.headers.get('ETag')
+                validators['last_modified'] = response.headers.get('Last-Modified')
+            
+            return response.content
+        except Exception as e:
+            self._report_fetch_error(e)
             return None
-        except requests.exceptions.Timeout:
-            print(f"  ⚠️  Timeout esperando respuesta")
+    
+    def fetch_stream(self, url: str, timeout: int = 20, check_robots: bool = True) -> Optional[requests.Response]:
+        """
+        Abre la descarga de una página sin leer todavía el cuerpo, para consumirlo por
+        partes (response.iter_content); mismas comprobaciones que fetch_content
+        El llamador debe cerrar la respuesta. Retorna None si la página no es accesible
+        """
+        try:
+            if check_robots and not self.check_robots_txt(url):
+                return None
+            
+            print(f"  📄 Accediendo a {urlparse(url).netloc}...")
+            self.throttle.wait(url)
+            self.prepare_cookies(url)
+            
+            response = self.session.get(url, timeout=timeout, headers=self._referer_headers(url),
+                                        allow_redirects=True, stream=True)
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
+            return response
+        except Exception as e:
+            self._report_fetch_error(e)
             return None
-        except requests.exceptions.HTTPError as e:
+    
+    def _report_fetch_error(self, e: Exception):
+        """Informa del error de una descarga"""
+        if isinstance(e, requests.exceptions.ConnectionError):
+            print(f"  ⚠️  Error de conexión (posible bloqueo): {str(e)[:100]}")
+        elif isinstance(e, requests.exceptions.Timeout):
+            print("  ⚠️  Timeout esperando respuesta")
+        elif isinstance(e, requests.exceptions.HTTPError):
             print(f"  ⚠️  Error HTTP {e.response.status_code if hasattr(e, 'response') else 'desconocido'}")
-            return None
-        except Exception as e:
+        else:
             print(f"  ⚠️  Error: {str(e)[:100]}")
-            return None
     
     def quick_title_check(self, title: str, keywords: Optional[List[str]] = None, tema: str = "") -> bool:
         """
         Verificación rápida del título: retorna True si el título tiene relación con el tema/keywords
         Filtro temprano para descartar artículos basura antes de procesarlos
         """
-        if not keywords and not tema:
-            return True  # Si no hay filtro, aceptar todos
-        
-        title_lower = title.lower()
-        text_normalized = re.sub(r'[^\w\s]', ' ', title_lower)
-        
-        # Verificar keywords
-        if keywords:
-            for kw in keywords:
-                kw_normalized = re.sub(r'[^\w\s]', ' ', kw.lower())
-                # Coincidencia exacta de keyword completa
-                if kw_normalized in text_normalized:
-                    return True
-                # Coincidencia de todas las palabras de la keyword
-                kw_words = [w for w in kw_normalized.split() if len(w) > 2]
-                if len(kw_words) > 1:
-                    matches = sum(1 for word in kw_words if word in text_normalized)
-                    if matches >= len(kw_words) * 0.7:  # Al menos 70% de palabras
-                        return True
-        
-        # Verificar tema
-        if tema:
-            tema_normalized = re.sub(r'[^\w\s]', ' ', tema.lower())
-            tema_words = [w for w in tema_normalized.split() if len(w) > 3]
-            # Requiere al menos 2 palabras del tema
-            matches = sum(1 for word in tema_words if word in text_normalized)
-            if matches >= 2:
-                return True
-            # O al menos 1 palabra si el tema es corto
-            if len(tema_words) <= 2 and matches >= 1:
-                return True
-        
-        return False  # No hay relación suficiente
+        return compile_query(keywords, tema).title_matches(title)
     
-    def extract_articles_generic(self, soup: BeautifulSoup, base_url: str, keywords: Optional[List[str]] = None, tema: str = "") -> List[Dict]:
+    def extract_articles_generic(self, soup, base_url: str, keywords: Optional[List[str]] = None, tema: str = "") -> List[Dict]:
         """
         Extrae artículos usando selectores genéricos mejorados que funcionan en la mayoría de sitios
         Filtra por título tempranamente para evitar procesar artículos basura
         """
-        articles = []
-        seen_urls = set()  # Para evitar duplicados
+        return select_articles(self.extract_candidates(soup, base_url), self._title_check(keywords, tema))
+    
+    def _title_check(self, keywords: Optional[List[str]] = None, tema: str = "") -> Optional[Callable[[str], bool]]:
+        """Filtro temprano por título de la búsqueda (None si no hay tema ni keywords)"""
+        if not (keywords or tema):
+            return None
+        return lambda title: self.quick_title_check(title, keywords, tema)
+    
+    def iter_page_articles(self, url: str, keywords: Optional[List[str]] = None,
+                           tema: str = "") -> Iterator[ArticleRecord]:
+        """
+        Artículos de una página (portada o búsqueda) relacionados con el tema/keywords,
+        como registros ligeros (ArticleRecord) en lugar del árbol de fetch_page
+        El árbol se libera en cuanto se extraen los candidatos, que además se
+        reutilizan en búsquedas posteriores (ver fetch_candidates)
+        """
+        candidatos = self.fetch_candidates(url)
+        if candidatos is None:
+            return
+        yield from iter_articles(candidatos, self._title_check(keywords, tema))
+    
+    def fetch_candidates(self, url: str) -> Optional[List[Candidate]]:
+        """
+        Candidatos sin filtrar de una página (portada o búsqueda de una fuente)
         
-        # Selectores mejorados y más completos para artículos
-        article_selectors = [
-            'article',
-            '.article',
-            '.post',
-            '.entry',
-            '.news-item',
-            '.story',
-            '.card',
-            '.item',
-            '[class*="article"]',
-            '[class*="post"]',
-            '[class*="card"]',
-            '[class*="item"]',
-            '[class*="news"]',
-            '[class*="story"]',
-            '[class*="entry"]',
-            'li[class*="article"]',
-            'li[class*="post"]',
-            'div[class*="article"]',
-            'div[class*="post"]',
-            'section article',
-            'main article',
-            '.content article',
-            '.main article'
-        ]
+        Dentro del TTL del candidate_cache se sirven sin tocar la red. Si no, la
+        página se pide con una petición condicional con los validadores de la
+        descarga anterior; si no ha cambiado (304, o el mismo HTML servido por el
+        cache HTTP) se reutilizan los candidatos ya extraídos sin parsearla.
+        Retorna None si la página no es accesible
+        """
+        # Búsquedas simultáneas de la misma página esperan a la primera descarga
+        with self.candidate_cache.lock_for(self.parser, url):
+            entry = self.candidate_cache.get(self.parser, url)
+            if entry is not None and self.candidate_cache.is_fresh(entry):
+                print(f"  ♻️  Candidatos en cache: {urlparse(url).netloc}")
+                return entry['candidatos']
+            return self._fetch_candidates(url, entry)
+    
+    def _fetch_candidates(self, url: str, entry: Optional[Dict]) -> Optional[List[Candidate]]:
+        """Descarga (condicional) y extracción de candidatos de fetch_candidates"""
+        validators = {'etag': entry['etag'], 'last_modified': entry['last_modified']} if entry else {}
+        content = self.fetch_content(url, validators=validators)
+        return self._candidates_from_content(url, entry, content, validators)
+    
+    def _candidates_from_content(self, url: str, entry: Optional[Dict], content,
+                                 validators: Dict) -> Optional[List[Candidate]]:
+        """
+        Candidatos de la página a partir de su descarga condicional (bytes, None o
+        NOT_MODIFIED), reutilizando los de entry si no ha cambiado
+        Común a fetch_candidates y a la versión asíncrona
+        """
+        if content is NOT_MODIFIED:
+            self.candidate_cache.store(self.parser, url, entry['hash'], entry['candidatos'], validators)
+            return entry['candidatos']
+        if content is None:
+            return None
         
-        found_articles = []
-        for selector in article_selectors:
-            try:
-                found = soup.select(selector)
-                if len(found) > 0:
-                    found_articles.extend(found)
-            except:
-                continue
+        html_hash = content_hash(content)
+        if entry is not None and entry['hash'] == html_hash:
+            print(f"  ♻️  Sin cambios, candidatos reutilizados: {urlparse(url).netloc}")
+            candidatos = entry['candidatos']
+        else:
+            candidatos = self.parse_candidates(content, url)
+        self.candidate_cache.store(self.parser, url, html_hash, candidatos, validators)
+        return candidatos
+    
+    def extract_candidates(self, soup, base_url: str) -> List[Candidate]:
+        """
+        Primera fase de extract_articles_generic: todos los candidatos a artículo de la
+        página, sin filtrar por tema ni quitar repetidos (ver article_selectors.select_articles)
+        No dependen de la búsqueda, así que se pueden reutilizar (ver fetch_candidates)
+        """
+        if lxml_extractor.is_lxml_tree(soup):
+            return lxml_extractor.extract_candidates(soup, base_url)
+        
+        candidates = []
         
-        # Si no encuentra con selectores, busca por tags semánticos y estructura
-        if not found_articles:
-            # Buscar en listas
-            found_articles = soup.find_all(['article', 'li'], limit=30)
-            if len(found_articles) < 5:
-                # Buscar divs con estructura de artículo
-                found_articles = soup.find_all('div', class_=lambda x: x and any(
-                    keyword in str(x).lower() for keyword in ['article', 'post', 'card', 'item', 'news', 'story']
-                ), limit=30)
-        
-        # También buscar todos los enlaces que parezcan artículos
-        all_links = soup.find_all('a', href=True)
-        article_links = []
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            # Filtrar enlaces que parezcan artículos (tienen texto significativo y URL válida)
-            if (len(text) > 15 and 
-                href and 
-                not any(skip in href.lower() for skip in ['#', 'javascript:', 'mailto:', 'tel:', '/tag/', '/category/', '/author/']) and
-                (href.startswith('http') or href.startswith('/'))):
-                article_links.append(link)
+        # Un único recorrido del documento: cada elemento se clasifica contra todas
+        # las reglas de selección a la vez y los enlaces se recogen en la misma pasada
+        found_articles, article_links = self._discover_candidates(soup)
         
         # Procesar artículos encontrados
         for article in found_articles[:20]:  # Aumentar límite a 20
@@ -299,12 +637,6 @@ class NewsSourcesScraper:
                 if not title or len(title) < 10:
                     continue
                 
-                # FILTRO TEMPRANO: Verificar si el título tiene relación con el tema/keywords
-                # Descarta artículos basura antes de procesarlos completamente
-                if keywords or tema:
-                    if not self.quick_title_check(title, keywords, tema):
-                        continue  # Descartar este artículo, no tiene relación con el tema
-                
                 # Extraer enlace - múltiples estrategias
                 link = ''
                 link_elem = article.find('a', href=True)
@@ -317,15 +649,13 @@ class NewsSourcesScraper:
                     link = article.get('href', '')
                 
                 # Normalizar URL
-                if link:
-                    if not link.startswith('http'):
-                        link = urljoin(base_url, link)
-                    # Evitar duplicados
-                    if link in seen_urls:
-                        continue
-                    seen_urls.add(link)
-                else:
+                if not link:
                     continue
+                if not link.startswith('http'):
+                    link = urljoin(base_url, link)
+                
+                candidate = new_candidate('articulo', title, link)
+                candidates.append(candidate)
                 
                 # Extraer descripción - múltiples estrategias
                 description = ''
@@ -371,15 +701,9 @@ class NewsSourcesScraper:
                         if date:
                             break
                 
-                articles.append({
-                    'titulo': title,
-                    'url': link,
-                    'descripcion': description,
-                    'imagen': image,
-                    'fecha': date,
-                })
-                
-            except Exception as e:
+                candidates[-1] = candidate._replace(descripcion=description, imagen=image, fecha=date, valido=True)
+            
+            except Exception:
                 continue
         
         # Procesar enlaces adicionales que parezcan artículos
@@ -389,191 +713,296 @@ class NewsSourcesScraper:
                 if not href.startswith('http'):
                     href = urljoin(base_url, href)
                 
-                if href in seen_urls:
-                    continue
-                seen_urls.add(href)
-                
-                title = link_elem.get_text(strip=True)
-                if len(title) >= 10:
-                    # FILTRO TEMPRANO: Verificar título antes de agregar
-                    if keywords or tema:
-                        if not self.quick_title_check(title, keywords, tema):
-                            continue  # Descartar este artículo
-                    
-                    articles.append({
-                        'titulo': title,
-                        'url': href,
-                        'descripcion': '',
-                        'imagen': '',
-                        'fecha': '',
-                    })
+                candidate = new_candidate('enlace', '', href)
+                candidates.append(candidate)
+                candidates[-1] = candidate._replace(titulo=link_elem.get_text(strip=True), valido=True)
             except:
                 continue
         
-        return articles
+        return candidates
+    
+    def _discover_candidates(self, soup: BeautifulSoup) -> tuple:
+        """
+        Recorre el árbol una sola vez y retorna (candidatos a artículo sin duplicados,
+        enlaces que parecen artículos), en el mismo orden de prioridad que los selectores
+        """
+        collector = CandidateCollector()
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            classes = element.get('class') or []
+            collector.add(element, element.name, classes, ' '.join(classes))
+            if element.name == 'a':
+                href = element.get('href')
+                if href is not None:
+                    collector.add_link(element, href, element.get_text(strip=True))
+        return collector.candidates(), collector.article_links
     
     def extract_article_content(self, url: str) -> str:
         """
         Extrae el contenido completo de un artículo visitando su URL
+        Si el artículo ya se extrajo hace poco, reutiliza el texto guardado
+        
+        Con incremental_parse, si la página no está en el cache HTTP se parsea a
+        medida que se descarga y se deja de leer en cuanto el texto extraído ya no
+        puede cambiar (ver lxml_extractor.ContentFeed)
         """
         try:
-            soup = self.fetch_page(url)
-            if not soup:
-                return ""
+            cached = self.content_store.get(url)
+            if cached is not None:
+                return cached['contenido']
             
-            # Selectores comunes para el contenido del artículo
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '.article-body',
-                '.content',
-                '[class*="article-content"]',
-                '[class*="post-content"]',
-                '[class*="entry-content"]',
-                'main article',
-                '.main-content article'
-            ]
+            entry = None
+            if self.incremental_parse:
+                # Una sola consulta al cache HTTP: si está, la aprovecha fetch_content
+                entry = self.http_cache.get(url) if self.http_cache else None
+                if entry is None:
+                    return self._stream_article_content(url)
             
-            content_text = ""
+            content = self.fetch_content(url, cached=entry)
+            if content is None:
+                return ""
             
-            # Intentar con selectores específicos
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Remover scripts, estilos y otros elementos no deseados
-                    for script in content_elem(["script", "style", "nav", "aside", "footer", "header", "iframe"]):
-                        script.decompose()
-                    
-                    # Extraer todos los párrafos
-                    paragraphs = content_elem.find_all(['p', 'div'])
+            return self._content_from_html(url, content)
+        
+        except Exception as e:
+            print(f"  ⚠️  Error extrayendo contenido de {url}: {str(e)[:100]}")
+            return ""
+    
+    def _stream_article_content(self, url: str) -> str:
+        """Descarga y parseo incremental de extract_article_content"""
+        response = self.fetch_stream(url)
+        if response is None:
+            return ""
+        
+        page = IncrementalPage(self.max_page_bytes)
+        completa = True
+        with response:  # Al cortar la lectura se descarta la conexión
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if page.add(chunk):
+                    completa = False
+                    self._print_cut(url, page)
+                    break
+        return self._incremental_content(url, page, completa, response.headers)
+    
+    def _print_cut(self, url: str, page: IncrementalPage):
+        print(f"  ✂️  Lectura cortada en {page.total // 1024} KB "
+              f"({'contenido completo' if page.listo else 'límite de descarga'}): {urlparse(url).netloc}")
+    
+    def _incremental_content(self, url: str, page: IncrementalPage, completa: bool, headers) -> str:
+        """Texto de una página leída con IncrementalPage, guardado en el almacén (y en el cache HTTP si está entera)"""
+        content = page.content()
+        if completa and len(content) < 100:
+            print("  ⚠️  Respuesta vacía o muy corta")
+            return ""
+        text = page.text()
+        
+        # Solo una página leída entera puede servir de copia en el cache HTTP
+        if completa and self.http_cache:
+            self.http_cache.store(url, content,
+                                  etag=headers.get('ETag'),
+                                  last_modified=headers.get('Last-Modified'))
+        self.content_store.put(url, content_hash(content), text)
+        return text
+    
+    def _content_from_html(self, url: str, content: bytes) -> str:
+        """
+        Extrae el texto de un artículo a partir de su HTML y lo guarda en el almacén
+        Si el mismo HTML ya se había extraído (mismo hash), no se vuelve a parsear
+        """
+        html_hash = content_hash(content)
+        known = self.content_store.get_by_hash(html_hash)
+        if known is not None:
+            text = known['contenido']
+        else:
+            text = self.parse_content(content)
+        
+        self.content_store.put(url, html_hash, text)
+        return text
+    
+    def extract_content_from_soup(self, soup) -> str:
+        """
+        Extrae el texto principal de la página de un artículo ya parseada
+        """
+        if lxml_extractor.is_lxml_tree(soup):
+            return lxml_extractor.extract_content(soup)
+        
+        # Selectores comunes para el contenido del artículo
+        content_selectors = [
+            'article',
+            '.article-content',
+            '.post-content',
+            '.entry-content',
+            '.article-body',
+            '.content',
+            '[class*="article-content"]',
+            '[class*="post-content"]',
+            '[class*="entry-content"]',
+            'main article',
+            '.main-content article'
+        ]
+        
+        content_text = ""
+        
+        # Intentar con selectores específicos
+        for selector in content_selectors:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                # Remover scripts, estilos y otros elementos no deseados
+                for script in content_elem(["script", "style", "nav", "aside", "footer", "header", "iframe"]):
+                    script.decompose()
+                
+                # Extraer todos los párrafos
+                paragraphs = content_elem.find_all(['p', 'div'])
+                content_parts = []
+                for p in paragraphs:
+                    text = p.get_text(strip=True)
+                    if text and len(text) > 20:  # Filtrar textos muy cortos
+                        content_parts.append(text)
+                
+                if content_parts:
+                    content_text = "\n\n".join(content_parts)
+                    break
+        
+        # Si no se encontró con selectores específicos, intentar extraer de body
+        if not content_text:
+            body = soup.find('body')
+            if body:
+                # Remover elementos no deseados
+                for script in body(["script", "style", "nav", "aside", "footer", "header", "iframe", "noscript"]):
+                    script.decompose()
+                
+                # Buscar el contenido principal
+                main_content = body.find(['main', 'article', 'div'], class_=lambda x: x and ('content' in str(x).lower() or 'article' in str(x).lower() or 'post' in str(x).lower()))
+                if main_content:
+                    paragraphs = main_content.find_all(['p', 'div'])
                     content_parts = []
                     for p in paragraphs:
                         text = p.get_text(strip=True)
-                        if text and len(text) > 20:  # Filtrar textos muy cortos
+                        if text and len(text) > 20:
                             content_parts.append(text)
-                    
                     if content_parts:
                         content_text = "\n\n".join(content_parts)
-                        break
-            
-            # Si no se encontró con selectores específicos, intentar extraer de body
-            if not content_text:
-                body = soup.find('body')
-                if body:
-                    # Remover elementos no deseados
-                    for script in body(["script", "style", "nav", "aside", "footer", "header", "iframe", "noscript"]):
-                        script.decompose()
-                    
-                    # Buscar el contenido principal
-                    main_content = body.find(['main', 'article', 'div'], class_=lambda x: x and ('content' in str(x).lower() or 'article' in str(x).lower() or 'post' in str(x).lower()))
-                    if main_content:
-                        paragraphs = main_content.find_all(['p', 'div'])
-                        content_parts = []
-                        for p in paragraphs:
-                            text = p.get_text(strip=True)
-                            if text and len(text) > 20:
-                                content_parts.append(text)
-                        if content_parts:
-                            content_text = "\n\n".join(content_parts)
-            
-            return content_text[:10000]  # Limitar a 10000 caracteres
-            
-        except Exception as e:
-            print(f"  ⚠️  Error extrayendo contenido de {url}: {str(e)[:100]}")
-            return ""
+        
+        return content_text[:10000]  # Limitar a 10000 caracteres
     
-    def calculate_similarity(self, text: str, keywords: List[str], tema: str) -> float:
-        """
-        Calcula la similitud mejorada y estricta de un texto con el tema y keywords
-        Retorna un score de 0 a 200, siendo más estricto con la relevancia
+    def extract_contents(self, urls: List[str]) -> Dict[str, str]:
         """
-        text_lower = text.lower()
-        tema_lower = tema.lower()
+        Etapa concurrente de extracción de contenido completo
         
-        # Normalizar texto (remover caracteres especiales para mejor matching)
-        text_normalized = re.sub(r'[^\w\s]', ' ', text_lower)
-        tema_normalized = re.sub(r'[^\w\s]', ' ', tema_lower)
-        
-        # Dividir tema en palabras significativas (más de 3 caracteres)
-        tema_words = [w for w in tema_normalized.split() if len(w) > 3]
+        Returns:
+            Diccionario URL -> contenido extraído ("" si no se pudo extraer)
+        """
+        return dict(self.iter_contents(urls))
+    
+    def iter_contents(self, urls: List[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Extrae el contenido completo de las URLs en paralelo y lo entrega a medida
+        que cada una termina, como pares (URL, contenido)
+        Las URLs repetidas se extraen y entregan una sola vez
+        """
+        yield from self.stream_contents((url, url) for url in dict.fromkeys(u for u in urls if u))
+    
+    def stream_contents(self, items: Iterable[Tuple[Optional[str], Any]],
+                        window: Optional[int] = None) -> Iterator[Tuple[Any, str]]:
+        """
+        Etapa de extracción del pipeline: recibe pares (URL, dato) a medida que la
+        etapa anterior los produce y entrega (dato, contenido) en cuanto termina
+        cada extracción
         
-        score = 0.0
-        keywords_found = 0
-        tema_words_found = 0
+        Las URLs se reparten en una cola por host; cada host tiene como mucho
+        max_per_host hilos consumiendo su cola, y el total está acotado por
+        content_workers. La pausa de cortesía sigue aplicándose por dominio.
         
-        # 1. Coincidencia exacta de keywords completas (peso MUY alto - obligatorio)
-        for kw in keywords:
-            kw_lower = kw.lower()
-            kw_normalized = re.sub(r'[^\w\s]', ' ', kw_lower)
-            
-            # Coincidencia exacta de la keyword completa (más estricto)
-            if kw_normalized in text_normalized:
-                keywords_found += 1
-                # Puntuación basada en longitud de keyword (keywords más largas = más específicas)
-                base_score = 20 + len(kw_normalized) * 4  # Aumentado
-                score += base_score
-            
-            # Coincidencia de todas las palabras de la keyword (más estricto)
-            kw_words = [w for w in kw_normalized.split() if len(w) > 2]
-            if len(kw_words) > 1:
-                matches = sum(1 for word in kw_words if word in text_normalized)
-                if matches == len(kw_words):  # Todas las palabras coinciden (obligatorio)
-                    keywords_found += 1
-                    score += 15  # Aumentado
-                elif matches >= len(kw_words) * 0.8:  # Al menos 80% de palabras (más estricto)
-                    score += 10
-        
-        # 2. Coincidencia de palabras del tema (peso medio-alto)
-        for word in tema_words:
-            if word in text_normalized:
-                tema_words_found += 1
-                score += 8  # Aumentado
-        
-        # 3. Verificación de correlación temática (NUEVO - más estricto)
-        # Requiere que al menos el 50% de las keywords principales estén presentes
-        keywords_principales = [kw for kw in keywords if len(kw.split()) == 1 or len(kw) > 8]
-        if keywords_principales:
-            keywords_principales_encontradas = sum(1 for kw in keywords_principales 
-                                                   if kw.lower() in text_normalized)
-            porcentaje_keywords = keywords_principales_encontradas / len(keywords_principales)
-            
-            # Si menos del 30% de keywords principales están presentes, penalizar
-            if porcentaje_keywords < 0.3:
-                score *= 0.3  # Reducir significativamente el score
-            # Si más del 70% están presentes, bonus
-            elif porcentaje_keywords >= 0.7:
-                score += 25
-        
-        # 4. Coincidencias parciales de palabras individuales (peso bajo, solo si hay contexto)
-        # Solo contar si ya hay alguna coincidencia previa
-        if keywords_found > 0 or tema_words_found > 0:
-            all_keywords_words = []
-            for kw in keywords:
-                kw_normalized = re.sub(r'[^\w\s]', ' ', kw.lower())
-                all_keywords_words.extend([w for w in kw_normalized.split() if len(w) > 3])
-            
-            for kw_word in set(all_keywords_words):
-                if kw_word in text_normalized:
-                    score += 2  # Reducido, solo como refuerzo
-        else:
-            # Si no hay ninguna coincidencia previa, no dar puntos por palabras sueltas
-            # Esto evita artículos que solo mencionan una palabra del tema de pasada
-            pass
+        - Los datos sin URL pasan sin extracción (contenido "")
+        - Una URL que llega mientras se extrae comparte esa extracción
+        - Contrapresión: con window datos pendientes de entregar (por defecto
+          2 x content_workers) no se piden más a la etapa anterior
+        - Si se deja de consumir, no se empiezan más extracciones y se cierra la
+          etapa anterior (esperando a las peticiones que ya están en curso)
+        """
+        window = window or self.content_workers * 2
+        lock = threading.Lock()
+        host_queues = {}  # host -> cola de URLs
+        activos = {}  # host -> hilos consumiendo su cola
+        en_curso = {}  # URL -> datos que esperan su contenido
+        huecos = threading.Semaphore(window)
+        done = queue.Queue()
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max(1, self.content_workers))
         
-        # 5. Bonus por coincidencia en el título (si el texto parece ser un título)
-        if len(text) < 200:  # Probablemente es un título
-            for kw in keywords:
-                if kw.lower() in text_lower:
-                    score += 8  # Aumentado
+        def worker(host: str):
+            while not stop.is_set():
+                with lock:
+                    try:
+                        url = host_queues[host].get_nowait()
+                    except queue.Empty:
+                        activos[host] -= 1
+                        return
+                content = ""
+                try:
+                    content = self.extract_article_content(url)
+                finally:
+                    with lock:
+                        datos = en_curso.pop(url)
+                    done.put(('contenido', datos, content))
         
-        # 6. Penalización si no hay suficiente correlación
-        # Requiere al menos 1 keyword completa O 2+ palabras del tema
-        if keywords_found == 0 and tema_words_found < 2:
-            score *= 0.2  # Penalización severa si no hay correlación suficiente
+        def feed():
+            recibidos = 0
+            try:
+                for url, dato in items:
+                    while not huecos.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    recibidos += 1
+                    if not url:
+                        done.put(('contenido', [dato], ""))
+                        continue
+                    with lock:
+                        if url in en_curso:
+                            en_curso[url].append(dato)
+                            continue
+                        en_curso[url] = [dato]
+                        host = urlparse(url).netloc
+                        host_queues.setdefault(host, queue.Queue()).put(url)
+                        if activos.get(host, 0) < self.max_per_host:
+                            activos[host] = activos.get(host, 0) + 1
+                            executor.submit(worker, host)
+                done.put(('fin', recibidos, None))
+            except Exception as e:
+                done.put(('error', e, None))
+            finally:
+                if hasattr(items, 'close'):
+                    items.close()  # Detiene la etapa anterior si se ha cortado el pipeline
         
-        return min(score, 200)  # Limitar score máximo pero permitir valores altos
+        feeder = threading.Thread(target=feed, daemon=True, name='extraccion-entrada')
+        feeder.start()
+        try:
+            entregados, total = 0, None
+            while total is None or entregados < total:
+                tipo, valor, contenido = done.get()
+                if tipo == 'fin':
+                    total = valor
+                    continue
+                if tipo == 'error':
+                    raise valor
+                for dato in valor:
+                    entregados += 1
+                    huecos.release()
+                    yield dato, contenido
+        finally:
+            stop.set()
+            feeder.join()
+            executor.shutdown(wait=True)
+    
+    def calculate_similarity(self, text: str, keywords: List[str], tema: str) -> float:
+        """
+        Calcula la similitud mejorada y estricta de un texto con el tema y keywords
+        Retorna un score de 0 a 200, siendo más estricto con la relevancia
+        """
+        return compile_query(keywords, tema).similarity(text)
     
     def filter_by_keywords(self, articles: List[Dict], keywords: List[str], tema: str = "", min_results: int = 5) -> List[Dict]:
         """
@@ -584,46 +1013,14 @@ class NewsSourcesScraper:
         filtered_similar = []
         filtered_flexible = []
         
-        # Umbral mínimo de relevancia (más estricto)
-        UMBRAL_MINIMO_EXACTO = 100  # Coincidencia exacta con keywords
-        UMBRAL_MINIMO_SIMILAR = 25   # Similitud alta (aumentado de ~10)
-        UMBRAL_MINIMO_FLEXIBLE = 15  # Similitud media (aumentado de ~5)
+        buckets = {'exacto': filtered_exact, 'similar': filtered_similar, 'flexible': filtered_flexible}
         
-        for article in articles:
-            text_to_search = f"{article['titulo']} {article['descripcion']}".lower()
-            
-            # Verificar coincidencia exacta con keywords (más estricto)
-            keywords_encontradas = [kw for kw in keywords if kw.lower() in text_to_search]
-            exact_match = len(keywords_encontradas) > 0
-            
-            if exact_match:
-                # Calcular relevancia (cuántas keywords coinciden)
-                relevance = len(keywords_encontradas) * 30 + 100  # Aumentado el peso
-                # Bonus si todas las keywords principales están presentes
-                if len(keywords_encontradas) >= len(keywords) * 0.5:  # Al menos 50%
-                    relevance += 50
-                article['relevancia'] = relevance
-                article['tipo_match'] = 'exacto'
-                filtered_exact.append(article)
-            else:
-                # Calcular similitud si hay tema (más estricto)
-                if tema:
-                    similarity_score = self.calculate_similarity(
-                        f"{article['titulo']} {article['descripcion']}",
-                        keywords,
-                        tema
-                    )
-                    
-                    # Solo agregar si supera el umbral mínimo
-                    if similarity_score >= UMBRAL_MINIMO_SIMILAR:
-                        article['relevancia'] = similarity_score
-                        article['tipo_match'] = 'similar'
-                        filtered_similar.append(article)
-                    elif similarity_score >= UMBRAL_MINIMO_FLEXIBLE:
-                        # Solo como último recurso y con umbral más alto
-                        article['relevancia'] = similarity_score
-                        article['tipo_match'] = 'flexible'
-                        filtered_flexible.append(article)
+        # Todos los artículos se puntúan de una vez (umbrales en batch_scoring)
+        for article, puntuacion in zip(articles, score_articles(articles, keywords, tema)):
+            if puntuacion is None:
+                continue  # Sin correlación suficiente con el tema
+            article['relevancia'], article['tipo_match'] = puntuacion
+            buckets[article['tipo_match']].append(article)
         
         # Priorizar resultados exactos
         if len(filtered_exact) >= min_results:
@@ -689,11 +1086,13 @@ class NewsSourcesScraper:
         """
         all_articles = []
         
-        # Estrategia 1: Scrapear la página principal
-        soup = self.fetch_page(url)
+        title_check = self._title_check(keywords, tema)
         
-        if soup:
-            articles = self.extract_articles_generic(soup, url, keywords=keywords, tema=tema)
+        # Estrategia 1: Scrapear la página principal (candidatos reutilizados si no ha cambiado)
+        candidatos = self.fetch_candidates(url)
+        
+        if candidatos is not None:
+            articles = select_articles(candidatos, title_check)
             all_articles.extend(articles)
         
         # Estrategia 2: Si hay tema/keywords, intentar buscar en URL de búsqueda
@@ -703,9 +1102,9 @@ class NewsSourcesScraper:
                 search_url = self.get_search_url(url, search_query)
                 if search_url and search_url != url:
                     print(f"  🔍 Intentando búsqueda en: {urlparse(search_url).netloc}...")
-                    search_soup = self.fetch_page(search_url)
-                    if search_soup:
-                        search_articles = self.extract_articles_generic(search_soup, search_url, keywords=keywords, tema=tema)
+                    search_candidatos = self.fetch_candidates(search_url)
+                    if search_candidatos is not None:
+                        search_articles = select_articles(search_candidatos, title_check)
                         # Evitar duplicados
                         existing_urls = {a['url'] for a in all_articles}
                         for article in search_articles:
@@ -713,6 +1112,12 @@ class NewsSourcesScraper:
                                 all_articles.append(article)
                                 existing_urls.add(article['url'])
         
+        return self._source_result(url, all_articles, keywords, tema)
+    
+    def _source_result(self, url: str, all_articles: List[Dict], keywords: Optional[List[str]] = None, tema: str = "") -> Dict:
+        """
+        Filtra los artículos encontrados en una fuente y arma su resultado
+        """
         if not all_articles:
             return {
                 'fuente': url,
@@ -737,54 +1142,215 @@ class NewsSourcesScraper:
             'articulos': all_articles[:15]  # Aumentar a top 15
         }
     
-    def scrape_all_sources(self, keywords: Optional[List[str]] = None, tema: str = "") -> List[Dict]:
+    def scrape_all_sources(self, keywords: Optional[List[str]] = None, tema: str = "",
+                           progress: Optional[Callable[[str, Dict], None]] = None) -> List[Dict]:
         """
-        Scrapea todas las fuentes configuradas con delays optimizados al mínimo legal
+        Scrapea todas las fuentes configuradas en paralelo (una tarea por fuente)
+        
+        La pausa de cortesía se aplica por dominio en fetch_page, así que el tiempo
+        total depende de la fuente más lenta y no de la suma de todas.
         
         Args:
             keywords: Lista de palabras clave para filtrar (opcional)
             tema: Tema de búsqueda para filtro flexible
-            
+            progress: Función (evento, datos) que se llama al terminar cada fuente (opcional)
+        
         Returns:
-            Lista de resultados por fuente
+            Lista de resultados por fuente (en el mismo orden que SOURCES)
         """
-        print(f"🕷️  Iniciando scraping de {len(self.SOURCES)} fuentes...")
+        results = [None] * len(self.SOURCES)
+        for i, result in self.iter_sources(keywords, tema, progress):
+            results[i] = result
+        return results
+    
+    def iter_sources(self, keywords: Optional[List[str]] = None, tema: str = "",
+                     progress: Optional[Callable[[str, Dict], None]] = None) -> Iterator[Tuple[int, Dict]]:
+        """
+        Etapa de descubrimiento del pipeline: scrapea las fuentes y entrega
+        (índice en SOURCES, resultado) de cada una en cuanto termina, con sus
+        artículos ya filtrados y puntuados
+        
+        Hay como mucho max_workers fuentes en curso y cada una nueva se empieza al
+        entregar un resultado: si se deja de consumir el generador, no se scrapean
+        más fuentes
+        """
+        sources = list(self.SOURCES)
+        print(f"🕷️  Iniciando scraping de {len(sources)} fuentes...")
         print(f"🤖 User-Agent: {self.user_agent}")
         print(f"📋 Verificando robots.txt antes de cada acceso...")
+        print(f"⚡ Hasta {self.max_workers} fuentes en paralelo")
         if keywords:
             print(f"🔍 Filtrando por: {', '.join(keywords)}")
         if tema:
             print(f"📌 Tema: {tema}")
         print()
         
-        results = []
+        if not sources:
+            return
         
-        for i, source_url in enumerate(self.SOURCES, 1):
-            print(f"[{i}/{len(self.SOURCES)}] {source_url}")
-            
-            result = self.scrape_source(source_url, keywords, tema)
-            results.append(result)
+        # robots.txt de todas las fuentes en paralelo antes de empezar
+        self.prefetch_robots(sources)
+        
+        workers = max(1, min(self.max_workers, len(sources)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        siguientes = iter(enumerate(sources))
+        futures = {}
+        
+        def submit_next():
+            for i, source_url in siguientes:
+                futures[executor.submit(self.scrape_source, source_url, keywords, tema)] = i
+                return
+        
+        try:
+            for _ in range(workers):
+                submit_next()
             
-            print(f"  ✓ {result['articulos_encontrados']} artículos encontrados\n")
+            completed = 0
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures.pop(future)
+                    source_url = sources[i]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"  ⚠️  Error scrapeando {source_url}: {str(e)[:100]}")
+                        result = self._source_result(source_url, [])
+                    completed += 1
+                    
+                    print(f"[{completed}/{len(sources)}] {source_url}")
+                    print(f"  ✓ {result['articulos_encontrados']} artículos encontrados\n")
+                    if progress:
+                        progress('fuente', self._source_progress(result, completed, len(sources)))
+                    
+                    submit_next()
+                    yield i, result
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def _source_progress(self, result: Dict, completadas: int, total: int) -> Dict:
+        """Datos del evento de progreso 'fuente'"""
+        return {
+            'fuente': result['fuente'],
+            'estado': result['estado'],
+            'articulos': result['articulos_encontrados'],
+            'completadas': completadas,
+            'total': total
+        }
+    
+    def iter_candidates(self, sources: Iterable[Tuple[int, Dict]],
+                        progress: Optional[Callable[[str, Dict], None]] = None) -> Iterator[Tuple[Optional[str], Tuple]]:
+        """
+        Etapa de candidatos del pipeline: por cada fuente scrapeada, un marcador
+        (None, (orden, fuente, None)) y después sus artículos como pares
+        (URL, (orden, fuente, artículo)) listos para stream_contents
+        orden = (índice de la fuente, índice del artículo) conserva el orden original
+        """
+        for i, source in sources:
+            yield None, ((i, -1), source, None)
             
-            # Pausa moderada entre requests para evitar bloqueos (1-2 segundos)
-            if i < len(self.SOURCES):
-                time.sleep(random.uniform(1.0, 2.0))
+            articulos = source['articulos'] if source['estado'] == 'completado' else []
+            if not articulos:
+                continue
+            print(f"\n📄 Extrayendo contenido completo de {len(articulos)} artículos de {source['nombre_fuente']}...")
+            if progress:
+                progress('extraccion', {'fuente': source['fuente'], 'articulos': len(articulos)})
+            for j, article in enumerate(articulos):
+                self._print_candidate(j + 1, len(articulos), article)
+                yield article.get('url'), ((i, j), source, article)
+    
+    def _print_candidate(self, numero: int, total: int, article: Dict):
+        tipo_match = article.get('tipo_match', 'exacto')
+        match_icon = '🎯' if tipo_match == 'exacto' else '🔍' if tipo_match == 'similar' else '📌' if tipo_match == 'flexible' else '📄'
+        print(f"  [{numero}/{total}] {match_icon} Extrayendo: {article['titulo'][:60]}...")
+    
+    def _print_match_summary(self, tipos: Dict[str, int]):
+        """Resumen de tipos de match de los artículos extraídos"""
+        exactos = tipos.get('exacto', 0)
+        similares = tipos.get('similar', 0)
+        flexibles = tipos.get('flexible', 0)
+        if similares > 0 or flexibles > 0:
+            print("\n📊 Resumen de coincidencias:")
+            if exactos > 0:
+                print(f"   🎯 Exactos: {exactos}")
+            if similares > 0:
+                print(f"   🔍 Similares: {similares}")
+            if flexibles > 0:
+                print(f"   📌 Flexibles: {flexibles}")
+    
+    def _content_scores(self, pending: List[Tuple[Dict, str]], search_query: str,
+                        keywords: Optional[List[str]] = None) -> List[Optional[float]]:
+        """
+        Relevancia con contenido completo de todos los artículos de una vez (ver
+        batch_scoring.similarity_scores), con el mismo texto que _build_finding
+        Por par (artículo, contenido), su score o None si no se re-puntúa
+        """
+        textos = {}
+        if search_query:
+            for index, (article, contenido_completo) in enumerate(pending):
+                if article.get('url') and contenido_completo:
+                    textos[index] = f"{article['titulo']} {article['descripcion']} {contenido_completo[:500]}"
         
-        return results
+        query = compile_query(keywords if keywords else [search_query], search_query)
+        relevancias = dict(zip(textos, similarity_scores(query, list(textos.values()))))
+        return [relevancias.get(index) for index in range(len(pending))]
     
-    def generate_search_result(self, search_query: str, keywords: Optional[List[str]] = None) -> Dict:
+    def _build_finding(self, source: Dict, article: Dict, contenido_completo: str, search_query: str,
+                       keywords: Optional[List[str]] = None, relevancia_completa: Optional[float] = None) -> Optional[Dict]:
         """
-        Genera un resultado en el formato especificado
+        Construye un hallazgo a partir de un artículo y su contenido completo
+        Retorna None si el artículo pierde relevancia tras el análisis completo
+        relevancia_completa: score ya calculado por lotes (None para calcularlo aquí)
+        """
+        tipo_match = article.get('tipo_match', 'exacto')
         
-        Args:
-            search_query: Descripción de la búsqueda realizada (tema)
-            keywords: Palabras clave para filtrar
+        # Re-filtrar con contenido completo para mayor precisión
+        # Si el artículo ya pasó el filtro inicial, verificar con contenido completo
+        texto_completo_para_verificar = f"{article['titulo']} {article['descripcion']}"
+        
+        # Si tenemos contenido completo, verificar relevancia nuevamente
+        if article.get('url') and contenido_completo:
+            texto_completo_para_verificar += " " + contenido_completo[:500]  # Primeros 500 chars
             
-        Returns:
-            Diccionario con el formato del resultado
-        """
-        # Advertencia sobre uso del contenido
+            # Re-calcular relevancia con contenido completo
+            if search_query:
+                # Usar las keywords que se pasaron a la función
+                if relevancia_completa is None:
+                    keywords_para_verificar = keywords if keywords else [search_query]
+                    relevancia_completa = self.calculate_similarity(
+                        texto_completo_para_verificar,
+                        keywords_para_verificar,
+                        search_query
+                    )
+                
+                # Solo incluir si mantiene relevancia suficiente
+                if relevancia_completa < 15:  # Umbral mínimo incluso con contenido
+                    print(f"  ⚠️  Artículo descartado por baja relevancia tras análisis completo")
+                    return None
+                
+                # Actualizar relevancia con el cálculo completo
+                article['relevancia'] = max(article.get('relevancia', 0), relevancia_completa)
+        
+        return {
+            'fuente': source['nombre_fuente'],
+            'url_fuente': source['fuente'],
+            'titulo': article['titulo'],
+            'url': article['url'],
+            'descripcion': article['descripcion'],
+            'contenido': contenido_completo,
+            'imagen': article['imagen'],
+            'fecha': article['fecha'],
+            'relevancia': article.get('relevancia', 0),
+            'tipo_match': tipo_match,
+            # Información adicional para facilitar citación en IA
+            'cita_formato': f"{source['nombre_fuente']} - {article['titulo']} ({article['url']})",
+            'cita_corta': f"{source['nombre_fuente']}"
+        }
+    
+    def _print_legal_warning(self):
+        """Muestra la advertencia legal sobre el uso del contenido"""
         print("\n" + "="*70)
         print("⚠️  ADVERTENCIA LEGAL")
         print("="*70)
@@ -796,164 +1362,309 @@ class NewsSourcesScraper:
         print("    - No reproducir contenido completo sin permiso")
         print("    - Considerar el uso justo (fair use)")
         print("="*70 + "\n")
+    
+    def generate_search_result(self, search_query: str, keywords: Optional[List[str]] = None,
+                               progress: Optional[Callable[[str, Dict], None]] = None,
+                               top_n: Optional[int] = None, min_relevance: float = 0,
+                               top_k: Optional[int] = None, incremental: bool = False,
+                               compact: bool = False) -> Union[Dict, SearchResult]:
+        """
+        Genera un resultado en el formato especificado
         
-        # Realizar scraping con filtro flexible usando el tema
-        sources_results = self.scrape_all_sources(keywords, tema=search_query)
+        Args:
+            search_query: Descripción de la búsqueda realizada (tema)
+            keywords: Palabras clave para filtrar
+            progress: Función (evento, datos) para seguir el avance: 'fuente' por cada
+                      fuente scrapeada y 'extraccion' al empezar a extraer el contenido
+                      de sus artículos (opcional)
+            top_n: Detener la búsqueda en cuanto haya top_n hallazgos con relevancia
+                   >= min_relevance (opcional; las fuentes sin scrapear quedan 'omitida')
+            min_relevance: Relevancia mínima de los hallazgos que cuentan para top_n
+            top_k: Devolver solo los top_k hallazgos más relevantes, extrayendo el
+                   contenido de los candidatos por prioridad (ver _top_k_findings)
+            incremental: Extraer y devolver solo los artículos nuevos o modificados
+                         desde la última ejecución de esta búsqueda (requiere seen_index)
+            compact: Retornar un SearchResult (ver result_store) en lugar del diccionario:
+                     ocupa mucho menos mientras se guarda y su to_dict genera el mismo formato
         
-        # Compilar todos los hallazgos
-        all_findings = []
-        total_articulos = sum(len(s['articulos']) for s in sources_results if s['estado'] == 'completado')
+        Returns:
+            Diccionario con el formato del resultado (SearchResult con compact)
+        """
+        if incremental and top_k:
+            raise ValueError("El modo incremental no se combina con top_k")
+        self._print_legal_warning()
         
-        # Contar tipos de match
-        exactos = 0
-        similares = 0
-        flexibles = 0
+        if top_k:
+            sources_results = self.scrape_all_sources(keywords, tema=search_query, progress=progress)
+            all_findings = self._top_k_findings(sources_results, search_query, keywords, top_k, progress)
+            return self._compile_search_result(search_query, sources_results, all_findings, compact)
         
-        if total_articulos > 0:
-            print(f"\n📄 Extrayendo contenido completo de {total_articulos} artículos...")
-            
-            for source in sources_results:
-                if source['estado'] == 'completado' and source['articulos_encontrados'] > 0:
-                    for i, article in enumerate(source['articulos'], 1):
-                        tipo_match = article.get('tipo_match', 'exacto')
-                        match_icon = '🎯' if tipo_match == 'exacto' else '🔍' if tipo_match == 'similar' else '📌' if tipo_match == 'flexible' else '📄'
-                        print(f"  [{i}/{len(source['articulos'])}] {match_icon} Extrayendo: {article['titulo'][:60]}...")
-                        
-                        # Contar tipos
-                        if tipo_match == 'exacto':
-                            exactos += 1
-                        elif tipo_match == 'similar':
-                            similares += 1
-                        elif tipo_match == 'flexible':
-                            flexibles += 1
-                        
-                        # Re-filtrar con contenido completo para mayor precisión
-                        # Si el artículo ya pasó el filtro inicial, verificar con contenido completo
-                        texto_completo_para_verificar = f"{article['titulo']} {article['descripcion']}"
-                        
-                        # Extraer contenido completo del artículo
-                        contenido_completo = ""
-                        if article.get('url'):
-                            contenido_completo = self.extract_article_content(article['url'])
-                            # Pausa moderada entre extracciones (0.5-1 segundo)
-                            time.sleep(random.uniform(0.5, 1.0))
-                            
-                            # Si tenemos contenido completo, verificar relevancia nuevamente
-                            if contenido_completo:
-                                texto_completo_para_verificar += " " + contenido_completo[:500]  # Primeros 500 chars
-                                
-                                # Re-calcular relevancia con contenido completo
-                                if search_query:
-                                    # Usar las keywords que se pasaron a la función
-                                    keywords_para_verificar = keywords if keywords else [search_query]
-                                    relevancia_completa = self.calculate_similarity(
-                                        texto_completo_para_verificar,
-                                        keywords_para_verificar,
-                                        search_query
-                                    )
-                                    
-                                    # Solo incluir si mantiene relevancia suficiente
-                                    if relevancia_completa < 15:  # Umbral mínimo incluso con contenido
-                                        print(f"  ⚠️  Artículo descartado por baja relevancia tras análisis completo")
-                                        continue  # Saltar este artículo
-                                    
-                                    # Actualizar relevancia con el cálculo completo
-                                    article['relevancia'] = max(article.get('relevancia', 0), relevancia_completa)
-                        
-                        all_findings.append({
-                            'fuente': source['nombre_fuente'],
-                            'url_fuente': source['fuente'],
-                            'titulo': article['titulo'],
-                            'url': article['url'],
-                            'descripcion': article['descripcion'],
-                            'contenido': contenido_completo,
-                            'imagen': article['imagen'],
-                            'fecha': article['fecha'],
-                            'relevancia': article.get('relevancia', 0),
-                            'tipo_match': tipo_match,
-                            # Información adicional para facilitar citación en IA
-                            'cita_formato': f"{source['nombre_fuente']} - {article['titulo']} ({article['url']})",
-                            'cita_corta': f"{source['nombre_fuente']}"
-                        })
-            
-            # Mostrar resumen de tipos de match
-            if similares > 0 or flexibles > 0:
-                print(f"\n📊 Resumen de coincidencias:")
-                if exactos > 0:
-                    print(f"   🎯 Exactos: {exactos}")
-                if similares > 0:
-                    print(f"   🔍 Similares: {similares}")
-                if flexibles > 0:
-                    print(f"   📌 Flexibles: {flexibles}")
+        sources_results = [None] * len(self.SOURCES)
+        hallazgos = []
+        for orden, source, finding in self._search_pipeline(search_query, keywords, progress, top_n, min_relevance,
+                                                            incremental):
+            if finding is None:
+                sources_results[orden[0]] = source
+            else:
+                hallazgos.append((orden, finding))
+        
+        # Orden de llegada -> orden de fuentes y artículos (desempate estable al ordenar por relevancia)
+        hallazgos.sort(key=lambda x: x[0])
+        all_findings = [finding for _, finding in hallazgos]
+        
+        return self._compile_search_result(search_query, self._complete_sources(sources_results), all_findings, compact)
+    
+    def _top_k_findings(self, sources_results: List[Dict], search_query: str, keywords: Optional[List[str]],
+                        top_k: int, progress: Optional[Callable[[str, Dict], None]] = None) -> List[Dict]:
+        """
+        Modo top_k: extrae el contenido de los candidatos en orden de prioridad y se
+        detiene en cuanto ninguno de los que quedan puede superar al K-ésimo hallazgo
+        
+        La relevancia final de un artículo es el máximo entre la del filtro y la
+        similitud con contenido, que nunca supera query.max_similarity: esa es la
+        cota de cada candidato. Los hallazgos son los mismos top_k primeros que daría
+        la búsqueda completa, en el mismo orden
+        """
+        query = compile_query(keywords if keywords else [search_query], search_query)
+        
+        # Candidatos por cota descendente (a igual cota, en el orden original)
+        candidatos = []
+        for i, source in enumerate(sources_results):
+            if source['estado'] != 'completado':
+                continue
+            for j, article in enumerate(source['articulos']):
+                cota = article.get('relevancia', 0)
+                if article.get('url') and search_query:
+                    cota = max(cota, query.max_similarity)
+                candidatos.append((-cota, (i, j), source, article))
+        heapq.heapify(candidatos)
+        total = len(candidatos)
+        
+        print(f"\n📄 Modo top {top_k}: {total} candidatos, extrayendo contenido por prioridad...")
+        if progress:
+            progress('extraccion', {'articulos': total, 'top_k': top_k})
+        
+        mejores = []  # heap con los top_k hallazgos: ((relevancia, -orden), orden, hallazgo)
+        lock = threading.Lock()
+        extraidos = 0
+        
+        def por_prioridad():
+            nonlocal extraidos
+            while candidatos:
+                cota, orden, source, article = heapq.heappop(candidatos)
+                with lock:
+                    # Ni este ni los siguientes (cota menor o igual) pueden entrar
+                    if len(mejores) >= top_k and (-cota, (-orden[0], -orden[1])) <= mejores[0][0]:
+                        return
+                extraidos += 1
+                self._print_candidate(orden[1] + 1, len(source['articulos']), article)
+                yield article.get('url'), (orden, source, article)
+        
+        tipos = {}
+        for (orden, source, article), contenido in self.stream_contents(por_prioridad(), window=min(self.content_workers, top_k)):
+            tipo_match = article.get('tipo_match', 'exacto')
+            tipos[tipo_match] = tipos.get(tipo_match, 0) + 1
+            finding = self._build_finding(source, article, contenido, search_query, keywords)
+            if finding is None:
+                continue
+            entrada = ((finding['relevancia'], (-orden[0], -orden[1])), orden, finding)
+            with lock:
+                if len(mejores) < top_k:
+                    heapq.heappush(mejores, entrada)
+                elif entrada[0] > mejores[0][0]:
+                    heapq.heapreplace(mejores, entrada)
+        
+        self._print_match_summary(tipos)
+        sin_extraer = total - extraidos
+        if sin_extraer:
+            print(f"  ⏭️  {sin_extraer}/{total} artículos sin extraer: no pueden entrar en el top {top_k}")
+        
+        return [finding for _, _, finding in sorted(mejores, key=lambda x: x[1])]
+    
+    def _search_pipeline(self, search_query: str, keywords: Optional[List[str]] = None,
+                         progress: Optional[Callable[[str, Dict], None]] = None,
+                         top_n: Optional[int] = None, min_relevance: float = 0,
+                         incremental: bool = False) -> Iterator[Tuple[Tuple, Dict, Optional[Dict]]]:
+        """
+        Pipeline perezoso de la búsqueda, etapa por etapa:
+        fuentes (scraping, pre-filtro y puntuación) -> candidatos -> contenido -> re-puntuación
         
+        Cada artículo pasa a extracción en cuanto su fuente termina, sin esperar a las
+        demás. Entrega (orden, fuente, hallazgo) a medida que se completan, con
+        hallazgo None cuando una fuente termina su scraping. Con top_n se corta en
+        cuanto hay top_n hallazgos con relevancia >= min_relevance
+        
+        Con seen_index los artículos y el hash de su contenido quedan registrados; en
+        modo incremental los ya vistos no se extraen y los hallazgos sin cambios no
+        se emiten (los emitidos llevan 'novedad': 'nuevo' o 'modificado')
+        """
+        scope = self._seen_scope(search_query, keywords, incremental)
+        
+        fuentes = self.iter_sources(keywords, tema=search_query, progress=progress)
+        if scope is not None:
+            fuentes = self._skip_seen(fuentes, scope, incremental)
+        contenidos = self.stream_contents(self.iter_candidates(fuentes, progress))
+        suficientes = 0
+        tipos = {}
+        try:
+            for (orden, source, article), contenido in contenidos:
+                if article is None:
+                    yield orden, source, None
+                    continue
+                
+                tipo_match = article.get('tipo_match', 'exacto')
+                tipos[tipo_match] = tipos.get(tipo_match, 0) + 1
+                finding = self._finding_for(scope, incremental, source, article, contenido, search_query, keywords)
+                if finding is None:
+                    continue
+                yield orden, source, finding
+                
+                if top_n and finding['relevancia'] >= min_relevance:
+                    suficientes += 1
+                    if suficientes >= top_n:
+                        print(f"\n⏹️  {suficientes} hallazgos con relevancia >= {min_relevance}: búsqueda detenida")
+                        break
+        finally:
+            contenidos.close()
+        
+        self._print_match_summary(tipos)
+    
+    def _seen_scope(self, search_query: str, keywords: Optional[List[str]], incremental: bool) -> Optional[str]:
+        """Ámbito de la búsqueda en seen_index (None sin índice de vistos)"""
+        if incremental and self.seen_index is None:
+            raise ValueError("El modo incremental necesita un seen_index")
+        return search_scope(search_query, keywords) if self.seen_index is not None else None
+    
+    def _finding_for(self, scope: Optional[str], incremental: bool, source: Dict, article: Dict, contenido: str,
+                     search_query: str, keywords: Optional[List[str]] = None,
+                     relevancia_completa: Optional[float] = None) -> Optional[Dict]:
+        """
+        Etapa de re-puntuación, común a los motores síncrono y asíncrono: registra el
+        contenido en seen_index y construye el hallazgo del artículo
+        Retorna None si pierde relevancia o, en modo incremental, si no ha cambiado
+        relevancia_completa: score ya calculado por lotes (ver _content_scores)
+        """
+        novedad = 'nuevo'
+        if scope is not None and article.get('url') and contenido:
+            novedad = self.seen_index.record(scope, article['url'], contenido)
+        if incremental and novedad == 'sin_cambios':
+            return None
+        
+        finding = self._build_finding(source, article, contenido, search_query, keywords, relevancia_completa)
+        if finding is not None and incremental:
+            finding['novedad'] = novedad
+        return finding
+    
+    def _skip_seen(self, sources: Iterable[Tuple[int, Dict]], scope: str,
+                   incremental: bool) -> Iterator[Tuple[int, Dict]]:
+        """
+        Etapa del índice de vistos: registra en seen_index los artículos de cada fuente
+        y, en modo incremental, deja solo los nuevos o los que toca volver a comprobar
+        """
+        for i, source in sources:
+            articulos = source['articulos'] if source['estado'] == 'completado' else []
+            pendientes = set(self.seen_index.pending(scope, [article.get('url') for article in articulos]))
+            if incremental and articulos:
+                nuevos = [article for article in articulos if not article.get('url') or article['url'] in pendientes]
+                source['articulos'] = nuevos
+                source['articulos_ya_vistos'] = len(articulos) - len(nuevos)
+                print(f"  🗂️  {source['nombre_fuente']}: {len(nuevos)} artículos nuevos o por revisar, "
+                      f"{source['articulos_ya_vistos']} ya vistos")
+            yield i, source
+    
+    def _complete_sources(self, sources_results: List[Optional[Dict]]) -> List[Dict]:
+        """Resultados por fuente, marcando como 'omitida' las que no llegaron a scrapearse"""
+        return [result if result is not None else {
+            'fuente': url,
+            'nombre_fuente': urlparse(url).netloc,
+            'estado': 'omitida',
+            'articulos_encontrados': 0,
+            'articulos': []
+        } for url, result in zip(self.SOURCES, sources_results)]
+    
+    def _compile_search_result(self, search_query: str, sources_results: List[Dict], all_findings: List[Dict],
+                               compact: bool = False) -> Union[Dict, SearchResult]:
+        """
+        Ordena los hallazgos y arma el diccionario final del resultado
+        Con compact, un SearchResult que solo genera el diccionario al serializarlo
+        """
         # Ordenar por relevancia
         all_findings.sort(key=lambda x: x.get('relevancia', 0), reverse=True)
+        if compact:
+            return SearchResult(search_query, len(self.SOURCES), sources_results, all_findings, self.string_pool)
         
         # Agrupar por fuente para análisis periodístico
-        fuentes_unicas = {}
+        summary = FindingsSummary()
         for hallazgo in all_findings:
-            fuente_nombre = hallazgo['fuente']
-            if fuente_nombre not in fuentes_unicas:
-                fuentes_unicas[fuente_nombre] = {
-                    'nombre': fuente_nombre,
-                    'url_base': hallazgo['url_fuente'],
-                    'total_articulos': 0,
-                    'articulos': []
-                }
-            fuentes_unicas[fuente_nombre]['total_articulos'] += 1
-            fuentes_unicas[fuente_nombre]['articulos'].append({
-                'titulo': hallazgo['titulo'],
-                'url': hallazgo['url'],
-                'fecha': hallazgo['fecha']
-            })
+            summary.add(hallazgo)
         
-        # Crear resumen periodístico
-        resumen_periodistico = {
-            'tema_principal': search_query,
-            'total_fuentes_consultadas': len(self.SOURCES),
-            'fuentes_exitosas': sum(1 for s in sources_results if s['estado'] == 'completado'),
-            'total_articulos': len(all_findings),
-            'fuentes_unicas': len(fuentes_unicas),
-            'cobertura_temporal': {
-                'mas_reciente': max([h['fecha'] for h in all_findings if h['fecha']], default=''),
-                'mas_antigua': min([h['fecha'] for h in all_findings if h['fecha']], default='')
-            },
-            'perspectivas': list(fuentes_unicas.keys())  # Diferentes perspectivas/medios
-        }
+        return self._result_dict(search_query, sources_results, summary, all_findings)
+    
+    def _result_dict(self, search_query: str, sources_results: List[Dict], summary: FindingsSummary,
+                     all_findings: Optional[List[Dict]] = None) -> Dict:
+        """
+        Diccionario del resultado a partir de los agregados de los hallazgos
+        Sin all_findings (modo streaming) se omite la lista de hallazgos y el
+        detalle por fuente se reduce a su estado y número de artículos
+        """
+        if all_findings is None:
+            sources_results = [self._source_status(s) for s in sources_results]
+        return result_dict(search_query, len(self.SOURCES), sources_results, summary, all_findings)
+    
+    def _source_status(self, result: Dict) -> Dict:
+        """Resultado de una fuente sin la lista de artículos"""
+        return {key: result[key] for key in ('fuente', 'nombre_fuente', 'estado', 'articulos_encontrados') if key in result}
+    
+    def iter_search_results(self, search_query: str, keywords: Optional[List[str]] = None,
+                            progress: Optional[Callable[[str, Dict], None]] = None,
+                            top_n: Optional[int] = None, min_relevance: float = 0,
+                            incremental: bool = False) -> Iterator[Dict]:
+        """
+        Versión en streaming de generate_search_result
+        Emite cada hallazgo en cuanto su contenido se ha extraído y puntuado, sin
+        guardar la lista completa (la memoria no crece con el tamaño del resultado)
         
-        return {
-            'busqueda_realizada': search_query,
-            'timestamp': datetime.now().isoformat(),
-            'resumen_periodistico': resumen_periodistico,
-            'total_fuentes_consultadas': len(self.SOURCES),
-            'fuentes_exitosas': sum(1 for s in sources_results if s['estado'] == 'completado'),
-            'total_hallazgos': len(all_findings),
-            'hallazgos': all_findings,
-            'fuentes_agrupadas': list(fuentes_unicas.values()),  # Agrupado por fuente para análisis
-            'detalle_por_fuente': sources_results,
-            'advertencia_legal': {
-                'mensaje': 'Este contenido debe usarse respetando derechos de autor y términos de servicio',
-                'uso_ia': 'Si se usa para generar noticias con IA, siempre citar las fuentes originales',
-                'fuentes': [s['fuente'] for s in sources_results if s['estado'] == 'completado']
-            },
-            'nota_para_periodista_ia': {
-                'instrucciones': 'Usa esta información para escribir un artículo periodístico profesional',
-                'verificacion_cruzada': f'Consulta múltiples fuentes ({len(fuentes_unicas)} fuentes únicas disponibles)',
-                'citacion': 'Cita siempre las fuentes originales usando los campos "cita_formato" o "cita_corta"',
-                'contexto_temporal': f'Artículos desde {resumen_periodistico["cobertura_temporal"]["mas_antigua"]} hasta {resumen_periodistico["cobertura_temporal"]["mas_reciente"]}',
-                'perspectivas_disponibles': resumen_periodistico['perspectivas']
-            }
-        }
+        Yields:
+            Eventos {'evento': ..., 'datos': ...}:
+            - 'fuente': estado de cada fuente en cuanto termina su scraping
+            - 'hallazgo': un hallazgo (mismo formato que en generate_search_result)
+            - 'resumen': el resultado final sin la lista de hallazgos
+        """
+        self._print_legal_warning()
+        
+        sources_results = [None] * len(self.SOURCES)
+        summary = FindingsSummary(keep_articles=False)
+        for orden, source, finding in self._search_pipeline(search_query, keywords, progress, top_n, min_relevance,
+                                                            incremental):
+            if finding is None:
+                sources_results[orden[0]] = source
+                yield {'evento': 'fuente', 'datos': self._source_status(source)}
+            else:
+                summary.add(finding)
+                yield {'evento': 'hallazgo', 'datos': finding}
+        
+        sources_results = self._complete_sources(sources_results)
+        yield {'evento': 'resumen', 'datos': self._result_dict(search_query, sources_results, summary)}
     
-    def save_results(self, data: Dict, filename: str = 'news_results.json'):
-        """Guarda los resultados en JSON en la carpeta 'resultados'"""
-        # Crear carpeta resultados si no existe
+    def save_results(self, data: Union[Dict, SearchResult], filename: str = 'news_results.json'):
+        """
+        Guarda los resultados en JSON en la carpeta 'resultados'
+        Se escriben por trozos con el serializador del scraper (ver result_serializer)
+        en un archivo temporal que después sustituye al final: dos búsquedas que
+        guardan el mismo archivo a la vez no mezclan su contenido
+        """
+        # Crear carpeta resultados si no existe (exist_ok: varias búsquedas a la vez)
         resultados_dir = 'resultados'
-        if not os.path.exists(resultados_dir):
-            os.makedirs(resultados_dir)
+        os.makedirs(resultados_dir, exist_ok=True)
         
         # Guardar en la carpeta resultados
         filepath = os.path.join(resultados_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        fd, temporal = tempfile.mkstemp(dir=resultados_dir, prefix=filename + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self.serializer.dump(data, f)
+            os.replace(temporal, filepath)
+        except BaseException:
+            os.remove(temporal)
+            raise
         print(f"\n💾 Resultados guardados en: {filepath}")
@@ -0,0 +1,80 @@
+"""
+Pool de procesos para el parseo de HTML
+Con las descargas en paralelo, el cuello de botella pasa a ser la CPU: construir el
+árbol (BeautifulSoup o lxml) y recorrerlo con los selectores retiene el GIL, así que
+los hilos de descarga se turnan para parsear y solo se aprovecha un núcleo.
+Con un ParsePool los hilos solo descargan: pasan el HTML crudo a procesos de
+parseo, que devuelven registros ya extraídos (candidatos o texto), nunca árboles
+
+- Cada proceso crea al arrancar un scraper de la misma clase y parser que los que
+  lo usan, así que la extracción es exactamente la misma que en los hilos
+- Los candidatos son NamedTuple (Candidate): viajan como tuplas, sin repetir las
+  claves en cada uno
+- Los procesos se arrancan con 'spawn': un fork de un proceso con hilos en marcha
+  puede heredar locks tomados por otros hilos. Cada proceso importa el script
+  principal, que debe arrancar la búsqueda bajo if __name__ == "__main__"
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from article_selectors import Candidate
+
+
+# Scraper del proceso de parseo (lo crea _init_worker al arrancar el proceso)
+_scraper = None
+
+
+def _init_worker(scraper_class, parser: str):
+    global _scraper
+    _scraper = scraper_class(parser=parser, max_workers=1, content_workers=1)
+
+
+def _parse_candidates(content: bytes, base_url: str) -> List[Candidate]:
+    """Candidatos sin filtrar de una página"""
+    return _scraper.parse_candidates(content, base_url)
+
+
+def _parse_content(content: bytes) -> str:
+    """Texto principal de la página de un artículo"""
+    return _scraper.parse_content(content)
+
+
+class ParsePool:
+    """Procesos de parseo compartidos por los hilos de descarga de uno o varios scrapers"""
+    
+    def __init__(self, scraper_class, parser: str = 'lxml', processes: Optional[int] = None):
+        """
+        Args:
+            scraper_class: Clase de los scrapers que lo usan (NewsSourcesScraper o una subclase)
+            parser: Backend de parseo de los scrapers
+            processes: Procesos de parseo (por defecto uno por núcleo)
+        """
+        self.parser = parser
+        self.processes = processes or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(scraper_class, parser)
+        )
+    
+    def candidates(self, content: bytes, base_url: str) -> List[Candidate]:
+        """Parsea una página en un proceso y retorna sus candidatos (ver extract_candidates)"""
+        return self._executor.submit(_parse_candidates, content, base_url).result()
+    
+    def content(self, content: bytes) -> str:
+        """Parsea la página de un artículo en un proceso y retorna su texto principal"""
+        return self._executor.submit(_parse_content, content).result()
+    
+    def close(self):
+        """Detiene los procesos de parseo (espera a los parseos en curso)"""
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self) -> 'ParsePool':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -57,9 +57,9 @@ def probar_fuente(url: str, tema: str = None, keywords: list = None):
     try:
         # Probar acceso básico primero
         print(f"🔍 Probando acceso a la URL...")
-        soup = scraper.fetch_page(url, check_robots=False)  # Ya verificamos robots.txt arriba
+        content = scraper.fetch_content(url, check_robots=False)  # Ya verificamos robots.txt arriba
         
-        if soup is None:
+        if content is None:
             print(f"\n❌ No se pudo acceder a la URL")
             print(f"   Esto significa que:")
             print(f"   - El sitio bloquea el scraper (Connection reset)")
@@ -123,7 +123,7 @@ def probar_fuente(url: str, tema: str = None, keywords: list = None):
             print(f"\n❌ RECOMENDACIÓN: No se recomienda agregar esta fuente")
         
         return resultado['articulos_encontrados'] > 0 and puede_acceder
-        
+    
     except Exception as e:
         print(f"\n❌ Error durante la prueba: {str(e)}")
         import traceback
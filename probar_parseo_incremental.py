@@ -0,0 +1,81 @@
+"""
+Prueba del parseo incremental de artículos (incremental_parse, ver lxml_extractor.ContentFeed)
+Lee páginas de ejemplo por trozos, como extract_article_content, y comprueba para cada una:
+- cuántos bytes se dejan sin leer (la lectura debe cortarse donde se indica)
+- que el texto extraído es el mismo que con la página entera
+
+Uso:
+    python probar_parseo_incremental.py
+"""
+
+import sys
+
+import lxml_extractor
+from news_sources_scraper import ENCODING_PREFIX_BYTES, STREAM_CHUNK_SIZE, IncrementalPage
+
+
+PARRAFO = "<p>La inteligencia artificial ayuda a detectar enfermedades en hospitales públicos. " * 3 + "</p>\n"
+RELLENO = ('<div class="relacionados"><a href="/otra">Otra noticia relacionada</a>'
+           '<p>' + 'Texto de la barra lateral que no forma parte del artículo. ' * 4 + '</p></div>\n')
+
+
+def pagina(cuerpo: str) -> bytes:
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Noticia</title></head><body>\n' +
+            cuerpo + RELLENO * 2000 + '</body></html>').encode('utf-8')
+
+
+# (nombre, página, marcador: la lectura debe cortarse antes de él; None = leer entera)
+# Nada se parsea antes de reunir ENCODING_PREFIX_BYTES, así que ese es el corte más temprano
+CASOS = [
+    # Artículo largo dentro de un <div> que lo envuelve: el div sigue abierto cuando
+    # ya hay MAX_CONTENT_CHARS de texto definitivo
+    ('artículo largo envuelto en un <div>',
+     pagina('<article><div class="cuerpo">\n' + PARRAFO * 2000 + '</div></article>\n'), '</article>'),
+    ('artículo largo sin envoltorio',
+     pagina('<article>\n' + PARRAFO * 600 + '</article>\n'), '</article>'),
+    # Artículo corto: se corta al cerrarse el <article>, sin leer la barra lateral
+    ('artículo corto envuelto en un <div>',
+     pagina('<article><div class="cuerpo">\n' + PARRAFO * 5 + '</div></article>\n'), RELLENO),
+    # Sin <article> hacen falta los demás selectores: se lee entera
+    ('sin <article>', pagina('<div class="article-content">\n' + PARRAFO * 20 + '</div>\n'), None),
+]
+
+
+def leer_por_trozos(contenido: bytes) -> tuple:
+    """Lectura de _stream_article_content: (bytes leídos, texto extraído)"""
+    page = IncrementalPage(max_bytes=len(contenido) + 1)
+    for inicio in range(0, len(contenido), STREAM_CHUNK_SIZE):
+        if page.add(contenido[inicio:inicio + STREAM_CHUNK_SIZE]):
+            break
+    return page.total, page.text()
+
+
+def main() -> int:
+    print("=" * 70)
+    print("   🧪 PRUEBA DEL PARSEO INCREMENTAL")
+    print("=" * 70)
+    
+    resultados = []
+    for nombre, contenido, marcador in CASOS:
+        leidos, texto = leer_por_trozos(contenido)
+        esperado = lxml_extractor.extract_content(lxml_extractor.parse_html(contenido))
+        
+        limite = max(contenido.index(marcador.encode('utf-8')), ENCODING_PREFIX_BYTES) if marcador else len(contenido)
+        corte_ok = leidos <= limite if marcador else leidos >= len(contenido)
+        texto_ok = bool(texto) and texto == esperado
+        resultados.append(corte_ok and texto_ok)
+        
+        print(f"\n📄 {nombre}")
+        print(f"  {'✅' if corte_ok else '❌'} {leidos // 1024}/{len(contenido) // 1024} KB leídos, "
+              f"{max(len(contenido) - leidos, 0) // 1024} KB sin leer"
+              f"{f' (corte esperado antes del byte {limite})' if marcador else ' (debe leerse entera)'}")
+        print(f"  {'✅' if texto_ok else '❌'} Mismo texto que con la página entera ({len(texto)} caracteres)")
+    
+    ok = all(resultados)
+    print(f"\n{'✅ Todas las comprobaciones pasan' if ok else '❌ Hay comprobaciones que fallan'}")
+    print(f"{'='*70}\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
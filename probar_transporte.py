@@ -0,0 +1,200 @@
+"""
+Prueba del transporte HTTP del scraper (ver http_transport) contra un servidor local
+Comprueba, con el adaptador HTTP/1.1 y con el de httpx (HTTP/2 si está instalado):
+- stream=True: el cuerpo llega por partes antes de que el servidor termine de enviarlo
+- stream=True y stream=False dan el mismo contenido
+- Parseo incremental (incremental_parse): la lectura se corta en cuanto el artículo
+  está completo, sin descargar el resto de la página, y el texto es el mismo que
+  con la página entera
+- Cookies: los Set-Cookie de una redirección y de la respuesta final quedan en la
+  sesión, y la petición redirigida ya envía la cookie recibida
+
+El servidor local es HTTP sin TLS: httpx con http2=True negocia HTTP/2 solo por
+TLS (ALPN), así que aquí la conexión es HTTP/1.1, pero el camino del adaptador
+(HTTPXAdapter, streaming y cierre de la respuesta) es el mismo
+
+Uso:
+    python probar_transporte.py
+"""
+
+import contextlib
+import io
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import http_transport
+import lxml_extractor
+from news_sources_scraper import NewsSourcesScraper
+
+
+# Páginas del servidor: trozos de TROZO bytes con una pausa de PAUSA segundos entre ellos
+TROZO = 32 * 1024
+PAUSA = 0.02
+
+PARRAFO = "<p>" + "La inteligencia artificial ayuda a detectar enfermedades en hospitales. " * 4 + "</p>\n"
+RELLENO = ('<div class="relacionados"><a href="/otra">Otra noticia relacionada</a>'
+           '<p>' + 'Texto de la barra lateral que no forma parte del artículo. ' * 4 + '</p></div>\n')
+
+PAGINAS = {
+    '/lento': b'x' * (TROZO * 24),
+    '/articulo': ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Noticia</title></head><body>\n'
+                  '<article><h1>Noticia</h1>\n' + PARRAFO * 6 + '</article>\n' +
+                  RELLENO * 4000 + '</body></html>').encode('utf-8'),
+}
+
+
+class ServidorLento(BaseHTTPRequestHandler):
+    """Sirve PAGINAS por trozos y anota cuántos bytes llegó a enviar de cada una"""
+    
+    enviados = {}
+    
+    def do_GET(self):
+        if self.path == '/cookie':
+            # Redirección que fija una cookie
+            self.send_response(302)
+            self.send_header('Set-Cookie', 'redireccion=1; Path=/')
+            self.send_header('Location', '/cookie-fin')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/cookie-fin':
+            # Fija otra cookie y devuelve las que ha recibido
+            recibidas = (self.headers.get('Cookie') or '').encode('utf-8')
+            self.send_response(200)
+            self.send_header('Set-Cookie', 'final=2; Path=/')
+            self.send_header('Content-Length', str(len(recibidas)))
+            self.end_headers()
+            self.wfile.write(recibidas)
+            return
+        
+        contenido = PAGINAS.get(self.path)
+        if contenido is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(contenido)))
+        self.end_headers()
+        self.enviados[self.path] = 0
+        try:
+            for inicio in range(0, len(contenido), TROZO):
+                self.wfile.write(contenido[inicio:inicio + TROZO])
+                self.wfile.flush()
+                self.enviados[self.path] = inicio + TROZO
+                time.sleep(PAUSA)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # El cliente cortó la lectura
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def comprobar(nombre: str, ok: bool, detalle: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {nombre}{f' ({detalle})' if detalle else ''}")
+    return ok
+
+
+def probar_adaptador(nombre: str, adapter, base_url: str) -> bool:
+    """Streaming y contenido completo con un adaptador montado en una sesión de requests"""
+    print(f"\n🔌 {nombre}")
+    session = requests.Session()
+    session.mount('http://', adapter)
+    url = base_url + '/lento'
+    total = len(PAGINAS['/lento'])
+    resultados = []
+    
+    try:
+        with session.get(url, stream=True, timeout=20) as response:
+            chunks = response.iter_content(chunk_size=TROZO)
+            primero = next(chunks)
+            enviados_al_primero = ServidorLento.enviados.get('/lento', 0)
+            recibido = primero + b''.join(chunks)
+        resultados.append(comprobar("stream=True lee por partes", enviados_al_primero < total,
+                                    f"primer trozo con {enviados_al_primero // 1024}/{total // 1024} KB enviados"))
+        
+        completo = session.get(url, timeout=20).content
+        resultados.append(comprobar("stream=True y stream=False dan el mismo cuerpo",
+                                    recibido == completo == PAGINAS['/lento'], f"{len(recibido)} bytes"))
+        
+        enviadas = session.get(base_url + '/cookie', timeout=20).text
+        guardadas = session.cookies.get_dict()
+        resultados.append(comprobar("cookies de la redirección y de la respuesta final en la sesión",
+                                    guardadas == {'redireccion': '1', 'final': '2'}, str(guardadas)))
+        resultados.append(comprobar("la petición redirigida envía la cookie recibida",
+                                    enviadas == 'redireccion=1', f"Cookie: {enviadas or '(ninguna)'}"))
+        
+        otra = requests.Session()
+        otra.mount('http://', adapter)
+        try:
+            enviadas = otra.get(base_url + '/cookie-fin', timeout=20).text
+        finally:
+            otra.close()
+        resultados.append(comprobar("otra sesión con el mismo adaptador no envía esas cookies",
+                                    enviadas == '', f"Cookie: {enviadas or '(ninguna)'}"))
+    finally:
+        session.close()
+    return all(resultados)
+
+
+def probar_lectura_incremental(http2: bool, base_url: str) -> bool:
+    """extract_article_content con incremental_parse corta la descarga en cuanto termina el artículo"""
+    print(f"\n✂️  Parseo incremental ({'httpx, http2=True' if http2 else 'HTTP/1.1'})")
+    scraper = NewsSourcesScraper(parser='lxml-fast', incremental_parse=True, http2=http2)
+    url = base_url + '/articulo'
+    total = len(PAGINAS['/articulo'])
+    
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            texto = scraper.extract_article_content(url)
+        time.sleep(PAUSA * 5)  # El servidor nota el corte en su siguiente escritura
+    finally:
+        scraper.session.close()
+    
+    esperado = lxml_extractor.extract_content(lxml_extractor.parse_html(PAGINAS['/articulo']))
+    enviados = ServidorLento.enviados.get('/articulo', total)
+    return all([
+        comprobar("lectura cortada antes del final", 'Lectura cortada' in salida.getvalue() and enviados < total,
+                  f"{enviados // 1024}/{total // 1024} KB enviados"),
+        comprobar("mismo texto que con la página entera", bool(texto) and texto == esperado, f"{len(texto)} caracteres"),
+    ])
+
+
+def main() -> int:
+    print("=" * 70)
+    print("   🧪 PRUEBA DEL TRANSPORTE HTTP")
+    print("=" * 70)
+    
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorLento)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    
+    try:
+        resultados = [
+            probar_adaptador("HTTPAdapter (HTTP/1.1)", http_transport.build_http_adapter(), base_url),
+            probar_lectura_incremental(False, base_url),
+        ]
+        if http_transport.httpx is None:
+            print("\n⏭️  httpx no está instalado: se omite HTTPXAdapter (pip install 'httpx[http2]')")
+        else:
+            resultados += [
+                probar_adaptador("HTTPXAdapter (httpx, http2=True)", http_transport.HTTPXAdapter(http2=True), base_url),
+                probar_lectura_incremental(True, base_url),
+            ]
+    finally:
+        servidor.shutdown()
+    
+    ok = all(resultados)
+    print(f"\n{'✅ Todas las comprobaciones pasan' if ok else '❌ Hay comprobaciones que fallan'}")
+    print(f"{'='*70}\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Serialización a JSON de los resultados (archivos y respuestas de la API)
+Un resultado con cientos de hallazgos (hasta 10 KB de contenido cada uno, más el
+detalle por fuente) tardaba en serializarse con json.dump(indent=2) y jsonify lo
+convertía entero en una sola cadena antes de enviarlo
+
+- Backend intercambiable: orjson si está instalado (mucho más rápido), si no el
+  módulo json; la salida es la misma con los dos (salvo la notación de algunos
+  reales: 1e-7 con orjson, 1e-07 con json)
+- iter_encode genera el JSON por trozos de ~64 KB: los diccionarios y listas de los
+  primeros niveles se recorren elemento a elemento, así que nunca se construye la
+  cadena completa. Sirve para escribir en disco (dump) y como cuerpo de una
+  respuesta de Flask
+- Los generadores se serializan como listas a medida que se recorren: un
+  SearchResult (ver result_store) se serializa sin generar antes todos sus hallazgos
+- indent=None: modo compacto, sin saltos de línea ni espacios (una línea por
+  evento en NDJSON y SSE)
+"""
+
+import json
+from typing import IO, Any, Iterator, Optional
+
+from result_store import SearchResult
+
+try:
+    import orjson
+except ImportError:  # Opcional: sin orjson se usa el módulo json
+    orjson = None
+
+
+# Tamaño aproximado de cada trozo de iter_encode
+CHUNK_SIZE = 64 * 1024
+
+# Niveles de diccionarios y listas que se recorren elemento a elemento (los más
+# profundos, como cada hallazgo de un resultado, se codifican de una vez)
+STREAM_DEPTH = 2
+
+
+class ResultSerializer:
+    """Codificador JSON de resultados con backend json u orjson"""
+    
+    BACKENDS = ('auto', 'json', 'orjson')
+    
+    def __init__(self, indent: Optional[int] = 2, backend: str = 'auto'):
+        """
+        Args:
+            indent: Espacios de sangría (None = compacto; orjson solo admite 2)
+            backend: 'orjson', 'json' o 'auto' (orjson si está instalado y admite la sangría)
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend no soportado: {backend} (opciones: {', '.join(self.BACKENDS)})")
+        orjson_indent = indent in (None, 2)
+        if backend == 'orjson':
+            if orjson is None:
+                raise ImportError("El backend 'orjson' necesita orjson (pip install orjson)")
+            if not orjson_indent:
+                raise ValueError("orjson solo admite indent=2 o el modo compacto (indent=None)")
+        elif backend == 'auto':
+            backend = 'orjson' if orjson is not None and orjson_indent else 'json'
+        self.backend = backend
+        self.indent = indent
+        separators = None if indent else (',', ':')
+        self._json = json.JSONEncoder(ensure_ascii=False, indent=indent, separators=separators)
+    
+    def dumps(self, obj: Any) -> bytes:
+        """JSON completo de obj (UTF-8); para resultados grandes, mejor iter_encode o dump"""
+        return b''.join(self.iter_encode(obj))
+    
+    def dump(self, obj: Any, f: IO[bytes]):
+        """Escribe el JSON de obj en un archivo binario, trozo a trozo"""
+        for chunk in self.iter_encode(obj):
+            f.write(chunk)
+    
+    def iter_encode(self, obj: Any) -> Iterator[bytes]:
+        """JSON de obj en trozos de ~CHUNK_SIZE bytes (un SearchResult se serializa como su to_dict)"""
+        buffer = []
+        size = 0
+        for piece in self._pieces(obj, 0):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b''.join(buffer)
+    
+    def _encode(self, value: Any, level: int) -> bytes:
+        """Un valor codificado de una vez, con la sangría del nivel en el que va"""
+        if self.backend == 'orjson':
+            encoded = orjson.dumps(value, option=orjson.OPT_INDENT_2 if self.indent else 0)
+        else:
+            encoded = self._json.encode(value).encode('utf-8')
+        if self.indent and level:
+            # Las cadenas JSON no tienen saltos de línea literales: solo se sangran líneas de la estructura
+            encoded = encoded.replace(b'\n', b'\n' + b' ' * (self.indent * level))
+        return encoded
+    
+    def _pieces(self, value: Any, level: int) -> Iterator[bytes]:
+        if isinstance(value, SearchResult):
+            value = value.to_dict(lazy=True)
+        
+        if isinstance(value, dict) and value and level < STREAM_DEPTH:
+            items = ((self._encode(str(key), 0) + (b': ' if self.indent else b':'), item)
+                     for key, item in value.items())
+            yield from self._container(b'{', b'}', items, level)
+        elif isinstance(value, (list, tuple)) and value and level < STREAM_DEPTH:
+            yield from self._container(b'[', b']', ((b'', item) for item in value), level)
+        elif isinstance(value, Iterator):
+            # Generadores a cualquier nivel (los backends no los admiten)
+            yield from self._container(b'[', b']', ((b'', item) for item in value), level)
+        else:
+            yield self._encode(value, level)
+    
+    def _container(self, open_: bytes, close: bytes, items: Iterator, level: int) -> Iterator[bytes]:
+        """Diccionario o lista elemento a elemento; items da (prefijo de clave, valor)"""
+        if self.indent:
+            separator = b',\n' + b' ' * (self.indent * (level + 1))
+            first = b'\n' + b' ' * (self.indent * (level + 1))
+            end = b'\n' + b' ' * (self.indent * level) + close
+        else:
+            separator = b','
+            first = b''
+            end = close
+        
+        yield open_
+        empty = True
+        for prefix, item in items:
+            yield (first if empty else separator) + prefix
+            empty = False
+            yield from self._pieces(item, level + 1)
+        yield close if empty else end
@@ -0,0 +1,371 @@
+"""
+Almacén compacto de resultados de búsqueda
+Un resultado como diccionario repite los mismos datos varias veces: cada hallazgo
+lleva su fuente, url_fuente, cita_formato y cita_corta, y sus artículos vuelven a
+aparecer en fuentes_agrupadas y detalle_por_fuente. En lotes de cientos de temas
+(o con los 200 trabajos terminados de la API) la memoria crece deprisa
+
+- StringPool: internado de las cadenas que se repiten entre hallazgos y búsquedas
+  (fuentes, sus URLs, estados, tipo_match, novedad) con un código entero para cada una
+- SearchResult: los hallazgos de una búsqueda por columnas. Las de texto guardan
+  referencias a las mismas cadenas que los artículos del detalle por fuente, y las
+  de fuente y tipo de coincidencia códigos del StringPool en array('I').
+  cita_formato, cita_corta, fuentes_agrupadas y el resumen no se guardan: los
+  calcula to_dict, que genera el diccionario de siempre al serializar
+- ResultStore: lote de búsquedas con un StringPool común; con pyarrow instalado,
+  to_arrow / write_parquet vuelcan todos sus hallazgos a una tabla (las columnas de
+  fuente y tipo de coincidencia como diccionarios de Arrow, con los mismos códigos)
+"""
+
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Opcional: sin pyarrow no hay exportación a Arrow/Parquet
+    pyarrow = None
+
+
+# Campos de texto de un hallazgo, compartidos con el artículo del que sale
+FINDING_TEXT_FIELDS = ('titulo', 'url', 'descripcion', 'contenido', 'imagen', 'fecha')
+
+# Campos de las fuentes y sus artículos con pocos valores distintos (se internan)
+INTERNED_FIELDS = ('fuente', 'nombre_fuente', 'estado', 'tipo_match')
+
+
+class FindingsSummary:
+    """
+    Agregados de los hallazgos de una búsqueda (por fuente y cobertura temporal)
+    Se acumulan de uno en uno, así sirven también para el modo streaming
+    """
+    
+    def __init__(self, keep_articles: bool = True):
+        self.keep_articles = keep_articles  # Guardar título/url/fecha de cada artículo por fuente
+        self.fuentes = {}
+        self.total = 0
+        self.mas_reciente = ''
+        self.mas_antigua = ''
+    
+    def add(self, hallazgo: Dict):
+        self.total += 1
+        fuente_nombre = hallazgo['fuente']
+        if fuente_nombre not in self.fuentes:
+            self.fuentes[fuente_nombre] = {
+                'nombre': fuente_nombre,
+                'url_base': hallazgo['url_fuente'],
+                'total_articulos': 0
+            }
+            if self.keep_articles:
+                self.fuentes[fuente_nombre]['articulos'] = []
+        self.fuentes[fuente_nombre]['total_articulos'] += 1
+        if self.keep_articles:
+            self.fuentes[fuente_nombre]['articulos'].append({
+                'titulo': hallazgo['titulo'],
+                'url': hallazgo['url'],
+                'fecha': hallazgo['fecha']
+            })
+        
+        fecha = hallazgo['fecha']
+        if fecha:
+            self.mas_reciente = max(self.mas_reciente, fecha) if self.mas_reciente else fecha
+            self.mas_antigua = min(self.mas_antigua, fecha) if self.mas_antigua else fecha
+
+
+def result_dict(search_query: str, total_fuentes: int, sources_results: List[Dict], summary: FindingsSummary,
+                all_findings: Optional[Iterable[Dict]] = None, timestamp: Optional[str] = None) -> Dict:
+    """
+    Diccionario del resultado a partir de los agregados de los hallazgos
+    Sin all_findings (modo streaming) se omite la lista de hallazgos
+    """
+    fuentes_exitosas = sum(1 for s in sources_results if s['estado'] == 'completado')
+    
+    # Crear resumen periodístico
+    resumen_periodistico = {
+        'tema_principal': search_query,
+        'total_fuentes_consultadas': total_fuentes,
+        'fuentes_exitosas': fuentes_exitosas,
+        'total_articulos': summary.total,
+        'fuentes_unicas': len(summary.fuentes),
+        'cobertura_temporal': {
+            'mas_reciente': summary.mas_reciente,
+            'mas_antigua': summary.mas_antigua
+        },
+        'perspectivas': list(summary.fuentes.keys())  # Diferentes perspectivas/medios
+    }
+    
+    resultado = {
+        'busqueda_realizada': search_query,
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'resumen_periodistico': resumen_periodistico,
+        'total_fuentes_consultadas': total_fuentes,
+        'fuentes_exitosas': fuentes_exitosas,
+        'total_hallazgos': summary.total
+    }
+    if all_findings is not None:
+        resultado['hallazgos'] = all_findings
+    resultado['fuentes_agrupadas'] = list(summary.fuentes.values())  # Agrupado por fuente para análisis
+    resultado['detalle_por_fuente'] = sources_results
+    
+    resultado['advertencia_legal'] = {
+        'mensaje': 'Este contenido debe usarse respetando derechos de autor y términos de servicio',
+        'uso_ia': 'Si se usa para generar noticias con IA, siempre citar las fuentes originales',
+        'fuentes': [s['fuente'] for s in sources_results if s['estado'] == 'completado']
+    }
+    resultado['nota_para_periodista_ia'] = {
+        'instrucciones': 'Usa esta información para escribir un artículo periodístico profesional',
+        'verificacion_cruzada': f'Consulta múltiples fuentes ({len(summary.fuentes)} fuentes únicas disponibles)',
+        'citacion': 'Cita siempre las fuentes originales usando los campos "cita_formato" o "cita_corta"',
+        'contexto_temporal': f'Artículos desde {summary.mas_antigua} hasta {summary.mas_reciente}',
+        'perspectivas_disponibles': resumen_periodistico['perspectivas']
+    }
+    return resultado
+
+
+class StringPool:
+    """
+    Cadenas internadas con un código entero cada una (el código 0 es None)
+    Solo para valores que se repiten mucho: crece con las fuentes, no con los artículos
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = [None]
+        self._codes = {}
+        self._schemas = {}  # Tuplas de claves de los registros empaquetados
+    
+    def code(self, value: Optional[str]) -> int:
+        """Código de la cadena (la añade la primera vez)"""
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+    
+    def value(self, code: int) -> Optional[str]:
+        return self._values[code]
+    
+    def intern(self, value):
+        """La copia compartida de una cadena (el propio valor si no es una cadena)"""
+        if not isinstance(value, str):
+            return value
+        return self._values[self.code(value)]
+    
+    def schema(self, keys: Tuple[str, ...]) -> Tuple[str, ...]:
+        """La copia compartida de una tupla de claves"""
+        with self._lock:
+            return self._schemas.setdefault(keys, keys)
+    
+    def values(self) -> List[Optional[str]]:
+        """Las cadenas en orden de código (copia)"""
+        with self._lock:
+            return list(self._values)
+    
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+
+class SearchResult:
+    """Resultado de una búsqueda en formato compacto (ver to_dict para el formato completo)"""
+    
+    def __init__(self, search_query: str, total_fuentes: int, sources_results: List[Dict],
+                 findings: List[Dict], pool: Optional[StringPool] = None, timestamp: Optional[str] = None):
+        """
+        Args:
+            search_query: Búsqueda realizada (tema)
+            total_fuentes: Fuentes consultadas
+            sources_results: Resultado de cada fuente, con sus artículos
+            findings: Hallazgos ya ordenados (formato de _build_finding)
+            pool: Cadenas internadas, compartidas con otros resultados (por defecto uno propio)
+            timestamp: Momento de la búsqueda (por defecto ahora)
+        """
+        self.pool = pool if pool is not None else StringPool()
+        self.search_query = search_query
+        self.timestamp = timestamp or datetime.now().isoformat()
+        self.total_fuentes = total_fuentes
+        self._sources = tuple(self._pack(source) for source in sources_results)
+        
+        # Una columna por campo; la fila i es el hallazgo i
+        self._fuente = array('I')
+        self._url_fuente = array('I')
+        self._texto = {campo: [] for campo in FINDING_TEXT_FIELDS}
+        self._relevancia = []  # Los números tal cual (enteros o reales), como en el artículo
+        self._tipo_match = array('I')
+        self._novedad = array('I')  # Solo en modo incremental (0 = sin novedad)
+        for finding in findings:
+            self._fuente.append(self.pool.code(finding['fuente']))
+            self._url_fuente.append(self.pool.code(finding['url_fuente']))
+            for campo, columna in self._texto.items():
+                columna.append(finding[campo])
+            self._relevancia.append(finding['relevancia'])
+            self._tipo_match.append(self.pool.code(finding['tipo_match']))
+            self._novedad.append(self.pool.code(finding.get('novedad')))
+    
+    def _pack(self, record: Dict) -> Tuple:
+        """Registro (fuente o artículo) como (claves, valores), con las cadenas repetidas internadas"""
+        keys = self.pool.schema(tuple(record))
+        values = []
+        for key, value in record.items():
+            if key == 'articulos':
+                value = tuple(self._pack(article) for article in value)
+            elif key in INTERNED_FIELDS:
+                value = self.pool.intern(value)
+            values.append(value)
+        return keys, tuple(values)
+    
+    def _unpack(self, packed: Tuple) -> Dict:
+        keys, values = packed
+        record = dict(zip(keys, values))
+        if 'articulos' in record:
+            record['articulos'] = [self._unpack(article) for article in record['articulos']]
+        return record
+    
+    @property
+    def total_hallazgos(self) -> int:
+        return len(self._relevancia)
+    
+    @property
+    def fuentes_exitosas(self) -> int:
+        return sum(1 for source in self.iter_sources() if source['estado'] == 'completado')
+    
+    def __len__(self) -> int:
+        return self.total_hallazgos
+    
+    def finding(self, index: int) -> Dict:
+        """Hallazgo en el formato de generate_search_result"""
+        nombre_fuente = self.pool.value(self._fuente[index])
+        titulo = self._texto['titulo'][index]
+        url = self._texto['url'][index]
+        finding = {
+            'fuente': nombre_fuente,
+            'url_fuente': self.pool.value(self._url_fuente[index]),
+            'titulo': titulo,
+            'url': url,
+            'descripcion': self._texto['descripcion'][index],
+            'contenido': self._texto['contenido'][index],
+            'imagen': self._texto['imagen'][index],
+            'fecha': self._texto['fecha'][index],
+            'relevancia': self._relevancia[index],
+            'tipo_match': self.pool.value(self._tipo_match[index]),
+            # Información adicional para facilitar citación en IA
+            'cita_formato': f"{nombre_fuente} - {titulo} ({url})",
+            'cita_corta': f"{nombre_fuente}"
+        }
+        if self._novedad[index]:
+            finding['novedad'] = self.pool.value(self._novedad[index])
+        return finding
+    
+    def iter_findings(self) -> Iterator[Dict]:
+        """Hallazgos en orden de relevancia, generados de uno en uno"""
+        for index in range(self.total_hallazgos):
+            yield self.finding(index)
+    
+    def iter_sources(self) -> Iterator[Dict]:
+        """Resultado de cada fuente, con sus artículos"""
+        for packed in self._sources:
+            yield self._unpack(packed)
+    
+    def to_dict(self, lazy: bool = False) -> Dict:
+        """
+        El resultado completo, con el mismo formato que generate_search_result
+        Con lazy, 'hallazgos' es un generador que crea cada hallazgo al recorrerlo (para
+        serializarlo por trozos, ver result_serializer); los agregados se calculan antes
+        con una primera pasada
+        """
+        summary = FindingsSummary()
+        if lazy:
+            for hallazgo in self.iter_findings():
+                summary.add(hallazgo)
+            hallazgos = self.iter_findings()
+        else:
+            hallazgos = list(self.iter_findings())
+            for hallazgo in hallazgos:
+                summary.add(hallazgo)
+        return result_dict(self.search_query, self.total_fuentes, list(self.iter_sources()), summary,
+                           hallazgos, self.timestamp)
+    
+    def to_arrow(self, dictionary: Optional['pyarrow.Array'] = None) -> 'pyarrow.Table':
+        """
+        Hallazgos como tabla de Arrow (sin los campos de cita, que se derivan de fuente, titulo y url)
+        dictionary: Cadenas del StringPool ya convertidas (las comparten todas las tablas de un lote)
+        """
+        if pyarrow is None:
+            raise ImportError("La exportación a Arrow necesita pyarrow (pip install pyarrow)")
+        if dictionary is None:
+            dictionary = _arrow_dictionary(self.pool)
+        
+        def codificada(codes: array) -> 'pyarrow.DictionaryArray':
+            # Los códigos del pool son los índices del diccionario (0 = None = nulo)
+            nulos = pyarrow.array([code == 0 for code in codes], pyarrow.bool_())
+            return pyarrow.DictionaryArray.from_arrays(pyarrow.array(codes, pyarrow.uint32(), mask=nulos), dictionary)
+        
+        columnas = {
+            'busqueda_realizada': pyarrow.array([self.search_query] * self.total_hallazgos, pyarrow.string()),
+            'fuente': codificada(self._fuente),
+            'url_fuente': codificada(self._url_fuente)
+        }
+        for campo, columna in self._texto.items():
+            columnas[campo] = pyarrow.array(columna, pyarrow.string())
+        columnas['relevancia'] = pyarrow.array(self._relevancia, pyarrow.float64())
+        columnas['tipo_match'] = codificada(self._tipo_match)
+        columnas['novedad'] = codificada(self._novedad)
+        return pyarrow.table(columnas)
+
+
+def _arrow_dictionary(pool: StringPool) -> 'pyarrow.Array':
+    """Cadenas del pool como diccionario de Arrow (el código 0 se marca nulo en los índices)"""
+    return pyarrow.array([''] + pool.values()[1:], pyarrow.string())
+
+
+class ResultStore:
+    """Lote de resultados compactos con un StringPool común (búsquedas de muchos temas)"""
+    
+    def __init__(self, pool: Optional[StringPool] = None):
+        self.pool = pool if pool is not None else StringPool()
+        self._lock = threading.Lock()
+        self._results = []
+    
+    def add(self, result: SearchResult):
+        """Añade al lote un resultado (creado con el pool del lote)"""
+        if result.pool is not self.pool:
+            raise ValueError("El resultado no usa el StringPool del lote")
+        with self._lock:
+            self._results.append(result)
+    
+    def results(self) -> List[SearchResult]:
+        with self._lock:
+            return list(self._results)
+    
+    def __iter__(self) -> Iterator[SearchResult]:
+        return iter(self.results())
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+    
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+    
+    def to_arrow(self) -> 'pyarrow.Table':
+        """Hallazgos de todas las búsquedas del lote en una tabla de Arrow (ver SearchResult.to_arrow)"""
+        if pyarrow is None:
+            raise ImportError("La exportación a Arrow necesita pyarrow (pip install pyarrow)")
+        dictionary = _arrow_dictionary(self.pool)
+        tablas = [result.to_arrow(dictionary) for result in self.results()]
+        if not tablas:
+            return SearchResult('', 0, [], [], self.pool).to_arrow(dictionary)
+        return pyarrow.concat_tables(tablas)
+    
+    def write_parquet(self, path: str):
+        """Guarda los hallazgos del lote en un archivo Parquet"""
+        pyarrow.parquet.write_table(self.to_arrow(), path)
+        print(f"\n💾 {len(self)} búsquedas guardadas en: {path}")
@@ -0,0 +1,149 @@
+"""
+Cache de robots.txt compartido por todo el proceso
+Todos los scrapers (síncronos, asíncronos y los de cada petición de la API)
+consultan el mismo cache, así que cada dominio se descarga una sola vez
+
+- Seguro entre hilos; un lock por dominio evita descargar el mismo robots.txt a la vez
+- Las entradas caducan pasado el TTL (24 h, lo habitual para robots.txt); las
+  respuestas 5xx caducan antes para no bloquear un dominio por un fallo puntual
+- Opcionalmente se guarda una copia en disco (JSON) que sobrevive a reinicios
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.robotparser import RobotFileParser
+
+
+def robots_parser(robots_url: str, status: int, texto: str) -> RobotFileParser:
+    """
+    RobotFileParser a partir de la respuesta de robots.txt
+    Mismo criterio que RobotFileParser.read(): 401/403 bloquean todo, otros 4xx
+    permiten todo y sin respuesta válida (5xx) no se permite ninguna URL
+    """
+    rp = RobotFileParser()
+    rp.set_url(robots_url)
+    if status in (401, 403):
+        rp.disallow_all = True
+    elif 400 <= status < 500:
+        rp.allow_all = True
+    elif status < 400:
+        rp.parse(texto.splitlines())
+    return rp
+
+
+class RobotsCache:
+    """Cache de robots.txt por dominio con TTL y copia opcional en disco"""
+    
+    def __init__(self, ttl: float = 24 * 3600, error_ttl: float = 300, snapshot_path: Optional[str] = None):
+        """
+        Args:
+            ttl: Segundos durante los que un robots.txt se considera vigente
+            error_ttl: Vigencia de las respuestas 5xx (el sitio puede recuperarse)
+            snapshot_path: Ruta del JSON donde guardar el cache; None para solo memoria
+        """
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._domain_locks = {}  # base_url -> lock de descarga
+        self._entries = {}  # base_url -> {'status', 'texto', 'descargado', 'parser'}
+        
+        if snapshot_path and os.path.exists(snapshot_path):
+            self._load_snapshot()
+    
+    def _is_fresh(self, entry: Dict) -> bool:
+        ttl = self.error_ttl if entry['status'] >= 500 else self.ttl
+        return time.time() - entry['descargado'] < ttl
+    
+    def get(self, base_url: str) -> Optional[RobotFileParser]:
+        """RobotFileParser vigente del dominio, o None si hay que descargarlo"""
+        with self._lock:
+            entry = self._entries.get(base_url)
+        if entry is None or not self._is_fresh(entry):
+            return None
+        return entry['parser']
+    
+    def store(self, base_url: str, status: int, texto: str) -> RobotFileParser:
+        """Guarda la respuesta de robots.txt del dominio y retorna su parser"""
+        entry = {
+            'status': status,
+            'texto': texto,
+            'descargado': time.time(),
+            'parser': robots_parser(base_url + '/robots.txt', status, texto)
+        }
+        with self._lock:
+            self._entries[base_url] = entry
+        if self.snapshot_path:
+            self.save_snapshot()
+        return entry['parser']
+    
+    def lock_for(self, base_url: str) -> threading.Lock:
+        """Lock de descarga del dominio (una sola descarga simultánea por dominio)"""
+        with self._lock:
+            return self._domain_locks.setdefault(base_url, threading.Lock())
+    
+    def missing(self, base_urls: List[str]) -> List[str]:
+        """Dominios (sin repetir) que no tienen un robots.txt vigente en el cache"""
+        return [base_url for base_url in dict.fromkeys(base_urls) if self.get(base_url) is None]
+    
+    def save_snapshot(self):
+        """Guarda las entradas en disco (escritura atómica)"""
+        with self._lock:
+            data = {
+                base_url: {key: entry[key] for key in ('status', 'texto', 'descargado')}
+                for base_url, entry in self._entries.items()
+            }
+            directory = os.path.dirname(self.snapshot_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temporal = f"{self.snapshot_path}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temporal, self.snapshot_path)
+    
+    def _load_snapshot(self):
+        """Carga las entradas vigentes de la copia en disco"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  No se pudo leer el cache de robots.txt: {str(e)[:50]}")
+            return
+        
+        for base_url, entry in data.items():
+            if self._is_fresh(entry):
+                entry['parser'] = robots_parser(base_url + '/robots.txt', entry['status'], entry['texto'])
+                with self._lock:
+                    self._entries.setdefault(base_url, entry)  # Lo descargado en esta ejecución manda
+    
+    def clear(self):
+        """Vacía el cache"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def shared_robots_cache(snapshot_path: Optional[str] = None) -> RobotsCache:
+    """
+    Cache de robots.txt común a todo el proceso (se crea en el primer uso)
+    snapshot_path activa la copia en disco si el cache compartido aún no tiene una
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = RobotsCache(snapshot_path=snapshot_path)
+        elif snapshot_path and _shared_cache.snapshot_path is None:
+            _shared_cache.snapshot_path = snapshot_path
+            if os.path.exists(snapshot_path):
+                _shared_cache._load_snapshot()
+        return _shared_cache
@@ -0,0 +1,170 @@
+"""
+Pool de scrapers para servir varias búsquedas en paralelo (servidor API)
+Un NewsSourcesScraper no debe usarse desde dos búsquedas a la vez: su
+requests.Session, sus cookies por dominio y sus resultados son estado de la búsqueda.
+El pool entrega a cada búsqueda un scraper propio y comparte entre todos solo el
+estado preparado para ello:
+
+- Pool de conexiones HTTP: un único HTTPAdapter (urllib3 es seguro entre hilos)
+- Pausa de cortesía por dominio (DomainThrottle): la cortesía se respeta aunque
+  varias búsquedas visiten el mismo sitio a la vez
+- Cache de robots.txt, cache HTTP en disco, almacén de contenido extraído,
+  candidatos ya extraídos de las portadas e índice de artículos vistos
+- Procesos de parseo (ParsePool), si se usan: uno por núcleo para todas las búsquedas
+"""
+
+import queue
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from article_store import ArticleContentStore
+from http_cache import HTTPResponseCache
+from news_sources_scraper import DomainThrottle, NewsSourcesScraper
+from candidate_cache import CandidateCache
+from http_transport import build_http_adapter
+from parse_workers import ParsePool
+from result_store import StringPool
+from robots_cache import RobotsCache
+from seen_index import SeenUrlIndex
+
+
+class ScraperPool:
+    """Conjunto fijo de scrapers con estado compartido explícito"""
+    
+    def __init__(self, size: int = 4,
+                 http_cache: Optional[HTTPResponseCache] = None,
+                 content_store: Optional[ArticleContentStore] = None,
+                 robots_cache: Optional[RobotsCache] = None,
+                 throttle: Optional[DomainThrottle] = None,
+                 seen_index: Optional[SeenUrlIndex] = None,
+                 candidate_cache: Optional[CandidateCache] = None,
+                 parse_pool: Optional[ParsePool] = None,
+                 string_pool: Optional[StringPool] = None,
+                 scraper_class=NewsSourcesScraper,
+                 **scraper_kwargs):
+        """
+        Args:
+            size: Búsquedas simultáneas como máximo (una por scraper)
+            http_cache: Cache HTTP compartido (opcional)
+            content_store: Almacén de contenido compartido (por defecto uno nuevo)
+            robots_cache: Cache de robots.txt (por defecto el compartido por el proceso)
+            throttle: Pausa de cortesía por dominio (por defecto una nueva, común al pool)
+            seen_index: Índice de artículos vistos compartido (opcional)
+            candidate_cache: Candidatos de las portadas (por defecto uno nuevo, común al pool)
+            parse_pool: Procesos de parseo compartidos (opcional; con parse_processes en
+                        scraper_kwargs se crea uno común al pool)
+            string_pool: Cadenas internadas de los resultados compactos (por defecto uno nuevo, común al pool)
+            scraper_class: Clase de los scrapers (NewsSourcesScraper o una subclase)
+            scraper_kwargs: Resto de argumentos de cada scraper (parser, max_workers...)
+        """
+        self.size = size
+        self.http_cache = http_cache
+        self.content_store = content_store if content_store is not None else ArticleContentStore()
+        self.robots_cache = robots_cache
+        self.throttle = throttle if throttle is not None else DomainThrottle(1.0, 2.0)
+        self.seen_index = seen_index
+        self.candidate_cache = candidate_cache if candidate_cache is not None else CandidateCache()
+        parse_processes = scraper_kwargs.pop('parse_processes', 0)
+        self._owns_parse_pool = parse_pool is None and bool(parse_processes)  # Lo detiene close()
+        if parse_pool is None and parse_processes:
+            parse_pool = ParsePool(scraper_class, scraper_kwargs.get('parser', 'lxml'), parse_processes)
+        self.parse_pool = parse_pool
+        self.string_pool = string_pool if string_pool is not None else StringPool()
+        # Conexiones por host suficientes para las extracciones simultáneas de todas las búsquedas
+        max_per_host = scraper_kwargs.get('max_per_host', 2)
+        self.http_adapter = build_http_adapter(pool_connections=64,
+                                               pool_maxsize=max(10, size * (max_per_host * 2 + 2)),
+                                               http2=scraper_kwargs.get('http2', False))
+        
+        self._template = None  # Scraper cuya lista de fuentes siguen los del pool (from_scraper)
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(scraper_class(
+                http_cache=self.http_cache,
+                content_store=self.content_store,
+                robots_cache=self.robots_cache,
+                throttle=self.throttle,
+                seen_index=self.seen_index,
+                candidate_cache=self.candidate_cache,
+                parse_pool=self.parse_pool,
+                string_pool=self.string_pool,
+                http_adapter=self.http_adapter,
+                **scraper_kwargs
+            ))
+    
+    @classmethod
+    def from_scraper(cls, scraper: NewsSourcesScraper, size: int = 4) -> 'ScraperPool':
+        """
+        Pool cuyos scrapers comparten caches, throttle y configuración con uno existente
+        Las fuentes se toman del scraper original cada vez que se presta uno del pool
+        """
+        pool = cls(
+            size=size,
+            http_cache=scraper.http_cache,
+            content_store=scraper.content_store,
+            robots_cache=scraper.robots_cache,
+            throttle=scraper.throttle,
+            seen_index=scraper.seen_index,
+            candidate_cache=scraper.candidate_cache,
+            parse_pool=scraper.parse_pool,
+            string_pool=scraper.string_pool,
+            scraper_class=type(scraper),
+            max_workers=scraper.max_workers,
+            content_workers=scraper.content_workers,
+            max_per_host=scraper.max_per_host,
+            parser=scraper.parser,
+            http2=scraper.http2,
+            incremental_parse=scraper.incremental_parse,
+            max_page_bytes=scraper.max_page_bytes
+        )
+        pool._template = scraper
+        return pool
+    
+    @contextmanager
+    def scraper(self, timeout: Optional[float] = None) -> Iterator[NewsSourcesScraper]:
+        """
+        Presta un scraper para una búsqueda y lo devuelve al pool al terminar
+        Bloquea (hasta timeout segundos) si todos están ocupados
+        """
+        scraper = self.acquire(timeout)
+        try:
+            yield scraper
+        finally:
+            self.release(scraper)
+    
+    def acquire(self, timeout: Optional[float] = None) -> NewsSourcesScraper:
+        """
+        Toma un scraper del pool (hay que devolverlo con release)
+        Lanza queue.Empty si no queda ninguno libre en timeout segundos
+        """
+        scraper = self._idle.get(timeout=timeout)
+        if self._template is not None:
+            scraper.SOURCES = self._template.SOURCES
+        return scraper
+    
+    def release(self, scraper: NewsSourcesScraper):
+        """Devuelve al pool un scraper tomado con acquire"""
+        self._idle.put(scraper)
+    
+    def available(self) -> int:
+        """Scrapers libres en este momento"""
+        return self._idle.qsize()
+    
+    def close(self):
+        """
+        Libera lo que creó el pool: las conexiones HTTP comunes y el pool de procesos
+        de parseo (parse_processes); un parse_pool recibido queda abierto
+        """
+        self.http_adapter.close()
+        if self._owns_parse_pool and self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+        if self.http_cache:
+            self.http_cache.flush()  # Accesos pendientes del orden LRU
+        self.content_store.flush()
+    
+    def __enter__(self) -> 'ScraperPool':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,238 @@
+"""
+Cola de trabajos de búsqueda para la API
+POST /buscar ya no ejecuta la búsqueda dentro de la petición HTTP: la encola y
+responde al momento con el id del trabajo. Hilos en segundo plano ejecutan las
+búsquedas y el cliente consulta el estado (GET /buscar/<id>) o sigue el progreso
+como eventos (GET /buscar/<id>/eventos)
+
+- La cola tiene una profundidad máxima: si está llena, submit lanza QueueFullError
+  y la API responde 503 en lugar de acumular conexiones bloqueadas
+- Los trabajos terminados se conservan un tiempo limitado para poder consultarlos
+- Búsquedas idénticas (misma clave normalizada) se unen al trabajo que ya está en
+  cola o en curso, y las repetidas poco después reutilizan su resultado (result_ttl):
+  N clientes con la misma búsqueda cuestan un solo crawl
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from result_store import SearchResult
+
+
+class QueueFullError(Exception):
+    """La cola de búsquedas ha alcanzado su profundidad máxima"""
+
+
+def query_key(tema: str, keywords: List[str]) -> Tuple:
+    """
+    Clave normalizada de una búsqueda: el scoring no distingue mayúsculas ni
+    depende del orden de las keywords (sí de sus repeticiones y espacios)
+    """
+    return tema.lower(), tuple(sorted(kw.lower() for kw in keywords))
+
+
+class SearchJob:
+    """Una búsqueda encolada: estado, eventos de progreso y resultado"""
+    
+    ESTADOS_FINALES = ('completado', 'error')
+    
+    def __init__(self, tema: str, keywords: List[str]):
+        self.id = uuid.uuid4().hex
+        self.tema = tema
+        self.keywords = keywords
+        self.key = query_key(tema, keywords)
+        self.solicitudes = 1  # Peticiones atendidas por este trabajo (incluye las unidas)
+        self.estado = 'en_cola'  # en_cola -> en_curso -> completado / error
+        self.creado = time.time()
+        self.iniciado = None
+        self.terminado = None
+        self.resultado = None
+        self.archivo_guardado = None
+        self.error = None
+        self.eventos = []  # (evento, datos) en orden de llegada
+        self._cond = threading.Condition()
+    
+    @property
+    def finished(self) -> bool:
+        return self.estado in self.ESTADOS_FINALES
+    
+    def add_event(self, evento: str, datos: Dict):
+        """Registra un evento de progreso y despierta a quien esté esperando eventos"""
+        with self._cond:
+            self.eventos.append((evento, datos))
+            self._cond.notify_all()
+    
+    def _set_state(self, estado: str, **campos):
+        with self._cond:
+            # El estado se asigna el último: quien lo lee sin el lock (la cola, to_dict)
+            # y lo ve 'completado' o 'error' encuentra ya terminado, resultado y error
+            for nombre, valor in campos.items():
+                setattr(self, nombre, valor)
+            self.estado = estado
+            datos = {'estado': estado}
+            if self.error:
+                datos['error'] = self.error
+            self.eventos.append(('estado', datos))
+            self._cond.notify_all()
+    
+    def wait_events(self, desde: int, timeout: float) -> Tuple[List[Tuple[str, Dict]], bool]:
+        """
+        Espera (hasta timeout segundos) eventos posteriores al índice desde
+        
+        Returns:
+            (eventos nuevos, True si el trabajo ya terminó)
+        """
+        with self._cond:
+            if len(self.eventos) <= desde and not self.finished:
+                self._cond.wait(timeout)
+            return self.eventos[desde:], self.finished
+    
+    def to_dict(self, posicion: Optional[int] = None, lazy: bool = False) -> Dict:
+        """
+        Estado del trabajo para la API (con el resultado si ya terminó)
+        lazy: los hallazgos de un SearchResult como generador, para serializarlo por trozos
+        """
+        estado = self.estado  # Una sola lectura: los campos que dependen de él ya están puestos
+        datos = {
+            'id': self.id,
+            'estado': estado,
+            'tema': self.tema,
+            'keywords': self.keywords,
+            'creado': self.creado,
+            'iniciado': self.iniciado,
+            'terminado': self.terminado,
+            'solicitudes': self.solicitudes,
+            'eventos': len(self.eventos)
+        }
+        if posicion is not None:
+            datos['posicion_en_cola'] = posicion
+        if estado == 'completado':
+            # Los resultados compactos (SearchResult) se convierten al formato completo solo aquí
+            datos['resultado'] = (self.resultado.to_dict(lazy) if isinstance(self.resultado, SearchResult)
+                                  else self.resultado)
+            datos['archivo_guardado'] = self.archivo_guardado
+        elif estado == 'error':
+            datos['error'] = self.error
+        return datos
+
+
+class SearchJobQueue:
+    """Cola acotada de búsquedas atendida por hilos en segundo plano"""
+    
+    def __init__(self, runner: Callable[[SearchJob], Union[Dict, SearchResult]], workers: int = 1, max_pending: int = 20,
+                 keep_finished: int = 200, finished_ttl: float = 3600, result_ttl: float = 300):
+        """
+        Args:
+            runner: Ejecuta la búsqueda de un trabajo y retorna su resultado (diccionario o
+                    SearchResult, que ocupa menos mientras el trabajo se conserva)
+            workers: Búsquedas que se ejecutan a la vez
+            max_pending: Trabajos en cola como máximo (sin contar los que están en curso)
+            keep_finished: Trabajos terminados que se conservan como máximo
+            finished_ttl: Segundos durante los que se conserva un trabajo terminado
+            result_ttl: Segundos durante los que una búsqueda idéntica reutiliza un resultado (0 = nunca)
+        """
+        self.runner = runner
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self.finished_ttl = finished_ttl
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = OrderedDict()  # id -> SearchJob, en orden de creación
+        self._by_key = {}  # clave normalizada -> último trabajo con esa búsqueda
+        self._unidas = 0  # Peticiones unidas a un trabajo en cola o en curso
+        self._desde_cache = 0  # Peticiones servidas con un resultado reciente
+        self._lock = threading.Lock()
+        self._threads = []
+    
+    def _start(self):
+        """Arranca los hilos de trabajo la primera vez que se encola algo (requiere el lock)"""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True, name=f"busquedas-{len(self._threads) + 1}")
+            thread.start()
+            self._threads.append(thread)
+    
+    def submit(self, tema: str, keywords: List[str]) -> SearchJob:
+        """
+        Encola una búsqueda, o retorna el trabajo de una búsqueda idéntica que está
+        en curso o terminó hace menos de result_ttl segundos
+        Lanza QueueFullError si hay que encolarla y la cola está llena
+        """
+        job = SearchJob(tema, keywords)
+        with self._lock:
+            self._purge()
+            
+            existing = self._by_key.get(job.key)
+            if existing is not None and not existing.finished:
+                existing.solicitudes += 1
+                self._unidas += 1
+                return existing
+            if (existing is not None and existing.estado == 'completado' and
+                    time.time() - existing.terminado < self.result_ttl):
+                existing.solicitudes += 1
+                self._desde_cache += 1
+                return existing
+            
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"La cola de búsquedas está llena ({self.max_pending} en espera)")
+            self._jobs[job.id] = job
+            self._by_key[job.key] = job
+            self._start()
+        return job
+    
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def position(self, job: SearchJob) -> Optional[int]:
+        """Posición (1 = la siguiente) de un trabajo que sigue en cola"""
+        if job.estado != 'en_cola':
+            return None
+        with self._lock:
+            en_cola = [j for j in self._jobs.values() if j.estado == 'en_cola']
+        return en_cola.index(job) + 1 if job in en_cola else None
+    
+    def status(self) -> Dict:
+        """Ocupación de la cola"""
+        with self._lock:
+            estados = [job.estado for job in self._jobs.values()]
+            unidas, desde_cache = self._unidas, self._desde_cache
+        return {
+            'en_cola': estados.count('en_cola'),
+            'en_curso': estados.count('en_curso'),
+            'terminados': estados.count('completado') + estados.count('error'),
+            'max_en_cola': self.max_pending,
+            'workers': self.workers,
+            'solicitudes_unidas': unidas,
+            'solicitudes_desde_cache': desde_cache
+        }
+    
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job._set_state('en_curso', iniciado=time.time())
+            try:
+                resultado = self.runner(job)
+                job._set_state('completado', resultado=resultado, terminado=time.time())
+            except Exception as e:
+                job._set_state('error', error=str(e), terminado=time.time())
+            finally:
+                self._queue.task_done()
+    
+    def _purge(self):
+        """Olvida los trabajos terminados caducados o que exceden keep_finished (requiere el lock)"""
+        ahora = time.time()
+        terminados = [job for job in self._jobs.values() if job.finished]
+        sobrantes = len(terminados) - self.keep_finished
+        for job in terminados:
+            if sobrantes > 0 or ahora - job.terminado > self.finished_ttl:
+                del self._jobs[job.id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+                sobrantes -= 1
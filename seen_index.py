@@ -0,0 +1,130 @@
+"""
+Índice persistente de artículos ya procesados (búsquedas programadas)
+Cada ejecución de una misma búsqueda vuelve a encontrar los mismos enlaces en las
+portadas; el índice recuerda, por búsqueda y URL, cuándo se vio el artículo por
+primera y última vez y el hash de su contenido extraído
+
+- El modo incremental del scraper solo extrae y emite los artículos nuevos o cuyo
+  contenido ha cambiado; los ya vistos se vuelven a comprobar pasado recheck_ttl
+- SQLite (un único fichero), seguro entre hilos
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from article_store import content_hash
+
+
+def search_scope(tema: str, keywords: Optional[List[str]] = None) -> str:
+    """Clave de una búsqueda en el índice (sin mayúsculas ni orden de keywords)"""
+    return tema.lower() + '|' + ','.join(sorted(kw.lower() for kw in keywords or []))
+
+
+class SeenUrlIndex:
+    """Artículos vistos por búsqueda: primera y última vez vistos y hash del contenido"""
+    
+    def __init__(self, path: str = os.path.join('cache_http', 'vistos.sqlite'), recheck_ttl: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: Ruta de la base de datos SQLite
+            recheck_ttl: Segundos tras los que un artículo ya visto se vuelve a extraer
+                         para detectar cambios en su contenido
+        """
+        self.path = path
+        self.recheck_ttl = recheck_ttl
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS vistos (
+                busqueda TEXT NOT NULL,
+                url TEXT NOT NULL,
+                primer_visto REAL NOT NULL,
+                ultimo_visto REAL NOT NULL,
+                hash TEXT,
+                comprobado REAL,
+                PRIMARY KEY (busqueda, url)
+            )
+        """)
+        self._conn.commit()
+    
+    def pending(self, scope: str, urls: List[str]) -> List[str]:
+        """
+        Registra que las URLs se han visto ahora en las portadas y retorna las que
+        hay que extraer: nuevas, sin contenido registrado o comprobadas hace más de recheck_ttl
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return []
+        now = time.time()
+        with self._lock:
+            conocidas = {}
+            for inicio in range(0, len(urls), 500):  # Límite de parámetros de SQLite
+                lote = urls[inicio:inicio + 500]
+                conocidas.update(self._conn.execute(
+                    f"SELECT url, comprobado FROM vistos WHERE busqueda = ? AND url IN ({','.join('?' * len(lote))})",
+                    [scope] + lote
+                ).fetchall())
+            self._conn.executemany(
+                "INSERT INTO vistos (busqueda, url, primer_visto, ultimo_visto) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (busqueda, url) DO UPDATE SET ultimo_visto = excluded.ultimo_visto",
+                [(scope, url, now, now) for url in urls]
+            )
+            self._conn.commit()
+        
+        return [url for url in urls
+                if conocidas.get(url) is None or now - conocidas[url] >= self.recheck_ttl]
+    
+    def record(self, scope: str, url: str, contenido: str) -> str:
+        """
+        Guarda el hash del contenido extraído de la URL
+        
+        Returns:
+            'nuevo' (sin contenido registrado), 'modificado' o 'sin_cambios'
+        """
+        hash_contenido = content_hash(contenido.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hash FROM vistos WHERE busqueda = ? AND url = ?", (scope, url)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO vistos (busqueda, url, primer_visto, ultimo_visto, hash, comprobado) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (busqueda, url) DO UPDATE SET hash = excluded.hash, comprobado = excluded.comprobado",
+                (scope, url, now, now, hash_contenido, now)
+            )
+            self._conn.commit()
+        
+        if row is None or row[0] is None:
+            return 'nuevo'
+        return 'sin_cambios' if row[0] == hash_contenido else 'modificado'
+    
+    def get(self, scope: str, url: str) -> Optional[Dict]:
+        """Entrada de la URL en la búsqueda (primer_visto, ultimo_visto, hash, comprobado) o None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT primer_visto, ultimo_visto, hash, comprobado FROM vistos WHERE busqueda = ? AND url = ?",
+                (scope, url)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('primer_visto', 'ultimo_visto', 'hash', 'comprobado'), row))
+    
+    def clear(self, scope: Optional[str] = None):
+        """Olvida los artículos de una búsqueda (o de todas)"""
+        with self._lock:
+            if scope is None:
+                self._conn.execute("DELETE FROM vistos")
+            else:
+                self._conn.execute("DELETE FROM vistos WHERE busqueda = ?", (scope,))
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vistos").fetchone()[0]